@@ -0,0 +1,93 @@
+"""
+Velvet Arc Allowance Manager
+Cached ERC-20 allowance for one owner/spender pair
+"""
+import asyncio
+from typing import Optional
+
+from eth_abi import decode
+from eth_account.signers.local import LocalAccount
+from web3 import Web3
+from structlog import get_logger
+
+from config import ERC20_ABI, USDC_STANDING_ALLOWANCE
+from calldata import ContractHandle
+from rpc import ChainClient
+
+logger = get_logger()
+
+
+class AllowanceManager:
+    """
+    Tracks how much `spender` may pull from the agent's token balance. The
+    value is read from chain once and then kept current from our own
+    approvals and spends; anything that fails puts it back to unknown.
+    """
+
+    def __init__(
+        self,
+        client: ChainClient,
+        account: LocalAccount,
+        token_address: str,
+        spender: str,
+        standing: int = USDC_STANDING_ALLOWANCE,
+    ):
+        self.client = client
+        self.account = account
+        self.token = ContractHandle(token_address, ERC20_ABI)
+        self.spender = Web3.to_checksum_address(spender)
+        self.standing = standing
+
+        self._allowance: Optional[int] = None
+
+        # Counters
+        self.hits = 0
+        self.refreshes = 0
+
+    @property
+    def cached(self) -> Optional[int]:
+        return self._allowance
+
+    async def current(self) -> int:
+        if self._allowance is None:
+            await self.refresh()
+        else:
+            self.hits += 1
+        return self._allowance
+
+    async def refresh(self):
+        self.refreshes += 1
+        self._allowance = await self._read("allowance", "uint256", self.account.address, self.spender)
+        logger.info("Allowance loaded", spender=self.spender, allowance=self._allowance / 10**6)
+
+    async def approval_needed(self, amount: int) -> Optional[int]:
+        """Allowance to approve before spending `amount`, or None if it already covers it"""
+        try:
+            if await self.current() >= amount:
+                return None
+        except Exception as e:
+            logger.warning("Allowance read failed, approving", spender=self.spender, error=str(e))
+        return max(amount, self.standing)
+
+    def approved(self, value: int):
+        """An approve(spender, value) was broadcast; approve overwrites rather than adds"""
+        self._allowance = value
+
+    def spent(self, amount: int):
+        if self._allowance is not None:
+            self._allowance = max(self._allowance - amount, 0)
+
+    def invalidate(self):
+        self._allowance = None
+
+    def watch(self, future: asyncio.Future):
+        """Drop the cached value if a tracked approve or spend doesn't land"""
+        def on_receipt(f: asyncio.Future):
+            if f.cancelled() or f.exception() is not None or f.result()["status"] != 1:
+                self.invalidate()
+        future.add_done_callback(on_receipt)
+
+    async def _read(self, fn_name: str, output_type: str, *args):
+        raw = await self.client.w3.eth.call({"to": self.token.address, "data": self.token.calldata(fn_name, *args)})
+        return decode([output_type], raw)[0]
+
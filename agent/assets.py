@@ -0,0 +1,102 @@
+"""
+Velvet Arc Asset Matrix
+Prices for many assets in one assets × time array, with volatility and correlation computed for all of them at once
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from config import VOLATILITY_WINDOW, VOLATILITY_PERIODS_PER_YEAR
+from volatility import DEFAULT_VOLATILITY
+
+
+@dataclass
+class AssetSnapshot:
+    """Latest prices and window statistics, one row/entry per asset"""
+    assets: list[str]
+    prices: np.ndarray  # (assets,)
+    changes_24h: np.ndarray  # (assets,) fractions, NaN where unreported
+    volatility: np.ndarray  # (assets,) the 0-1 index the decision engine uses
+    correlation: np.ndarray  # (assets, assets) of windowed log returns
+
+    def index(self, asset: str) -> int:
+        return self.assets.index(asset)
+
+
+class AssetMatrix:
+    """
+    A preallocated (assets, window + 1) ring of prices, one column per
+    sample. A missing quote repeats the asset's previous price. snapshot()
+    takes log returns of the whole window as one array and gets every
+    asset's volatility and the full correlation matrix from a single
+    covariance product, so watching more assets costs no Python-level work
+    per asset.
+    """
+
+    def __init__(
+        self,
+        assets: list[str],
+        window: int = VOLATILITY_WINDOW,
+        periods_per_year: int = VOLATILITY_PERIODS_PER_YEAR,
+    ):
+        self.assets = list(assets)
+        self.window = window
+        self.annualize = np.sqrt(periods_per_year)
+
+        self._prices = np.full((len(self.assets), window + 1), np.nan)
+        self._changes = np.full(len(self.assets), np.nan)
+        self._seen = 0  # columns written
+
+    def __len__(self) -> int:
+        """Samples currently in the window"""
+        return min(self._seen, self.window + 1)
+
+    def update(self, prices: np.ndarray, changes_24h: Optional[np.ndarray] = None) -> bool:
+        """Add a column of prices (NaN where missing); False if nothing moved since the last one"""
+        prices = np.where(prices > 0, prices, np.nan)
+        if self._seen:
+            last = self._prices[:, (self._seen - 1) % (self.window + 1)]
+            prices = np.where(np.isnan(prices), last, prices)
+            if np.array_equal(prices, last, equal_nan=True):
+                return False  # a cached quote; repeating it would fake a zero return
+        self._prices[:, self._seen % (self.window + 1)] = prices
+        self._seen += 1
+        if changes_24h is not None:
+            self._changes = changes_24h
+        return True
+
+    def prices(self) -> np.ndarray:
+        """(assets, samples) prices in the window, oldest first"""
+        size = self.window + 1
+        if self._seen <= size:
+            return self._prices[:, :self._seen].copy()
+        return np.roll(self._prices, -(self._seen % size), axis=1)
+
+    def snapshot(self) -> Optional[AssetSnapshot]:
+        """Statistics for every asset, or None before the first sample"""
+        if not self._seen:
+            return None
+        prices = self.prices()
+        latest = prices[:, -1]
+        n = len(self.assets)
+        if prices.shape[1] < 2:
+            return AssetSnapshot(self.assets, latest, self._changes, np.full(n, DEFAULT_VOLATILITY), np.eye(n))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.diff(np.log(prices), axis=1)
+            # Assets first quoted mid-window only count from their first return
+            known = ~np.isnan(returns)
+            counts = known.sum(axis=1)
+            returns = np.where(known, returns, 0.0)
+            means = returns.sum(axis=1) / counts
+            centered = np.where(known, returns - means[:, None], 0.0)
+
+            covariance = centered @ centered.T / returns.shape[1]
+            variance = (centered ** 2).sum(axis=1) / counts
+            std = np.sqrt(variance)
+            correlation = covariance / np.outer(np.sqrt(np.diag(covariance)), np.sqrt(np.diag(covariance)))
+
+        volatility = np.where(counts > 0, np.minimum(std * self.annualize / 2.0, 1.0), DEFAULT_VOLATILITY)
+        np.fill_diagonal(correlation, 1.0)
+        return AssetSnapshot(self.assets, latest, self._changes, volatility, np.nan_to_num(correlation))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one AssetMatrix vs a price list per asset
+Feeds correlated random-walk prices for N assets through AssetMatrix
+(update + snapshot) and through the per-asset path (a list per asset,
+calculate_volatility on each, np.corrcoef on every pair), and checks both
+give the same volatilities.
+
+Usage: python bench_assets.py [--ticks 100] [--assets 1,10,50,100] [--window 24]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from assets import AssetMatrix
+from market_data import MarketDataFetcher
+
+
+def per_asset(prices: np.ndarray, window: int) -> tuple[float, np.ndarray]:
+    """Per-tick µs and final volatilities of the list-per-asset path"""
+    n, ticks = prices.shape
+    histories = [list(prices[i, :window]) for i in range(n)]
+    vols = np.zeros(n)
+    start = time.perf_counter()
+    for t in range(window, ticks):
+        for i in range(n):
+            histories[i] = (histories[i] + [prices[i, t]])[-(window + 1):]
+            vols[i] = MarketDataFetcher.calculate_volatility(None, histories[i])
+        returns = [np.diff(np.log(h)) for h in histories]
+        for i in range(n):
+            for j in range(i + 1, n):
+                np.corrcoef(returns[i], returns[j])
+    return (time.perf_counter() - start) / (ticks - window) * 1e6, vols
+
+
+def matrix(prices: np.ndarray, window: int) -> tuple[float, np.ndarray]:
+    n, ticks = prices.shape
+    assets = AssetMatrix([f"asset-{i}" for i in range(n)], window)
+    for t in range(window):
+        assets.update(prices[:, t])
+    snapshot = None
+    start = time.perf_counter()
+    for t in range(window, ticks):
+        assets.update(prices[:, t])
+        snapshot = assets.snapshot()
+    return (time.perf_counter() - start) / (ticks - window) * 1e6, snapshot.volatility
+
+
+def main(args):
+    rng = np.random.default_rng(7)
+    counts = [int(n) for n in args.assets.split(",")]
+    ticks = args.window + args.ticks
+
+    print(f"{args.ticks} ticks, window {args.window}; per tick: every volatility and every pairwise correlation\n")
+    print(f"{'assets':>8}{'per-asset µs':>15}{'matrix µs':>12}{'speedup':>10}{'max |diff|':>13}")
+    for n in counts:
+        market = rng.normal(0, 0.004, ticks)
+        returns = market + rng.normal(0, 0.004, (n, ticks))
+        prices = 100 * np.exp(np.cumsum(returns, axis=1))
+        slow_us, slow = per_asset(prices, args.window)
+        fast_us, fast = matrix(prices, args.window)
+        print(f"{n:>8}{slow_us:>15.1f}{fast_us:>12.1f}{slow_us / fast_us:>9.1f}x{np.abs(fast - slow).max():>13.1e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument("--assets", default="1,10,50,100")
+    parser.add_argument("--window", type=int, default=24)
+    main(parser.parse_args())
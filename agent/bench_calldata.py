@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: web3 build_transaction vs precompiled calldata encoders
+Times building each executor action's transaction dict (nonce, gas and fees
+already known, so no RPC is involved) and checks both produce the same calldata.
+
+Usage: python bench_calldata.py [--iterations 5000]
+"""
+import argparse
+import asyncio
+import time
+
+from web3 import AsyncWeb3, Web3
+
+from calldata import ContractHandle
+from config import (
+    ARC_TESTNET, BASE_SEPOLIA, CONTRACTS,
+    VAULT_ABI, HOOK_ABI, ERC20_ABI, TOKEN_MESSENGER_ABI,
+)
+
+AGENT = Web3.to_checksum_address(CONTRACTS.agent_address)
+RECIPIENT = Web3.to_bytes(hexstr=AGENT).rjust(32, b'\x00')
+AMOUNT = 250 * 10**6
+
+PARAMS = {
+    'from': AGENT,
+    'nonce': 7,
+    'gas': 500000,
+    'maxFeePerGas': 2 * 10**9,
+    'maxPriorityFeePerGas': 10**8,
+}
+
+
+def actions(w3: AsyncWeb3) -> dict:
+    """Per action: (web3 contract function, chain id, precompiled handle, fn name, args)"""
+    vault = w3.eth.contract(address=Web3.to_checksum_address(CONTRACTS.vault_address), abi=VAULT_ABI)
+    hook = w3.eth.contract(address=Web3.to_checksum_address(CONTRACTS.hook_address), abi=HOOK_ABI)
+    usdc = w3.eth.contract(address=Web3.to_checksum_address(BASE_SEPOLIA.usdc_address), abi=ERC20_ABI)
+    messenger_address = Web3.to_checksum_address(BASE_SEPOLIA.token_messenger)
+
+    vault_calls = ContractHandle(CONTRACTS.vault_address, VAULT_ABI)
+    hook_calls = ContractHandle(CONTRACTS.hook_address, HOOK_ABI)
+    usdc_calls = ContractHandle(BASE_SEPOLIA.usdc_address, ERC20_ABI)
+    messenger_calls = ContractHandle(messenger_address, TOKEN_MESSENGER_ABI)
+
+    burn_args = (AMOUNT, ARC_TESTNET.cctp_domain, RECIPIENT, usdc_calls.address)
+    deploy_args = (AMOUNT, BASE_SEPOLIA.cctp_domain, RECIPIENT)
+    fee_args = (5000, "High volatility (9.1%). Raising fee.")
+
+    return {
+        "DEPLOY": (vault.functions.bridgeToExecution(*deploy_args), ARC_TESTNET.chain_id,
+                   vault_calls, "bridgeToExecution", deploy_args),
+        "APPROVE": (usdc.functions.approve(messenger_address, AMOUNT), BASE_SEPOLIA.chain_id,
+                    usdc_calls, "approve", (messenger_address, AMOUNT)),
+        # The old withdraw path also constructed the TokenMessenger contract every call
+        "BURN": (None, BASE_SEPOLIA.chain_id, messenger_calls, "depositForBurn", burn_args),
+        "EMERGENCY_EXIT": (vault.functions.emergencyExit(), ARC_TESTNET.chain_id,
+                           vault_calls, "emergencyExit", ()),
+        "ADJUST_FEE": (hook.functions.updateDynamicFee(*fee_args), BASE_SEPOLIA.chain_id,
+                       hook_calls, "updateDynamicFee", fee_args),
+    }
+
+
+async def main(args):
+    # Never connected: any RPC attempt during building would fail loudly
+    w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider("http://127.0.0.1:9"))
+    messenger_address = Web3.to_checksum_address(BASE_SEPOLIA.token_messenger)
+
+    print(f"{args.iterations} builds per action\n")
+    print(f"{'action':<16}{'web3 µs':>10}{'precompiled µs':>16}{'speedup':>10}")
+
+    for name, (fn, chain_id, handle, fn_name, fn_args) in actions(w3).items():
+        params = {**PARAMS, 'chainId': chain_id}
+
+        async def web3_build():
+            contract_fn = fn
+            if contract_fn is None:
+                messenger = w3.eth.contract(address=messenger_address, abi=TOKEN_MESSENGER_ABI)
+                contract_fn = messenger.functions.depositForBurn(*fn_args)
+            return await contract_fn.build_transaction(params)
+
+        def precompiled_build():
+            return {**handle.call(fn_name, *fn_args), **params}
+
+        reference = await web3_build()
+        assert Web3.to_bytes(hexstr=reference['data']) == precompiled_build()['data'], name
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            await web3_build()
+        web3_us = (time.perf_counter() - start) / args.iterations * 1e6
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            precompiled_build()
+        fast_us = (time.perf_counter() - start) / args.iterations * 1e6
+
+        print(f"{name:<16}{web3_us:>10.1f}{fast_us:>16.2f}{web3_us / fast_us:>9.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: plain AsyncHTTPProvider vs BatchingHTTPProvider
+Runs the agent's per-tick JSON-RPC mix against a local stand-in node with
+injected latency and reports requests/sec and latency percentiles.
+
+Usage: python bench_transport.py [--calls 2000] [--concurrency 100] [--latency 0.02]
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp
+import numpy as np
+from web3.providers.rpc import AsyncHTTPProvider
+
+from local_rpc import LocalRPCServer
+from transport import BatchingHTTPProvider
+
+AGENT = "0x55c3aBb091D1a43C3872718b3b8B3AE8c20B592E"
+
+
+def workload(n: int) -> list[tuple[str, list]]:
+    """Repeating mix of what one iteration issues across readers and tx builders"""
+    mix = [
+        ("eth_gasPrice", []),
+        ("eth_blockNumber", []),
+        ("eth_getTransactionCount", [AGENT, "pending"]),
+        ("eth_maxPriorityFeePerGas", []),
+    ]
+    calls = []
+    for i in range(n):
+        if i % 2:
+            calls.append(mix[i % len(mix)])
+        else:
+            # Unique reads that cannot be deduplicated
+            calls.append(("eth_getBalance", [f"0x{i:040x}", "latest"]))
+    return calls
+
+
+async def run(provider, calls: list[tuple[str, list]], concurrency: int) -> tuple[float, np.ndarray]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = np.zeros(len(calls))
+
+    async def one(i: int, method: str, params: list):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await provider.make_request(method, params)
+            latencies[i] = time.perf_counter() - start
+            assert "result" in response, response
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i, m, p) for i, (m, p) in enumerate(calls)))
+    return time.perf_counter() - start, latencies
+
+
+async def main(args):
+    server = LocalRPCServer(latency=args.latency, max_concurrency=args.node_concurrency)
+    url = await server.start()
+    calls = workload(args.calls)
+
+    print(f"{args.calls} calls, client concurrency {args.concurrency}, "
+          f"node latency {args.latency * 1000:.0f}ms, node concurrency {args.node_concurrency}\n")
+    print(f"{'transport':<12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'HTTP posts':>12}")
+
+    for name in ("plain", "batching"):
+        connector = aiohttp.TCPConnector(limit=args.pool_size)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            if name == "plain":
+                provider = AsyncHTTPProvider(url)
+                await provider.cache_async_session(session)
+            else:
+                provider = BatchingHTTPProvider(url)
+                provider.attach_session(session)
+
+            posts_before = server.http_requests
+            elapsed, latencies = await run(provider, calls, args.concurrency)
+            posts = server.http_requests - posts_before
+
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        print(f"{name:<12}{len(calls) / elapsed:>10,.0f}{p50:>10.1f}{p99:>10.1f}{posts:>12,}")
+
+    await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--node-concurrency", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=16)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming volatility vs recomputing it from the price list
+Feeds a random-walk price series through RollingVolatility and through the
+old path (append, re-slice, np.diff/np.log/np.std over the whole window) at
+several window lengths, and checks both give the same volatility index.
+
+Usage: python bench_volatility.py [--updates 5000] [--windows 24,240,2400,24000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from market_data import MarketDataFetcher
+from volatility import RollingVolatility
+
+
+def recompute(prices: list[float], window: int, updates: int) -> tuple[float, float]:
+    """Per-update µs and final value of the list-and-recompute path, window already full"""
+    history = prices[:window + 1]
+    value = 0.0
+    start = time.perf_counter()
+    for price in prices[window + 1:window + 1 + updates]:
+        history.append(price)
+        history = history[-(window + 1):]
+        value = MarketDataFetcher.calculate_volatility(None, history)
+    return (time.perf_counter() - start) / updates * 1e6, value
+
+
+def streaming(prices: list[float], window: int, updates: int) -> tuple[float, float]:
+    estimator = RollingVolatility(window)
+    for price in prices[:window + 1]:
+        estimator.update(price)
+    update = estimator.update
+    value = 0.0
+    start = time.perf_counter()
+    for price in prices[window + 1:window + 1 + updates]:
+        value = update(price)
+    return (time.perf_counter() - start) / updates * 1e6, value
+
+
+def main(args):
+    rng = np.random.default_rng(7)
+    windows = [int(w) for w in args.windows.split(",")]
+    count = max(windows) + 1 + args.updates
+    prices = (3000 * np.exp(np.cumsum(rng.normal(0, 0.004, count)))).tolist()
+
+    print(f"{args.updates} updates per window, timed once the window is full\n")
+    print(f"{'window':>8}{'recompute µs':>15}{'streaming µs':>15}{'speedup':>10}{'|diff|':>11}")
+    for window in windows:
+        slow_us, slow = recompute(prices, window, args.updates)
+        fast_us, fast = streaming(prices, window, args.updates)
+        print(f"{window:>8}{slow_us:>15.1f}{fast_us:>15.2f}{slow_us / fast_us:>9.0f}x{abs(fast - slow):>11.1e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--windows", default="24,240,2400,24000")
+    main(parser.parse_args())
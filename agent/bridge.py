@@ -0,0 +1,337 @@
+"""
+Velvet Arc Bridge Tracker
+Carries each CCTP or Gateway transfer from its burn receipt through attestation, mint and vault confirmation
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Optional
+
+import aiohttp
+from eth_abi import decode
+from hexbytes import HexBytes
+from web3 import Web3
+from structlog import get_logger
+
+from config import (
+    ARC_TESTNET, BASE_SEPOLIA, ChainConfig,
+    BRIDGE_TIMEOUT_SECONDS,
+    ATTESTATION_API_URL, ATTESTATION_POLL_SECONDS, ATTESTATION_BACKOFF,
+    ATTESTATION_MAX_POLL_SECONDS, ATTESTATION_CONCURRENCY,
+    MESSAGE_TRANSMITTER_ABI, VAULT_BRIDGE_ABI,
+)
+from calldata import ContractHandle
+from connections import ConnectionManager, get_connections
+from decision_engine import Action
+from fee_oracle import Urgency
+from receipts import TransactionReplaced
+
+logger = get_logger()
+
+MESSAGE_SENT_TOPIC = Web3.keccak(text="MessageSent(bytes)")
+GATEWAY_DEPOSIT_TOPIC = Web3.keccak(text="GatewayDeposit(uint256,uint256,bytes32)")
+TRANSFER_TOPIC = Web3.keccak(text="Transfer(address,address,uint256)")
+ZERO_WORD = HexBytes(bytes(32))  # Transfer from address(0): a mint
+
+VAULT_STATE_DEPLOYED = 2
+
+
+class BridgeStage(Enum):
+    BURNING = "BURNING"  # burn sent, waiting for its receipt
+    ATTESTING = "ATTESTING"  # burn mined, waiting on the attestation service
+    GATEWAY = "GATEWAY"  # vault deposit mined; waiting for Circle Gateway's mint on the destination
+    MINTING = "MINTING"  # receiveMessage sent on the destination chain
+    CONFIRMING = "CONFIRMING"  # funds landed; vault bookkeeping on Arc
+    COMPLETE = "COMPLETE"
+    FAILED = "FAILED"
+
+
+@dataclass
+class BridgeTransfer:
+    """One CCTP transfer and how far along it is"""
+    action: Action
+    burn_hash: str
+    amount: int
+    source: ChainConfig
+    destination: ChainConfig
+    stage: BridgeStage = BridgeStage.BURNING
+    message: Optional[bytes] = None
+    message_hash: Optional[str] = None
+    attestation: Optional[bytes] = None
+    mint_hash: Optional[str] = None
+    recipient: Optional[str] = None  # Gateway deposits: who the destination mint pays
+    confirm_hashes: list[str] = field(default_factory=list)
+    entered: dict[BridgeStage, float] = field(default_factory=lambda: {BridgeStage.BURNING: time.monotonic()})
+    polls: int = 0
+    stalled: bool = False
+    error: Optional[str] = None
+
+    @property
+    def idle_seconds(self) -> Optional[float]:
+        """Burn mined to mint mined: how long the capital was on neither chain"""
+        start = self.entered.get(BridgeStage.ATTESTING, self.entered.get(BridgeStage.GATEWAY))
+        end = self.entered.get(BridgeStage.CONFIRMING)
+        if start is None:
+            return None
+        return (end or time.monotonic()) - start
+
+
+class AttestationClient:
+    """CCTP attestation lookups by message hash over one pooled session"""
+
+    def __init__(
+        self,
+        base_url: str = ATTESTATION_API_URL,
+        concurrency: int = ATTESTATION_CONCURRENCY,
+        connections: Optional[ConnectionManager] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.connections = connections or get_connections()
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.requests = 0
+
+    async def connect(self):
+        if self.session is None:
+            self.session = self.connections.acquire().session
+
+    async def close(self):
+        if self.session is not None:
+            self.session = None
+            await self.connections.release()
+
+    async def fetch(self, message_hash: str) -> Optional[bytes]:
+        """The attestation once the service has signed it, otherwise None"""
+        await self.connect()
+        async with self._semaphore:
+            self.requests += 1
+            async with self.session.get(f"{self.base_url}/attestations/{message_hash}") as response:
+                if response.status == 404:
+                    return None  # not observed yet
+                response.raise_for_status()
+                data = await response.json()
+
+        if data.get("status") != "complete":
+            return None
+        return HexBytes(data["attestation"])
+
+
+class BridgeTracker:
+    """
+    Follows every in-flight transfer concurrently, one task each. For a CCTP
+    burn, its MessageSent log gives the message; the attestation service is
+    polled from the moment the burn is mined with a growing interval and
+    the mint is sent as soon as the attestation arrives. A vault deposit
+    that went through Circle Gateway (GatewayDeposit) is minted by Gateway
+    itself, so the destination's USDC is watched for the mint to the
+    deposit's recipient instead. Either way the vault is confirmed once the
+    mint lands. Listeners are told about every stage change.
+    """
+
+    def __init__(self, executor, attestations: Optional[AttestationClient] = None):
+        self.executor = executor
+        self._owns_attestations = attestations is None  # a shared client is closed by its owner
+        self.attestations = attestations or AttestationClient()
+        self.transfers: dict[str, BridgeTransfer] = {}
+        self.listeners: list[Callable[[BridgeTransfer], None]] = []
+
+        self.transmitters = {
+            chain.chain_id: ContractHandle(chain.message_transmitter, MESSAGE_TRANSMITTER_ABI)
+            for chain in (ARC_TESTNET, BASE_SEPOLIA)
+        }
+        self.vault_calls = ContractHandle(executor.strategy.vault_address, VAULT_BRIDGE_ABI)
+
+        # Counters
+        self.completed = 0
+        self.failed = 0
+
+        self._tasks: set[asyncio.Task] = set()
+
+    async def start(self):
+        await self.attestations.connect()
+
+    async def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        if self._owns_attestations:
+            await self.attestations.close()
+
+    def track(self, action: Action, burn_hash: str, amount: int) -> BridgeTransfer:
+        """Follow the transfer started by a DEPLOY or WITHDRAW burn"""
+        source, destination = (ARC_TESTNET, BASE_SEPOLIA) if action == Action.DEPLOY else (BASE_SEPOLIA, ARC_TESTNET)
+        transfer = BridgeTransfer(action, burn_hash, amount, source, destination)
+        self.transfers[burn_hash] = transfer
+
+        task = asyncio.create_task(self._run(transfer))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return transfer
+
+    def in_flight(self) -> list[BridgeTransfer]:
+        done = (BridgeStage.COMPLETE, BridgeStage.FAILED)
+        return [t for t in self.transfers.values() if t.stage not in done]
+
+    async def _run(self, transfer: BridgeTransfer):
+        try:
+            receipt = await self._receipt(transfer.source, transfer.burn_hash)
+            if receipt["status"] != 1:
+                raise RuntimeError("burn reverted")
+            transfer.recipient = self._gateway_recipient(receipt)
+            if transfer.recipient is not None:
+                # bridgeToExecution goes through Circle Gateway: no CCTP message, Gateway mints
+                start = await self._client(transfer.destination).w3.eth.block_number
+                self._advance(transfer, BridgeStage.GATEWAY)
+                transfer.mint_hash = await self._gateway_mint(transfer, start)
+            else:
+                transfer.message = self._message_sent(receipt, transfer.source)
+                transfer.message_hash = Web3.keccak(transfer.message).to_0x_hex()
+                self._advance(transfer, BridgeStage.ATTESTING)
+
+                transfer.attestation = await self._attest(transfer)
+                self._advance(transfer, BridgeStage.MINTING)
+
+                await self._mint(transfer)
+            self._advance(transfer, BridgeStage.CONFIRMING)
+
+            await self._confirm(transfer)
+            self.completed += 1
+            self._advance(transfer, BridgeStage.COMPLETE)
+            logger.info(
+                "Bridge complete",
+                action=transfer.action.value,
+                amount=transfer.amount / 10**6,
+                idle_seconds=round(transfer.idle_seconds, 1),
+                polls=transfer.polls,
+            )
+        except asyncio.CancelledError:
+            raise
+        except TransactionReplaced as e:
+            # The replacement is a submission of its own and gets its own transfer
+            self.transfers.pop(transfer.burn_hash, None)
+            logger.info("Bridge burn replaced", burn=transfer.burn_hash, replacement=e.replacement.to_0x_hex())
+        except Exception as e:
+            self.failed += 1
+            transfer.error = str(e)
+            logger.error(
+                "Bridge failed",
+                action=transfer.action.value,
+                burn=transfer.burn_hash,
+                stage=transfer.stage.value,
+                error=str(e),
+            )
+            self._advance(transfer, BridgeStage.FAILED)
+
+    def _advance(self, transfer: BridgeTransfer, stage: BridgeStage):
+        transfer.stage = stage
+        transfer.entered.setdefault(stage, time.monotonic())
+        for listener in self.listeners:
+            listener(transfer)
+
+    async def _receipt(self, chain: ChainConfig, tx_hash: str) -> dict:
+        """Receipt of a transaction we sent; looked up directly if it already resolved"""
+        tracker = self.executor.receipts[chain.chain_id]
+        if tracker.future(tx_hash) is not None:
+            return await tracker.wait(tx_hash)
+        return await tracker.client.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=BRIDGE_TIMEOUT_SECONDS)
+
+    def _client(self, chain: ChainConfig):
+        return self.executor.receipts[chain.chain_id].client
+
+    def _gateway_recipient(self, receipt: dict) -> Optional[str]:
+        """Recipient of the vault's GatewayDeposit event in the receipt, if it has one"""
+        vault = self.vault_calls.address
+        for log in receipt["logs"]:
+            if (
+                Web3.to_checksum_address(log["address"]) == vault
+                and log["topics"] and HexBytes(log["topics"][0]) == GATEWAY_DEPOSIT_TOPIC
+            ):
+                _, _, recipient = decode(["uint256", "uint256", "bytes32"], bytes(log["data"]))
+                return Web3.to_checksum_address(recipient[-20:])
+        return None
+
+    async def _gateway_mint(self, transfer: BridgeTransfer, start: int) -> str:
+        """Hash of Gateway's USDC mint to the recipient on the destination, from block `start` on"""
+        w3 = self._client(transfer.destination).w3
+        query = {
+            "address": Web3.to_checksum_address(transfer.destination.usdc_address),
+            "topics": [TRANSFER_TOPIC, ZERO_WORD, HexBytes(bytes(12) + HexBytes(transfer.recipient))],
+        }
+        delay = ATTESTATION_POLL_SECONDS
+        started = time.monotonic()
+        while True:
+            try:
+                head = await w3.eth.block_number
+                if head >= start:
+                    logs = await w3.eth.get_logs({**query, "fromBlock": start, "toBlock": head})
+                    if logs:
+                        return HexBytes(logs[0]["transactionHash"]).to_0x_hex()
+                    start = head + 1
+            except Exception as e:
+                logger.warning("Gateway mint lookup failed", recipient=transfer.recipient, error=str(e))
+            transfer.polls += 1
+
+            # Same as attestation: the deposit is gone from Arc, so keep watching
+            if not transfer.stalled and time.monotonic() - started > BRIDGE_TIMEOUT_SECONDS:
+                transfer.stalled = True
+                logger.error("Gateway mint overdue", recipient=transfer.recipient, seconds=BRIDGE_TIMEOUT_SECONDS)
+            await asyncio.sleep(delay)
+            delay = min(delay * ATTESTATION_BACKOFF, ATTESTATION_MAX_POLL_SECONDS)
+
+    def _message_sent(self, receipt: dict, source: ChainConfig) -> bytes:
+        transmitter = self.transmitters[source.chain_id].address
+        for log in receipt["logs"]:
+            if log["address"] == transmitter and log["topics"] and HexBytes(log["topics"][0]) == MESSAGE_SENT_TOPIC:
+                return decode(["bytes"], bytes(log["data"]))[0]
+        raise RuntimeError("no MessageSent log in burn receipt")
+
+    async def _attest(self, transfer: BridgeTransfer) -> bytes:
+        delay = ATTESTATION_POLL_SECONDS
+        started = time.monotonic()
+        while True:
+            try:
+                attestation = await self.attestations.fetch(transfer.message_hash)
+            except Exception as e:
+                logger.warning("Attestation lookup failed", message_hash=transfer.message_hash, error=str(e))
+                attestation = None
+            transfer.polls += 1
+            if attestation:
+                return attestation
+
+            # Giving up would strand the burned funds; keep polling but say so
+            if not transfer.stalled and time.monotonic() - started > BRIDGE_TIMEOUT_SECONDS:
+                transfer.stalled = True
+                logger.error(
+                    "Attestation overdue",
+                    action=transfer.action.value,
+                    message_hash=transfer.message_hash,
+                    seconds=BRIDGE_TIMEOUT_SECONDS,
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * ATTESTATION_BACKOFF, ATTESTATION_MAX_POLL_SECONDS)
+
+    async def _mint(self, transfer: BridgeTransfer):
+        call = self.transmitters[transfer.destination.chain_id].call(
+            "receiveMessage", transfer.message, transfer.attestation
+        )
+        (mint_hash,) = await self.executor.send_calls(transfer.destination.chain_id, [(call, 300000, "mint")], Urgency.HIGH)
+        transfer.mint_hash = mint_hash.to_0x_hex()
+        receipt = await self._receipt(transfer.destination, transfer.mint_hash)
+        if receipt["status"] != 1:
+            raise RuntimeError("mint reverted")
+
+    async def _confirm(self, transfer: BridgeTransfer):
+        if transfer.action == Action.DEPLOY:
+            calls = [(self.vault_calls.call("confirmDeployment"), 100000, "confirm_deployment")]
+        else:
+            calls = [(self.vault_calls.call("confirmReturn", transfer.amount), 150000, "confirm_return")]
+            vault = await self.executor.get_vault_state()
+            if vault["state"] == VAULT_STATE_DEPLOYED:
+                # confirmReturn only accepts BRIDGING_BACK
+                calls.insert(0, (self.vault_calls.call("signalReturn"), 100000, "signal_return"))
+
+        hashes = await self.executor.send_calls(ARC_TESTNET.chain_id, calls, Urgency.NORMAL)
+        transfer.confirm_hashes = [h.to_0x_hex() for h in hashes]
+        receipt = await self._receipt(ARC_TESTNET, transfer.confirm_hashes[-1])
+        if receipt["status"] != 1:
+            raise RuntimeError(f"{calls[-1][2]} reverted")
@@ -0,0 +1,50 @@
+"""
+Velvet Arc Calldata Encoders
+Selectors and eth_abi encoders resolved once per function, for building transactions without web3's ABI machinery
+"""
+from eth_abi.registry import registry
+from web3 import Web3
+
+
+def _canonical_type(param: dict) -> str:
+    """ABI param type with tuples expanded, e.g. (uint256,address)[]"""
+    type_str = param["type"]
+    if type_str.startswith("tuple"):
+        inner = ",".join(_canonical_type(c) for c in param["components"])
+        return f"({inner}){type_str[len('tuple'):]}"
+    return type_str
+
+
+class FunctionEncoder:
+    """Fixed 4-byte selector plus a prebuilt argument encoder for one function"""
+
+    def __init__(self, abi_item: dict):
+        self.name = abi_item["name"]
+        self.input_types = tuple(_canonical_type(p) for p in abi_item.get("inputs", []))
+        self.signature = f"{self.name}({','.join(self.input_types)})"
+        self.selector = bytes(Web3.keccak(text=self.signature)[:4])
+        self._encoder = registry.get_tuple_encoder(*self.input_types)
+
+    def encode(self, *args) -> bytes:
+        if not self.input_types:
+            return self.selector
+        return self.selector + self._encoder(args)
+
+
+class ContractHandle:
+    """Contract address plus precompiled encoders for every function in its ABI"""
+
+    def __init__(self, address: str, abi: list[dict]):
+        self.address = Web3.to_checksum_address(address)
+        self.functions: dict[str, FunctionEncoder] = {
+            item["name"]: FunctionEncoder(item)
+            for item in abi
+            if item.get("type") == "function"
+        }
+
+    def calldata(self, fn_name: str, *args) -> bytes:
+        return self.functions[fn_name].encode(*args)
+
+    def call(self, fn_name: str, *args) -> dict:
+        """Transaction fields for calling fn_name; merge with nonce/gas/fee params"""
+        return {'to': self.address, 'data': self.calldata(fn_name, *args), 'value': 0}
@@ -0,0 +1,148 @@
+"""
+Velvet Arc Chain Pool
+Chain resources shared by every strategy in the process, plus per-signer nonce and allowance state
+"""
+import asyncio
+from typing import Optional
+
+from eth_account.signers.local import LocalAccount
+from web3 import Web3
+from structlog import get_logger
+
+from config import ARC_TESTNET, BASE_SEPOLIA, VAULT_EVENTS_ABI, HOOK_EVENTS_ABI
+from rpc import ChainClient
+from multicall import Multicall
+from nonce_manager import NonceManager
+from fee_oracle import FeeOracle
+from gas_estimator import GasEstimator
+from receipts import ReceiptTracker
+from allowances import AllowanceManager
+from view_cache import ViewCache
+from indexer import EventIndexer, EventStore
+from bridge import AttestationClient
+
+logger = get_logger()
+
+
+class ChainPool:
+    """
+    One pooled RPC client, fee oracle, gas cache, receipt tracker, view
+    cache and Multicall per chain, one event index covering every
+    registered vault and hook, and one attestation session. Nonces and the
+    TokenMessenger allowance are kept per signer, so strategies sharing a
+    key draw from the same counter instead of racing for it.
+    """
+
+    def __init__(self):
+        self.arc = ChainClient(ARC_TESTNET)
+        self.base = ChainClient(BASE_SEPOLIA)
+
+        self.arc_fees = FeeOracle(self.arc)
+        self.base_fees = FeeOracle(self.base)
+        self.arc_gas = GasEstimator(self.arc)
+        self.base_gas = GasEstimator(self.base)
+
+        # Nonces are confirmed through the NonceManager each entry was sent with
+        self.arc_receipts = ReceiptTracker(self.arc, estimator=self.arc_gas)
+        self.base_receipts = ReceiptTracker(self.base, estimator=self.base_gas)
+        self.receipts = {
+            ARC_TESTNET.chain_id: self.arc_receipts,
+            BASE_SEPOLIA.chain_id: self.base_receipts,
+        }
+
+        # Every strategy's views go through the same cache, so one log
+        # subscription per chain covers all vaults (or hooks)
+        self.arc_views_cache = ViewCache(self.arc, self.arc_receipts)
+        self.base_views_cache = ViewCache(self.base, self.base_receipts)
+        self.arc_multicall = Multicall(self.arc, self.arc_views_cache)
+        self.base_multicall = Multicall(self.base, self.base_views_cache)
+
+        self.events = EventStore()
+        self.arc_indexer: Optional[EventIndexer] = None
+        self.base_indexer: Optional[EventIndexer] = None
+        self.attestations = AttestationClient()
+
+        self._vaults: set[str] = set()
+        self._hooks: set[str] = set()
+        self._nonces: dict[tuple[int, str], NonceManager] = {}
+        self._allowances: dict[str, AllowanceManager] = {}
+        self._connected = False
+        self._connect_lock = asyncio.Lock()
+
+    def register(self, vault_address: str, hook_address: str):
+        """Add a strategy's contracts to the log subscriptions and the event index"""
+        self._vaults.add(Web3.to_checksum_address(vault_address))
+        self._hooks.add(Web3.to_checksum_address(hook_address))
+        self.arc_views_cache.watch_events(vault_address)
+        self.base_views_cache.watch_events(hook_address)
+
+    def nonces(self, client: ChainClient, address: str) -> NonceManager:
+        """The NonceManager for this signer on this chain"""
+        key = (client.chain.chain_id, Web3.to_checksum_address(address))
+        if key not in self._nonces:
+            self._nonces[key] = NonceManager(client, address)
+        return self._nonces[key]
+
+    def allowance(self, account: LocalAccount) -> AllowanceManager:
+        """USDC the TokenMessenger may burn for this signer on Base"""
+        if account.address not in self._allowances:
+            self._allowances[account.address] = AllowanceManager(
+                self.base, account, BASE_SEPOLIA.usdc_address, BASE_SEPOLIA.token_messenger
+            )
+        return self._allowances[account.address]
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    async def connect(self):
+        """Open sessions and start the background followers; later calls are no-ops"""
+        async with self._connect_lock:
+            if self._connected:
+                return
+            await asyncio.gather(self.arc.connect(), self.base.connect())
+
+            # The index scope is fixed at construction, so build it from everything registered by now
+            self.arc_indexer = EventIndexer(
+                self.arc, self.events, {address: VAULT_EVENTS_ABI for address in self._vaults}
+            )
+            self.base_indexer = EventIndexer(
+                self.base, self.events, {address: HOOK_EVENTS_ABI for address in self._hooks}
+            )
+
+            results = await asyncio.gather(
+                self.arc_fees.start(), self.base_fees.start(),
+                self.arc_receipts.start(), self.base_receipts.start(),
+                self.arc_views_cache.start(), self.base_views_cache.start(),
+                self.arc_indexer.start(), self.base_indexer.start(),
+                self.attestations.connect(),
+                # Hedges and attestation polls shouldn't be the ones paying for DNS and TLS
+                self.arc.connections.warm(
+                    rpc_urls=[*self.arc.chain.rpc_urls, *self.base.chain.rpc_urls],
+                    session_urls=[self.attestations.base_url],
+                ),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning("Chain pool warm-up step failed", error=str(result))
+
+            self._connected = True
+            logger.info(
+                "Chain pool connected",
+                vaults=len(self._vaults),
+                hooks=len(self._hooks),
+                signers=len({address for _, address in self._nonces}),
+            )
+
+    async def close(self):
+        async with self._connect_lock:
+            await asyncio.gather(self.arc_views_cache.stop(), self.base_views_cache.stop())
+            if self.arc_indexer is not None:
+                await asyncio.gather(self.arc_indexer.stop(), self.base_indexer.stop())
+            await asyncio.gather(self.arc_receipts.stop(), self.base_receipts.stop())
+            await asyncio.gather(self.arc_fees.stop(), self.base_fees.stop())
+            await self.attestations.close()
+            await asyncio.gather(self.arc.close(), self.base.close())
+            await self.events.close()
+            self._connected = False
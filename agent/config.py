@@ -1,13 +1,17 @@
 """
 Velvet Arc Agent Configuration
 """
+import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Multicall3 is deployed at the same address on every EVM chain
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
 @dataclass
 class ChainConfig:
     chain_id: int
@@ -16,6 +20,19 @@ class ChainConfig:
     cctp_domain: int
     usdc_address: str
     token_messenger: Optional[str] = None
+    message_transmitter: Optional[str] = None  # CCTP receiveMessage (mint) side
+    multicall3: str = MULTICALL3_ADDRESS
+    ws_url: Optional[str] = None  # newHeads subscriptions; polled over rpc_url if unset
+    rpc_urls: list[str] = field(default_factory=list)  # every endpoint, rpc_url first
+
+    def __post_init__(self):
+        if self.rpc_url not in self.rpc_urls:
+            self.rpc_urls.insert(0, self.rpc_url)
+
+
+def rpc_urls_from_env(name: str, default: str) -> list[str]:
+    """Comma-separated endpoint list, e.g. ARC_RPC=https://a,https://b"""
+    return [url.strip() for url in os.getenv(name, default).split(",") if url.strip()]
 
 @dataclass
 class ContractConfig:
@@ -24,22 +41,31 @@ class ContractConfig:
     agent_address: str
 
 # Chain Configurations
+ARC_RPC_URLS = rpc_urls_from_env("ARC_RPC", "https://rpc.testnet.arc.network")
+BASE_RPC_URLS = rpc_urls_from_env("BASE_RPC", "https://sepolia.base.org")
+
 ARC_TESTNET = ChainConfig(
     chain_id=5042002,
-    rpc_url=os.getenv("ARC_RPC", "https://rpc.testnet.arc.network"),
+    rpc_url=ARC_RPC_URLS[0],
+    rpc_urls=ARC_RPC_URLS,
+    ws_url=os.getenv("ARC_WS"),
     name="Arc Testnet",
     cctp_domain=26,
     usdc_address="0x3600000000000000000000000000000000000000",
     token_messenger="0x8FE6B999Dc680CcFDD5Bf7EB0974218be2542DAA",
+    message_transmitter=os.getenv("ARC_MESSAGE_TRANSMITTER", "0xE737e5cEBEEBa77EFE34D4aa090756590b1CE275"),
 )
 
 BASE_SEPOLIA = ChainConfig(
     chain_id=84532,
-    rpc_url=os.getenv("BASE_RPC", "https://sepolia.base.org"),
+    rpc_url=BASE_RPC_URLS[0],
+    rpc_urls=BASE_RPC_URLS,
+    ws_url=os.getenv("BASE_WS"),
     name="Base Sepolia",
     cctp_domain=6,
     usdc_address="0x036CbD53842c5426634e7929541eC2318f3dCF7e",
     token_messenger="0x9f3B8679c73C2Fef8b59B4f3444d4e156fb70AA5",
+    message_transmitter=os.getenv("BASE_MESSAGE_TRANSMITTER", "0x7865fAfC2db2093669d92c0F33AeEF291086BEFD"),
 )
 
 # Deployed Contracts
@@ -52,14 +78,196 @@ CONTRACTS = ContractConfig(
 # Agent Parameters
 PRIVATE_KEY = os.getenv("PRIVATE_KEY", "")
 
+
+@dataclass
+class StrategyConfig:
+    """One vault/hook deployment the agent operates, and the key that signs for it"""
+    name: str
+    vault_address: str
+    hook_address: str
+    private_key: str
+
+
+def load_strategies(path: Optional[str] = None) -> list[StrategyConfig]:
+    """
+    Strategies from STRATEGIES_FILE, a JSON list of
+    {"name", "vault_address", "hook_address", "private_key_env"?}; the key is
+    read from the named environment variable (default PRIVATE_KEY). Without a
+    file the agent runs the single CONTRACTS deployment.
+    """
+    path = path or os.getenv("STRATEGIES_FILE")
+    if not path:
+        return [StrategyConfig("default", CONTRACTS.vault_address, CONTRACTS.hook_address, PRIVATE_KEY)]
+    with open(path) as f:
+        entries = json.load(f)
+    return [
+        StrategyConfig(
+            name=entry["name"],
+            vault_address=entry["vault_address"],
+            hook_address=entry["hook_address"],
+            private_key=os.getenv(entry.get("private_key_env", "PRIVATE_KEY"), ""),
+        )
+        for entry in entries
+    ]
+
+
+# Multi-strategy mode: decisions run this many strategies at once per tick
+STRATEGY_CONCURRENCY = int(os.getenv("STRATEGY_CONCURRENCY", "16"))
+
+# Fleet mode: strategies sharded across this many worker processes (0 = run in-process)
+FLEET_WORKERS = int(os.getenv("FLEET_WORKERS", "0"))
+FLEET_SOCKET_PATH = os.getenv("FLEET_SOCKET")  # market feed Unix socket; a temp path if unset
+FLEET_RING_REPLICAS = 64  # virtual nodes per worker on the hash ring
+FLEET_MONITOR_SECONDS = 1  # how often the supervisor checks worker liveness
+FLEET_STOP_TIMEOUT_SECONDS = 15  # graceful shutdown before a worker is killed
+FLEET_RESPAWN_SECONDS = 1  # first delay before a dead worker is respawned; doubles per quick death
+FLEET_MAX_RESPAWN_SECONDS = 60
+FLEET_HEALTHY_SECONDS = 60  # a worker up this long starts over from the first respawn delay
+
 # Decision Thresholds
 VOLATILITY_LOW_THRESHOLD = 0.02  # 2% - safe to deploy
 VOLATILITY_HIGH_THRESHOLD = 0.08  # 8% - consider withdrawing
 VOLATILITY_CRITICAL_THRESHOLD = 0.15  # 15% - emergency exit
 
+# Volatility: standard deviation over this many most recent log returns
+VOLATILITY_WINDOW = int(os.getenv("VOLATILITY_WINDOW", "24"))
+VOLATILITY_PERIODS_PER_YEAR = 8760  # hourly samples
+
+# Market API response cache: (ttl, stale) seconds by URL prefix. Within `stale`
+# after the TTL the old body is served while it is revalidated in the background.
+MARKET_CACHE_POLICIES = {
+    "api.alternative.me/fng": (3600, 86400),  # the index moves once a day
+    "api.coingecko.com": (60, 30),  # simple/price refreshes about once a minute
+}
+MARKET_CACHE_DEFAULT_POLICY = (5, 0)  # exchange tickers: only dedupe concurrent fetchers
+MARKET_CACHE_MAX_ENTRIES = 256
+
+# ETH/USD price sources: each has its own deadline and circuit breaker, and the
+# aggregate is published once PRICE_QUORUM of them agree
+PRICE_SOURCE_DEADLINE_SECONDS = 3.0
+PRICE_QUORUM = int(os.getenv("PRICE_QUORUM", "2"))
+PRICE_MAX_DEVIATION = 0.02  # answers further than 2% from the median are rejected
+PRICE_TRIM = 0.1  # trimmed from each end before averaging the rest
+PRICE_BREAKER_FAILURES = 3  # consecutive failures before a source is skipped
+PRICE_BREAKER_COOLDOWN_SECONDS = 60  # doubles on every failed retry
+PRICE_BREAKER_MAX_COOLDOWN_SECONDS = 900
+
+# Spot price of the hook's Uniswap V4 pool (Base), read through StateView; off unless HOOK_POOL_ID is set
+POOL_STATE_VIEW = os.getenv("POOL_STATE_VIEW", "0x571291b572ed32ce6751a2cb2486ebee8defb9b4")
+POOL_ID = os.getenv("HOOK_POOL_ID", "")
+POOL_ETH_IS_TOKEN0 = True  # native ETH (address 0) always sorts first
+POOL_DECIMALS_0 = 18
+POOL_DECIMALS_1 = 6
+
+# Price samples persisted across restarts to warm-start the volatility window ("" disables)
+PRICE_HISTORY_PATH = os.getenv("PRICE_HISTORY", "velvet_prices.bin")
+PRICE_HISTORY_CAPACITY = int(os.getenv("PRICE_HISTORY_CAPACITY", "8760"))  # samples kept, 16 bytes each
+PRICE_HISTORY_FSYNC = os.getenv("PRICE_HISTORY_FSYNC", "interval")  # always | interval | never
+PRICE_HISTORY_FSYNC_SECONDS = 60
+PRICE_HISTORY_MAX_AGE_SECONDS = int(os.getenv("PRICE_HISTORY_MAX_AGE", "3600"))  # older samples aren't replayed on start
+PRICE_HISTORY_MAX_GAP_SECONDS = 600  # no return is taken across a longer pause between samples
+
 # Timing
 SCAN_INTERVAL_SECONDS = 30
-BRIDGE_TIMEOUT_SECONDS = 300
+
+# CoinGecko ids watched alongside ETH; all are priced by the same simple/price request
+MARKET_ASSETS = [a.strip() for a in os.getenv("MARKET_ASSETS", "ethereum,bitcoin,solana,usd-coin").split(",") if a.strip()]
+
+# Streaming ETH/USD ticks (Binance ticker format, e.g. wss://stream.binance.com:9443/ws/ethusdt@ticker).
+# Each tick re-scores volatility and wakes the agent when its level rises; "" polls only.
+PRICE_STREAM_URL = os.getenv("PRICE_STREAM_URL", "")
+PRICE_STREAM_RECONNECT_SECONDS = 1
+PRICE_STREAM_MAX_RECONNECT_SECONDS = 30
+BRIDGE_TIMEOUT_SECONDS = 300  # an attestation this late is logged as stalled, polling continues
+
+# CCTP attestation service (GET {ATTESTATION_API}/attestations/{messageHash})
+ATTESTATION_API_URL = os.getenv("ATTESTATION_API", "https://iris-api-sandbox.circle.com")
+ATTESTATION_POLL_SECONDS = 2  # first poll once the burn is mined
+ATTESTATION_BACKOFF = 1.5  # poll interval multiplier while still pending
+ATTESTATION_MAX_POLL_SECONDS = 30
+ATTESTATION_CONCURRENCY = 8  # attestation requests in flight at once across transfers
+
+# Outbound HTTP: one process-wide pool per client library (see connections.py)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "64"))  # connections across every host
+HTTP_DNS_CACHE_SECONDS = 300
+HTTP_WARM_CONNECTIONS = 2  # opened per host at startup
+HTTP_WARM_TIMEOUT_SECONDS = 5
+MARKET_HTTP_TIMEOUT_SECONDS = 10
+
+# Per-host request budgets, shared by every client in the process: host -> (requests/s, burst).
+# Fleet workers each run on 1/FLEET_WORKERS of them (see RateLimiter.set_share).
+# The published free-tier limits, with some room; everything else gets the default.
+RATE_LIMITS = {
+    "api.coingecko.com": (0.4, 3),  # ~30/min
+    "api.coinbase.com": (2.5, 5),  # 10k/hour
+    "api.kraken.com": (1.0, 3),  # public endpoints decay one call a second
+    "api.binance.com": (8.0, 16),  # 1200 weight/min, ticker/24hr is weight 2
+    "api.alternative.me": (1.0, 2),  # 60/min
+}
+RATE_LIMIT_DEFAULT = (
+    float(os.getenv("RATE_LIMIT_RPS", "20")),
+    float(os.getenv("RATE_LIMIT_BURST", "40")),
+)
+RATE_LIMIT_MAX_WAIT_SECONDS = 5  # longer than this and the request fails (RPC hedges, prices fall back)
+RATE_LIMIT_DECREASE = 0.5  # scale multiplier on a 429
+RATE_LIMIT_INCREASE = 0.05  # scale regained per second of successful traffic
+RATE_LIMIT_MIN_SCALE = 0.05
+RATE_LIMIT_HEADROOM = 0.9  # share of an advertised remaining quota to use
+
+# RPC connection pooling (keep-alive connections per RPC host)
+RPC_POOL_SIZE = int(os.getenv("RPC_POOL_SIZE", "16"))
+RPC_KEEPALIVE_SECONDS = 30
+RPC_TIMEOUT_SECONDS = 15
+RECEIPT_TIMEOUT_SECONDS = 60
+RECEIPT_POLL_SECONDS = 2  # head polling when no WebSocket subscription is available
+RECEIPT_WS_RETRY_SECONDS = 30  # poll this long before re-trying the subscription
+
+# JSON-RPC request coalescing (calls issued within the window share one batch)
+RPC_BATCH_WINDOW_SECONDS = 0.002
+RPC_MAX_BATCH_SIZE = 50
+
+# Multi-endpoint health scoring and hedged reads
+RPC_HEALTH_WINDOW = 200  # latency samples kept per endpoint
+RPC_ERROR_HALF_LIFE_SECONDS = 30  # a failing endpoint's penalty halves this often
+RPC_ERROR_PENALTY = 10  # score multiplier at a 100% error rate
+RPC_HEDGE_DEFAULT_DELAY = 0.5  # before an endpoint has a p95
+RPC_HEDGE_MIN_DELAY = 0.02
+
+# Block-keyed view cache: without a head subscription a head learned from a
+# poll or read is only trusted this long
+VIEW_CACHE_HEAD_MAX_AGE_SECONDS = 0.5
+
+# Event indexer: vault and hook logs into a local SQLite database
+INDEXER_DB_PATH = os.getenv("INDEXER_DB", "velvet_events.db")
+INDEXER_BACKFILL_BLOCKS = int(os.getenv("INDEXER_BACKFILL_BLOCKS", "10000"))  # first run starts this far back
+INDEXER_CHUNK_BLOCKS = 2000  # initial eth_getLogs range; halves on errors, grows while results are small
+INDEXER_MAX_CHUNK_BLOCKS = 10000
+INDEXER_TARGET_LOGS = 1000  # shrink the range when a chunk returns more than this
+INDEXER_REORG_DEPTH = 64  # block hashes kept per chain to find where a reorg forked
+INDEXER_POLL_SECONDS = 4  # catch-up interval when no new head wakes the indexer
+INDEXER_BUSY_TIMEOUT_MS = 10000  # how long a write waits on another process holding the database
+
+# EIP-1559 fee oracle (rolling eth_feeHistory window per chain)
+FEE_HISTORY_BLOCKS = 20
+FEE_HISTORY_INCREMENT = 4  # blocks fetched per background refresh
+FEE_REFRESH_SECONDS = 4
+
+# Gas limit estimation cache
+GAS_ESTIMATE_MARGIN = 1.2  # 20% headroom over eth_estimateGas
+GAS_ESTIMATE_MAX_AGE_BLOCKS = 1000  # re-estimate after this many blocks
+
+# Pre-signed emergency transactions: multiples of the EMERGENCY fee quote,
+# each step clears the 10% bump nodes require to replace a pending tx
+LADDER_FEE_MULTIPLIERS = (1.0, 1.5, 2.25, 3.5)
+
+# Submission scheduler
+SUBMIT_CONCURRENCY_PER_CHAIN = 2  # transactions being built/broadcast at once per chain
+SUBMIT_WAIT_SAMPLES = 200  # queue-wait samples kept per action
+REPLACEMENT_FEE_BUMP = 1.125  # same-nonce replacements must outbid by >10%
+
+# USDC allowance for the TokenMessenger: approve at least this much (in USDC)
+# whenever an approval is needed, so later withdrawals skip approve entirely
+USDC_STANDING_ALLOWANCE = int(float(os.getenv("USDC_STANDING_ALLOWANCE", "0")) * 10**6)
 
 # Contract ABIs (minimal for our functions)
 VAULT_ABI = [
@@ -185,6 +393,16 @@ ERC20_ABI = [
         "stateMutability": "nonpayable",
         "type": "function"
     },
+    {
+        "inputs": [
+            {"type": "address", "name": "owner"},
+            {"type": "address", "name": "spender"}
+        ],
+        "name": "allowance",
+        "outputs": [{"type": "uint256", "name": ""}],
+        "stateMutability": "view",
+        "type": "function"
+    },
     {
         "inputs": [
             {"type": "address", "name": "to"},
@@ -196,3 +414,198 @@ ERC20_ABI = [
         "type": "function"
     }
 ]
+
+# CCTP TokenMessenger (burn side of a withdraw)
+TOKEN_MESSENGER_ABI = [
+    {
+        "inputs": [
+            {"type": "uint256", "name": "amount"},
+            {"type": "uint32", "name": "destinationDomain"},
+            {"type": "bytes32", "name": "mintRecipient"},
+            {"type": "address", "name": "burnToken"}
+        ],
+        "name": "depositForBurn",
+        "outputs": [{"type": "uint64", "name": "nonce"}],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    }
+]
+
+
+# Events indexed into local storage (enums are uint8, PoolId is bytes32)
+VAULT_EVENTS_ABI = [
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "type": "address", "name": "user"},
+            {"indexed": False, "type": "uint256", "name": "amount"},
+            {"indexed": False, "type": "uint256", "name": "shares"}
+        ],
+        "name": "Deposited",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "type": "address", "name": "user"},
+            {"indexed": False, "type": "uint256", "name": "amount"},
+            {"indexed": False, "type": "uint256", "name": "shares"}
+        ],
+        "name": "Withdrawn",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": False, "type": "uint256", "name": "amount"},
+            {"indexed": False, "type": "uint256", "name": "destinationChain"},
+            {"indexed": False, "type": "bytes32", "name": "recipient"}
+        ],
+        "name": "GatewayDeposit",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": False, "type": "uint256", "name": "amount"},
+            {"indexed": False, "type": "uint256", "name": "yieldEarned"}
+        ],
+        "name": "BridgeCompleted",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "type": "address", "name": "oldAgent"},
+            {"indexed": True, "type": "address", "name": "newAgent"}
+        ],
+        "name": "AgentUpdated",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": False, "type": "uint8", "name": "oldState"},
+            {"indexed": False, "type": "uint8", "name": "newState"}
+        ],
+        "name": "StateChanged",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "type": "address", "name": "triggeredBy"},
+            {"indexed": False, "type": "string", "name": "reason"}
+        ],
+        "name": "CircuitBreakerTriggered",
+        "type": "event"
+    }
+]
+
+HOOK_EVENTS_ABI = [
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "type": "uint24", "name": "oldFee"},
+            {"indexed": True, "type": "uint24", "name": "newFee"},
+            {"indexed": False, "type": "string", "name": "reason"}
+        ],
+        "name": "FeeUpdated",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "type": "bytes32", "name": "poolId"},
+            {"indexed": False, "type": "uint24", "name": "newFee"}
+        ],
+        "name": "DynamicLPFeeUpdated",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": False, "type": "uint8", "name": "oldLevel"},
+            {"indexed": False, "type": "uint8", "name": "newLevel"}
+        ],
+        "name": "VolatilityUpdated",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "type": "address", "name": "from"},
+            {"indexed": False, "type": "uint256", "name": "amount"}
+        ],
+        "name": "LiquidityDeposited",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "type": "address", "name": "to"},
+            {"indexed": False, "type": "uint256", "name": "amount"}
+        ],
+        "name": "LiquidityWithdrawn",
+        "type": "event"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "type": "bytes32", "name": "poolId"},
+            {"indexed": True, "type": "address", "name": "sender"},
+            {"indexed": False, "type": "bool", "name": "zeroForOne"},
+            {"indexed": False, "type": "int256", "name": "amountSpecified"},
+            {"indexed": False, "type": "uint24", "name": "feeApplied"}
+        ],
+        "name": "SwapProcessed",
+        "type": "event"
+    }
+]
+
+# CCTP MessageTransmitter: MessageSent is logged by the burn, receiveMessage mints
+MESSAGE_TRANSMITTER_ABI = [
+    {
+        "inputs": [
+            {"type": "bytes", "name": "message"},
+            {"type": "bytes", "name": "attestation"}
+        ],
+        "name": "receiveMessage",
+        "outputs": [{"type": "bool", "name": "success"}],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": False, "type": "bytes", "name": "message"}
+        ],
+        "name": "MessageSent",
+        "type": "event"
+    }
+]
+
+# Vault bridge bookkeeping, called once the other leg has landed
+VAULT_BRIDGE_ABI = [
+    {
+        "inputs": [],
+        "name": "confirmDeployment",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "signalReturn",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "inputs": [{"type": "uint256", "name": "returnedAmount"}],
+        "name": "confirmReturn",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    }
+]
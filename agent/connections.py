@@ -0,0 +1,172 @@
+"""
+Velvet Arc Connections
+One process-wide set of outbound HTTP connection pools, warmed before the first tick
+"""
+import asyncio
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+import httpx
+from structlog import get_logger
+
+from config import (
+    HTTP_POOL_SIZE, HTTP_DNS_CACHE_SECONDS, HTTP_WARM_CONNECTIONS, HTTP_WARM_TIMEOUT_SECONDS,
+    RPC_POOL_SIZE, RPC_KEEPALIVE_SECONDS, RPC_TIMEOUT_SECONDS, MARKET_HTTP_TIMEOUT_SECONDS,
+)
+from rate_limit import RateLimiter
+
+logger = get_logger()
+
+try:
+    import h2  # noqa: F401  (httpx[http2])
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+CHAIN_ID_REQUEST = b'{"jsonrpc":"2.0","id":0,"method":"eth_chainId","params":[]}'
+
+
+class ConnectionManager:
+    """
+    The aiohttp session behind every JSON-RPC and attestation request and
+    the httpx client behind the market APIs (HTTP/2 when h2 is installed;
+    aiohttp only speaks HTTP/1.1, so that side relies on keep-alive). Both
+    pools are shared by everything in the process, with one DNS cache on
+    the aiohttp side, and every request on either waits its turn with the
+    RateLimiter, which outlives the pools. Users acquire() the manager and
+    release() it when done; the pools open on first use and close with the
+    last release.
+    """
+
+    def __init__(self, limiter: Optional[RateLimiter] = None):
+        self.limiter = limiter or RateLimiter()
+        self.users = 0
+        self.warmed: set[str] = set()  # origins with connections already open
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def acquire(self) -> "ConnectionManager":
+        self.users += 1
+        return self
+
+    async def release(self):
+        self.users -= 1
+        if self.users <= 0:
+            self.users = 0
+            await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Pooled session for JSON-RPC and attestation requests"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_SIZE,
+                limit_per_host=RPC_POOL_SIZE,
+                keepalive_timeout=RPC_KEEPALIVE_SECONDS,
+                ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+            )
+            trace = aiohttp.TraceConfig()
+            trace.on_request_start.append(self._on_request_start)
+            trace.on_request_end.append(self._on_request_end)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=RPC_TIMEOUT_SECONDS),
+                trace_configs=[trace],
+            )
+        return self._session
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Pooled client for the market-data APIs"""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                http2=HTTP2,
+                timeout=MARKET_HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=HTTP_POOL_SIZE,
+                    max_keepalive_connections=HTTP_POOL_SIZE,
+                    keepalive_expiry=RPC_KEEPALIVE_SECONDS,
+                ),
+                event_hooks={"request": [self._before_http], "response": [self._after_http]},
+            )
+        return self._http
+
+    async def warm(
+        self,
+        rpc_urls: Iterable[str] = (),
+        session_urls: Iterable[str] = (),
+        http_urls: Iterable[str] = (),
+    ):
+        """
+        Resolve and connect to each origin ahead of the first tick, with
+        HTTP_WARM_CONNECTIONS concurrent requests apiece so the pools hold
+        that many live connections: eth_chainId to JSON-RPC endpoints, HEAD
+        elsewhere. Failures only cost the warm-up.
+        """
+        requests = []
+        for urls, warm_one in ((rpc_urls, self._warm_rpc), (session_urls, self._warm_session), (http_urls, self._warm_http)):
+            for url in dict.fromkeys(urls):
+                origin = self._origin(url)
+                if origin in self.warmed:
+                    continue
+                self.warmed.add(origin)
+                requests += [warm_one(url) for _ in range(HTTP_WARM_CONNECTIONS)]
+        if not requests:
+            return
+
+        results = await asyncio.gather(
+            *(asyncio.wait_for(request, HTTP_WARM_TIMEOUT_SECONDS) for request in requests),
+            return_exceptions=True,
+        )
+        failed = [r for r in results if isinstance(r, Exception)]
+        for error in failed:
+            logger.debug("Connection warm-up failed", error=str(error) or type(error).__name__)
+        logger.info("Connections warmed", requests=len(requests), failed=len(failed), http2=HTTP2)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        self.warmed.clear()
+
+    async def _on_request_start(self, session, context, params: aiohttp.TraceRequestStartParams):
+        await self.limiter.acquire(params.url.host)
+
+    async def _on_request_end(self, session, context, params: aiohttp.TraceRequestEndParams):
+        self.limiter.observe(params.url.host, params.response.status, params.response.headers)
+
+    async def _before_http(self, request: httpx.Request):
+        await self.limiter.acquire(request.url.host)
+
+    async def _after_http(self, response: httpx.Response):
+        self.limiter.observe(response.request.url.host, response.status_code, response.headers)
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    async def _warm_rpc(self, url: str):
+        async with self.session.post(url, data=CHAIN_ID_REQUEST, headers={"Content-Type": "application/json"}) as response:
+            await response.read()
+
+    async def _warm_session(self, url: str):
+        async with self.session.head(self._origin(url)) as response:
+            await response.read()
+
+    async def _warm_http(self, url: str):
+        await self.http.head(self._origin(url))
+
+
+# Singleton instance
+_connections: Optional[ConnectionManager] = None
+
+def get_connections() -> ConnectionManager:
+    global _connections
+    if _connections is None:
+        _connections = ConnectionManager()
+    return _connections
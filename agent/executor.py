@@ -5,42 +5,88 @@ Signs and broadcasts transactions to Arc and Base
 import asyncio
 from typing import Optional
 from datetime import datetime
-from web3 import Web3, AsyncWeb3
-from web3.middleware import ExtraDataToPOAMiddleware
+from hexbytes import HexBytes
+from web3 import Web3
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
 from structlog import get_logger
 
 from config import (
-    ARC_TESTNET, BASE_SEPOLIA, CONTRACTS,
-    VAULT_ABI, HOOK_ABI, ERC20_ABI, PRIVATE_KEY
+    ARC_TESTNET, BASE_SEPOLIA, CONTRACTS, StrategyConfig,
+    VAULT_ABI, HOOK_ABI, ERC20_ABI, TOKEN_MESSENGER_ABI, PRIVATE_KEY
 )
 from decision_engine import Action, Decision, Position
+from multicall import ChainSnapshot, view_call
+from nonce_manager import NonceManager
+from fee_oracle import FeeQuote, Urgency
+from gas_estimator import GasEstimator
+from calldata import ContractHandle
+from presigned import PresignedLadder
+from receipts import PendingTx, ReceiptTracker
+from scheduler import SubmissionScheduler
+from indexer import EventIndexer
+from bridge import BridgeTracker
+from chain_pool import ChainPool
 
 logger = get_logger()
 
+# Fee tier per action: pay up to flee, stay cheap for routine fee tweaks
+ACTION_URGENCY = {
+    Action.EMERGENCY_EXIT: Urgency.EMERGENCY,
+    Action.WITHDRAW: Urgency.HIGH,
+    Action.DEPLOY: Urgency.NORMAL,
+    Action.ADJUST_FEE: Urgency.LOW,
+}
+
+# Receipt-tracker label of single-transaction actions, which can replace one another
+ACTION_LABEL = {
+    Action.EMERGENCY_EXIT: "emergencyExit",
+    Action.DEPLOY: "deploy",
+    Action.ADJUST_FEE: "adjust_fee",
+}
+
 
 class TransactionExecutor:
-    """Executes transactions on Arc and Base chains"""
+    """Executes transactions on Arc and Base chains for one vault/hook strategy"""
 
-    def __init__(self, private_key: str):
+    def __init__(self, private_key: str, strategy: Optional[StrategyConfig] = None, pool: Optional[ChainPool] = None):
         self.account: LocalAccount = Account.from_key(private_key)
+        self.strategy = strategy or StrategyConfig(
+            "default", CONTRACTS.vault_address, CONTRACTS.hook_address, private_key
+        )
+
+        # Clients, fee oracles, gas caches, receipt trackers, view caches and
+        # the event index are per chain and shared by every strategy in the
+        # process; an executor on its own gets a pool to itself
+        self._owns_pool = pool is None
+        self.pool = pool or ChainPool()
+        self.pool.register(self.strategy.vault_address, self.strategy.hook_address)
+
+        # Initialize async Web3 connections (sessions opened in connect())
+        self.arc = self.pool.arc
+        self.base = self.pool.base
+        self.w3_arc = self.arc.w3
+        self.w3_base = self.base.w3
 
-        # Initialize Web3 connections
-        self.w3_arc = Web3(Web3.HTTPProvider(ARC_TESTNET.rpc_url))
-        self.w3_base = Web3(Web3.HTTPProvider(BASE_SEPOLIA.rpc_url))
+        # Local nonce tracking per chain, shared with any strategy using the same signer
+        self.arc_nonces = self.pool.nonces(self.arc, self.account.address)
+        self.base_nonces = self.pool.nonces(self.base, self.account.address)
 
-        # Add PoA middleware for testnets
-        self.w3_arc.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
-        self.w3_base.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+        # Shared EIP-1559 fee oracles
+        self.arc_fees = self.pool.arc_fees
+        self.base_fees = self.pool.base_fees
+
+        # Cached gas limits; the hardcoded limits below are only fallbacks
+        self.arc_gas = self.pool.arc_gas
+        self.base_gas = self.pool.base_gas
 
         # Initialize contracts
         self.vault = self.w3_arc.eth.contract(
-            address=Web3.to_checksum_address(CONTRACTS.vault_address),
+            address=Web3.to_checksum_address(self.strategy.vault_address),
             abi=VAULT_ABI
         )
         self.hook = self.w3_base.eth.contract(
-            address=Web3.to_checksum_address(CONTRACTS.hook_address),
+            address=Web3.to_checksum_address(self.strategy.hook_address),
             abi=HOOK_ABI
         )
         self.usdc_arc = self.w3_arc.eth.contract(
@@ -52,27 +98,156 @@ class TransactionExecutor:
             abi=ERC20_ABI
         )
 
+        # Precompiled calldata encoders for everything we send
+        self.vault_calls = ContractHandle(self.strategy.vault_address, VAULT_ABI)
+        self.hook_calls = ContractHandle(self.strategy.hook_address, HOOK_ABI)
+        self.usdc_base_calls = ContractHandle(BASE_SEPOLIA.usdc_address, ERC20_ABI)
+        self.messenger_calls = ContractHandle(BASE_SEPOLIA.token_messenger, TOKEN_MESSENGER_ABI)
+
+        # Receipts resolved once per block; confirm nonces and drop bad gas estimates
+        self.arc_receipts = self.pool.arc_receipts
+        self.base_receipts = self.pool.base_receipts
+        self.receipts = self.pool.receipts
+
+        # Emergency exit kept signed at the next Arc nonce, one broadcast from sent
+        self.exit_ladder = PresignedLadder(
+            "emergency_exit", self.account, self.arc_nonces, self.arc_fees, self.arc_gas,
+            self.vault_calls.call("emergencyExit"), 300000,
+        )
+
+        # Priority lanes in front of execute(); see submit()
+        self.scheduler = SubmissionScheduler(self)
+
+        # USDC the TokenMessenger may burn for us; approve only when it runs short
+        self.usdc_allowance = self.pool.allowance(self.account)
+
+        # CCTP transfers from burn to vault confirmation; see main.py for positions
+        self.bridges = BridgeTracker(self, self.pool.attestations)
+
+        # Vault and hook events in a local SQLite index, followed in the background
+        self.events = self.pool.events
+
+        # Fixed mint recipients as bytes32
+        self.agent_recipient = Web3.to_bytes(hexstr=self.account.address).rjust(32, b'\x00')
+        self.vault_recipient = Web3.to_bytes(hexstr=self.strategy.vault_address).rjust(32, b'\x00')
+
+        # Batched state reads: one Multicall3 round trip per chain, skipped for
+        # values no new block (or, for vault and hook, no log) has touched.
+        # Concurrent strategies' reads coalesce into one JSON-RPC batch.
+        self.arc_views_cache = self.pool.arc_views_cache
+        self.base_views_cache = self.pool.base_views_cache
+        self.arc_multicall = self.pool.arc_multicall
+        self.base_multicall = self.pool.base_multicall
+        self.arc_views = [
+            view_call("vault_state", self.vault, "state", default=0),
+            view_call("total_deposits", self.vault, "totalDeposits", default=0),
+            view_call("vault_balance", self.usdc_arc, "balanceOf", self.vault.address, default=0),
+        ]
+        self.base_views = [
+            view_call("dynamic_fee", self.hook, "dynamicFee", default=3000),
+            view_call("total_liquidity", self.hook, "totalLiquidity", default=0),
+            view_call("volatility_level", self.hook, "volatilityLevel", default=0),
+            view_call("agent_balance", self.usdc_base, "balanceOf", self.account.address, default=0),
+        ]
+
         logger.info(
             "Executor initialized",
+            strategy=self.strategy.name,
             agent=self.account.address,
-            vault=CONTRACTS.vault_address,
-            hook=CONTRACTS.hook_address,
+            vault=self.strategy.vault_address,
+            hook=self.strategy.hook_address,
         )
 
+    @property
+    def arc_indexer(self) -> Optional[EventIndexer]:
+        return self.pool.arc_indexer
+
+    @property
+    def base_indexer(self) -> Optional[EventIndexer]:
+        return self.pool.base_indexer
+
+    async def connect(self):
+        """Open pooled RPC sessions for both chains"""
+        await self.pool.connect()
+
+        # Prime nonces now so the first (possibly urgent) tx skips the lookup;
+        # a signer another strategy already synced is left alone
+        results = await asyncio.gather(
+            *(nonces.sync() for nonces in (self.arc_nonces, self.base_nonces) if nonces.next_nonce is None),
+            self.usdc_allowance.refresh(),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Executor warm-up step failed", error=str(result))
+
+        # Needs the nonce and fee quotes loaded above
+        results = await asyncio.gather(
+            self.exit_ladder.start(),
+            self.bridges.start(), self.scheduler.start(),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Executor warm-up step failed", error=str(result))
+
+    async def close(self):
+        await self.scheduler.stop()
+        await self.bridges.stop()
+        await self.exit_ladder.stop()
+        if self._owns_pool:
+            await self.pool.close()
+
+    async def get_snapshot(self) -> tuple[ChainSnapshot, ChainSnapshot]:
+        """Read all vault, hook and USDC views for Arc and Base in parallel"""
+        return await asyncio.gather(
+            self.arc_multicall.snapshot(self.arc_views),
+            self.base_multicall.snapshot(self.base_views),
+        )
+
+    def view_cache_stats(self) -> dict:
+        """Hit/miss counters of both chains' view caches"""
+        return {
+            cache.client.chain.name: {**vars(cache.stats), "hit_rate": round(cache.stats.hit_rate, 3)}
+            for cache in (self.arc_views_cache, self.base_views_cache)
+        }
+
+    @staticmethod
+    def vault_state_from(arc: ChainSnapshot) -> dict:
+        state = arc["vault_state"]
+        return {
+            "state": state,
+            "total_deposits": arc["total_deposits"],
+            "balance": arc["vault_balance"],
+            "state_name": ["IDLE", "BRIDGING_OUT", "DEPLOYED", "BRIDGING_BACK", "PROTECTED"][state] if state < 5 else "UNKNOWN",
+            "block_number": arc.block_number,
+        }
+
+    @staticmethod
+    def hook_state_from(base: ChainSnapshot) -> dict:
+        volatility = base["volatility_level"]
+        return {
+            "dynamic_fee": base["dynamic_fee"],
+            "total_liquidity": base["total_liquidity"],
+            "volatility_level": volatility,
+            "volatility_name": ["LOW", "MEDIUM", "HIGH", "EXTREME"][volatility] if volatility < 4 else "UNKNOWN",
+            "block_number": base.block_number,
+        }
+
+    @staticmethod
+    def balances_from(arc: ChainSnapshot, base: ChainSnapshot) -> dict:
+        return {
+            "arc_vault": arc["vault_balance"],
+            "base_agent": base["agent_balance"],
+            "arc_block": arc.block_number,
+            "base_block": base.block_number,
+        }
+
     async def get_vault_state(self) -> dict:
         """Get current vault state from Arc"""
         try:
-            state = self.vault.functions.state().call()
-            total_deposits = self.vault.functions.totalDeposits().call()
-            # Get vault USDC balance directly
-            balance = self.usdc_arc.functions.balanceOf(CONTRACTS.vault_address).call()
-
-            return {
-                "state": state,
-                "total_deposits": total_deposits,
-                "balance": balance,
-                "state_name": ["IDLE", "BRIDGING_OUT", "DEPLOYED", "BRIDGING_BACK", "PROTECTED"][state]
-            }
+            arc = await self.arc_multicall.snapshot(self.arc_views)
+            return self.vault_state_from(arc)
         except Exception as e:
             logger.error("Failed to get vault state", error=str(e))
             return {"state": 0, "total_deposits": 0, "balance": 0, "state_name": "UNKNOWN"}
@@ -80,16 +255,8 @@ class TransactionExecutor:
     async def get_hook_state(self) -> dict:
         """Get current hook state from Base"""
         try:
-            fee = self.hook.functions.dynamicFee().call()
-            liquidity = self.hook.functions.totalLiquidity().call()
-            volatility = self.hook.functions.volatilityLevel().call()
-
-            return {
-                "dynamic_fee": fee,
-                "total_liquidity": liquidity,
-                "volatility_level": volatility,
-                "volatility_name": ["LOW", "MEDIUM", "HIGH", "EXTREME"][volatility] if volatility < 4 else "UNKNOWN",
-            }
+            base = await self.base_multicall.snapshot(self.base_views)
+            return self.hook_state_from(base)
         except Exception as e:
             logger.error("Failed to get hook state", error=str(e))
             return {"dynamic_fee": 3000, "total_liquidity": 0, "volatility_level": 0, "volatility_name": "LOW"}
@@ -97,21 +264,32 @@ class TransactionExecutor:
     async def get_balances(self) -> dict:
         """Get USDC balances on both chains"""
         try:
-            arc_balance = self.usdc_arc.functions.balanceOf(
-                CONTRACTS.vault_address
-            ).call()
-
-            base_balance = self.usdc_base.functions.balanceOf(
-                self.account.address
-            ).call()
+            arc, base = await self.get_snapshot()
+            return self.balances_from(arc, base)
+        except Exception as e:
+            logger.error("Failed to get balances", error=str(e))
+            return {"arc_vault": 0, "base_agent": 0}
 
+    async def get_chain_state(self) -> dict:
+        """Balances, hook and vault state from one block-consistent snapshot per chain"""
+        try:
+            arc, base = await self.get_snapshot()
             return {
-                "arc_vault": arc_balance,
-                "base_agent": base_balance,
+                "balances": self.balances_from(arc, base),
+                "hook": self.hook_state_from(base),
+                "vault": self.vault_state_from(arc),
             }
         except Exception as e:
-            logger.error("Failed to get balances", error=str(e))
-            return {"arc_vault": 0, "base_agent": 0}
+            logger.error("Failed to get chain state", error=str(e))
+            return {
+                "balances": {"arc_vault": 0, "base_agent": 0},
+                "hook": {"dynamic_fee": 3000, "total_liquidity": 0, "volatility_level": 0, "volatility_name": "LOW"},
+                "vault": {"state": 0, "total_deposits": 0, "balance": 0, "state_name": "UNKNOWN"},
+            }
+
+    def submit(self, decision: Decision) -> asyncio.Future:
+        """Queue a decision by priority; the future resolves to its tx hash, or None"""
+        return self.scheduler.submit(decision)
 
     async def execute(self, decision: Decision) -> Optional[str]:
         """Execute a decision and return tx hash"""
@@ -134,6 +312,149 @@ class TransactionExecutor:
 
         return None
 
+    def confirmation(self, tx_hash: str) -> Optional[asyncio.Future]:
+        """Future resolving to the receipt of a transaction sent by execute(), while pending"""
+        for tracker in self.receipts.values():
+            future = tracker.future(tx_hash)
+            if future is not None:
+                return future
+        return None
+
+    def pending_transactions(self) -> list[dict]:
+        """This strategy's sent transactions still waiting for a receipt, across both chains"""
+        return [
+            {"chain": tracker.client.chain.name, **row}
+            for tracker in self.receipts.values()
+            for row in tracker.table(owner=self.strategy.name)
+        ]
+
+    async def _sign_and_send(self, nonces: NonceManager, tx: dict, label: str) -> HexBytes:
+        """Sign and broadcast a built transaction, releasing its nonce on failure"""
+        try:
+            signed = self.account.sign_transaction(tx)
+            tx_hash = await nonces.client.w3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception as e:
+            await nonces.fail(tx["nonce"], e)
+            raise
+        self.receipts[tx["chainId"]].track(
+            tx_hash, label, nonce=tx["nonce"], tx=tx, nonces=nonces, owner=self.strategy.name
+        )
+        return tx_hash
+
+    async def send_calls(self, chain_id: int, calls: list[tuple[dict, int, str]], urgency: Urgency) -> list[HexBytes]:
+        """Send (call, fallback gas, label) contract calls on one chain at consecutive nonces"""
+        client, nonces, oracle, estimator = (
+            (self.arc, self.arc_nonces, self.arc_fees, self.arc_gas) if chain_id == ARC_TESTNET.chain_id
+            else (self.base, self.base_nonces, self.base_fees, self.base_gas)
+        )
+        fees = await oracle.quote(urgency)
+        nonce = await nonces.reserve(len(calls))
+
+        try:
+            txs = [self._tx_params(nonces, call, nonce + i, gas, fees) for i, (call, gas, _) in enumerate(calls)]
+            limits = await asyncio.gather(*(estimator.gas_limit(tx, fallback=tx['gas']) for tx in txs))
+        except Exception as e:
+            for n in reversed(range(nonce, nonce + len(calls))):
+                await nonces.fail(n, e)
+            raise
+
+        hashes = []
+        for i, (tx, gas, (_, _, label)) in enumerate(zip(txs, limits, calls)):
+            tx['gas'] = gas
+            try:
+                hashes.append(await self._sign_and_send(nonces, tx, label))
+            except Exception as e:
+                # _sign_and_send released this nonce; the ones after it never went out
+                for n in reversed(range(nonce + i + 1, nonce + len(calls))):
+                    await nonces.fail(n, e)
+                raise
+        return hashes
+
+    def _tx_params(self, nonces: NonceManager, call: dict, nonce: int, gas: int, fees: FeeQuote) -> dict:
+        return {
+            **call,
+            'from': self.account.address,
+            'nonce': nonce,
+            'gas': gas,
+            'chainId': nonces.client.chain.chain_id,
+            **fees.to_tx_params(),
+        }
+
+    async def _build(
+        self, nonces: NonceManager, estimator: GasEstimator, call: dict, nonce: int, gas: int, fees: FeeQuote
+    ) -> dict:
+        """Build a contract call transaction, releasing its nonce on failure"""
+        try:
+            tx = self._tx_params(nonces, call, nonce, gas, fees)
+            tx['gas'] = await estimator.gas_limit(tx, fallback=gas)
+            return tx
+        except Exception as e:
+            await nonces.fail(nonce, e)
+            raise
+
+    def _single_call(self, decision: Decision) -> tuple[dict, int]:
+        """Call fields and fallback gas limit for a single-transaction action"""
+        if decision.action == Action.DEPLOY:
+            # Mint recipient is our agent address as bytes32
+            return self.vault_calls.call(
+                "bridgeToExecution",
+                decision.parameters.get("amount", 0),
+                BASE_SEPOLIA.cctp_domain,  # destination domain (Base = 6)
+                self.agent_recipient,
+            ), 500000
+        if decision.action == Action.ADJUST_FEE:
+            reason = decision.reasoning[:100] if decision.reasoning else "Market conditions"
+            return self.hook_calls.call(
+                "updateDynamicFee", decision.parameters.get("new_fee_bps", 3000), reason
+            ), 150000
+        if decision.action == Action.EMERGENCY_EXIT:
+            return self.vault_calls.call("emergencyExit"), 300000
+        raise ValueError(f"{decision.action.value} is not a single transaction")
+
+    def pending_for(self, action: Action) -> Optional[PendingTx]:
+        """Latest unmined transaction sent for a single-transaction action"""
+        label = ACTION_LABEL.get(action)
+        if label is None:
+            return None
+        return self._receipts_for(action).latest(label, owner=self.strategy.name)
+
+    def _receipts_for(self, action: Action) -> ReceiptTracker:
+        return self.arc_receipts if action in (Action.DEPLOY, Action.EMERGENCY_EXIT) else self.base_receipts
+
+    async def replace(self, pending: PendingTx, decision: Decision) -> Optional[str]:
+        """Re-send a pending transaction's nonce with this decision's call, outbidding it"""
+        # Pre-signed ladder entries carry no fees to outbid
+        if pending.tx is None or 'nonce' not in pending.tx:
+            return None
+
+        tracker = self._receipts_for(decision.action)
+        nonces = pending.nonces or (self.arc_nonces if tracker is self.arc_receipts else self.base_nonces)
+        estimator = tracker.estimator
+        oracle = self.arc_fees if tracker is self.arc_receipts else self.base_fees
+        label = ACTION_LABEL[decision.action]
+
+        try:
+            call, gas = self._single_call(decision)
+            fees = (await oracle.quote(ACTION_URGENCY[decision.action])).replacing(pending.tx)
+            tx = self._tx_params(nonces, call, pending.nonce, gas, fees)
+            tx['gas'] = await estimator.gas_limit(tx, fallback=gas)
+            signed = self.account.sign_transaction(tx)
+            tx_hash = await nonces.client.w3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception as e:
+            # Usually the original was mined in the meantime ("nonce too low")
+            logger.warning("Replacement failed", label=label, nonce=pending.nonce, error=str(e))
+            return None
+
+        tracker.replace(pending, tx_hash, label, tx)
+        logger.info(
+            "Transaction replaced",
+            label=label,
+            replaced=pending.label,
+            nonce=pending.nonce,
+            tx_hash=tx_hash.hex(),
+        )
+        return tx_hash.hex()
+
     async def _execute_deploy(self, decision: Decision) -> Optional[str]:
         """Bridge funds from Arc to Base"""
         amount = decision.parameters.get("amount", 0)
@@ -141,28 +462,14 @@ class TransactionExecutor:
         logger.info("Executing DEPLOY", amount=amount / 10**6)
 
         try:
-            # Prepare mint recipient (our agent address as bytes32)
-            mint_recipient = Web3.to_bytes(hexstr=self.account.address).rjust(32, b'\x00')
+            fees = await self.arc_fees.quote(ACTION_URGENCY[Action.DEPLOY])
+            nonce = await self.arc_nonces.reserve()
 
-            # Build transaction
-            nonce = self.w3_arc.eth.get_transaction_count(self.account.address)
-            gas_price = self.w3_arc.eth.gas_price
-
-            tx = self.vault.functions.bridgeToExecution(
-                amount,
-                BASE_SEPOLIA.cctp_domain,  # destination domain (Base = 6)
-                mint_recipient
-            ).build_transaction({
-                'from': self.account.address,
-                'nonce': nonce,
-                'gas': 500000,
-                'gasPrice': gas_price,
-                'chainId': ARC_TESTNET.chain_id,
-            })
+            call, gas = self._single_call(decision)
+            tx = await self._build(self.arc_nonces, self.arc_gas, call, nonce, gas, fees)
 
             # Sign and send
-            signed = self.account.sign_transaction(tx)
-            tx_hash = self.w3_arc.eth.send_raw_transaction(signed.raw_transaction)
+            tx_hash = await self._sign_and_send(self.arc_nonces, tx, "deploy")
 
             logger.info(
                 "DEPLOY transaction sent",
@@ -185,67 +492,53 @@ class TransactionExecutor:
         try:
             # On Base, we need to call the TokenMessenger directly
             # This is a simplified version - in production, use LI.FI SDK
-            token_messenger = self.w3_base.eth.contract(
-                address=Web3.to_checksum_address(BASE_SEPOLIA.token_messenger),
-                abi=[{
-                    "inputs": [
-                        {"type": "uint256", "name": "amount"},
-                        {"type": "uint32", "name": "destinationDomain"},
-                        {"type": "bytes32", "name": "mintRecipient"},
-                        {"type": "address", "name": "burnToken"}
-                    ],
-                    "name": "depositForBurn",
-                    "outputs": [{"type": "uint64", "name": "nonce"}],
-                    "stateMutability": "nonpayable",
-                    "type": "function"
-                }]
+            # When an approve is needed, approve and burn use consecutive
+            # nonces so both are signed up front and broadcast back-to-back
+            fees, approval = await asyncio.gather(
+                self.base_fees.quote(ACTION_URGENCY[Action.WITHDRAW]),
+                self.usdc_allowance.approval_needed(amount),
             )
-
-            # Prepare mint recipient (vault address on Arc)
-            mint_recipient = Web3.to_bytes(
-                hexstr=CONTRACTS.vault_address
-            ).rjust(32, b'\x00')
-
-            # First approve USDC
-            nonce = self.w3_base.eth.get_transaction_count(self.account.address)
-            gas_price = self.w3_base.eth.gas_price
-
-            approve_tx = self.usdc_base.functions.approve(
-                BASE_SEPOLIA.token_messenger,
-                amount
-            ).build_transaction({
-                'from': self.account.address,
-                'nonce': nonce,
-                'gas': 100000,
-                'gasPrice': gas_price,
-                'chainId': BASE_SEPOLIA.chain_id,
-            })
-
-            signed_approve = self.account.sign_transaction(approve_tx)
-            approve_hash = self.w3_base.eth.send_raw_transaction(signed_approve.raw_transaction)
-
-            logger.info("USDC approval sent", tx_hash=approve_hash.hex())
-
-            # Wait for approval
-            self.w3_base.eth.wait_for_transaction_receipt(approve_hash, timeout=60)
-
-            # Now bridge
-            nonce += 1
-            bridge_tx = token_messenger.functions.depositForBurn(
-                amount,
-                ARC_TESTNET.cctp_domain,  # destination domain (Arc = 26)
-                mint_recipient,
-                BASE_SEPOLIA.usdc_address
-            ).build_transaction({
-                'from': self.account.address,
-                'nonce': nonce,
-                'gas': 500000,
-                'gasPrice': gas_price,
-                'chainId': BASE_SEPOLIA.chain_id,
-            })
-
-            signed_bridge = self.account.sign_transaction(bridge_tx)
-            bridge_hash = self.w3_base.eth.send_raw_transaction(signed_bridge.raw_transaction)
+            count = 1 if approval is None else 2
+            nonce = await self.base_nonces.reserve(count)
+
+            try:
+                bridge_tx = self._tx_params(
+                    self.base_nonces,
+                    self.messenger_calls.call(
+                        "depositForBurn",
+                        amount,
+                        ARC_TESTNET.cctp_domain,  # destination domain (Arc = 26)
+                        self.vault_recipient,  # mint to the vault on Arc
+                        self.usdc_base_calls.address,
+                    ),
+                    nonce + count - 1, 500000, fees,
+                )
+                if approval is None:
+                    bridge_tx['gas'] = await self.base_gas.gas_limit(bridge_tx, fallback=500000)
+                else:
+                    approve_tx = self._tx_params(
+                        self.base_nonces,
+                        self.usdc_base_calls.call("approve", self.messenger_calls.address, approval),
+                        nonce, 100000, fees,
+                    )
+                    approve_tx['gas'], bridge_tx['gas'] = await asyncio.gather(
+                        self.base_gas.gas_limit(approve_tx, fallback=100000),
+                        self.base_gas.gas_limit(bridge_tx, fallback=500000),
+                    )
+            except Exception as e:
+                for n in reversed(range(nonce, nonce + count)):
+                    await self.base_nonces.fail(n, e)
+                raise
+
+            if approval is not None:
+                approve_hash = await self._sign_and_send(self.base_nonces, approve_tx, "approve")
+                self.usdc_allowance.approved(approval)
+                self.usdc_allowance.watch(self.base_receipts.future(approve_hash))
+                logger.info("USDC approval sent", tx_hash=approve_hash.hex(), allowance=approval / 10**6)
+
+            bridge_hash = await self._sign_and_send(self.base_nonces, bridge_tx, "withdraw")
+            self.usdc_allowance.spent(amount)
+            self.usdc_allowance.watch(self.base_receipts.future(bridge_hash))
 
             logger.info(
                 "WITHDRAW transaction sent",
@@ -256,37 +549,61 @@ class TransactionExecutor:
             return bridge_hash.hex()
 
         except Exception as e:
+            self.usdc_allowance.invalidate()
             logger.error("WITHDRAW failed", error=str(e))
             return None
 
     async def _execute_emergency_exit(self, decision: Decision) -> Optional[str]:
         """Trigger emergency exit on vault"""
         logger.warning("Executing EMERGENCY EXIT")
+        return await self._fire_emergency(self.exit_ladder, "emergencyExit")
 
+    async def escalate_exit(self, pending: PendingTx) -> Optional[str]:
+        """Re-send a stuck pre-signed exit at the ladder's next fee rung"""
+        if pending.nonce != self.exit_ladder.nonce:
+            return None
         try:
-            nonce = self.w3_arc.eth.get_transaction_count(self.account.address)
-            gas_price = self.w3_arc.eth.gas_price
+            tx_hash = await self.exit_ladder.escalate()
+        except Exception as e:
+            logger.warning("Exit escalation failed", nonce=pending.nonce, error=str(e))
+            return None
+        if tx_hash is None:
+            return None  # already at the top rung
 
-            tx = self.vault.functions.emergencyExit().build_transaction({
-                'from': self.account.address,
-                'nonce': nonce,
-                'gas': 300000,
-                'gasPrice': gas_price,
-                'chainId': ARC_TESTNET.chain_id,
-            })
+        self.arc_receipts.replace(pending, tx_hash, pending.label, pending.tx)
+        logger.warning("Emergency exit escalated", nonce=pending.nonce, rung=self.exit_ladder.fired_rung, tx_hash=tx_hash.hex())
+        return tx_hash.hex()
 
-            signed = self.account.sign_transaction(tx)
-            tx_hash = self.w3_arc.eth.send_raw_transaction(signed.raw_transaction)
+    async def _fire_emergency(self, ladder: PresignedLadder, fn_name: str, *args) -> Optional[str]:
+        """Broadcast the pre-signed transaction, building it from scratch if the ladder is stale"""
+        try:
+            tx_hash = await ladder.fire()
+
+            if tx_hash is None:
+                logger.warning("Pre-signed transaction unavailable, building", ladder=ladder.name)
+                fees = await self.arc_fees.quote(Urgency.EMERGENCY)
+                nonce = await self.arc_nonces.reserve()
+
+                tx = await self._build(
+                    self.arc_nonces, self.arc_gas, self.vault_calls.call(fn_name, *args), nonce, 300000, fees
+                )
+                tx_hash = await self._sign_and_send(self.arc_nonces, tx, fn_name)
+            else:
+                self.arc_receipts.track(
+                    tx_hash, fn_name, nonce=ladder.nonce, tx=ladder.call,
+                    nonces=self.arc_nonces, owner=self.strategy.name,
+                )
 
             logger.warning(
-                "EMERGENCY EXIT transaction sent",
+                "EMERGENCY transaction sent",
+                function=fn_name,
                 tx_hash=tx_hash.hex(),
             )
 
             return tx_hash.hex()
 
         except Exception as e:
-            logger.error("EMERGENCY EXIT failed", error=str(e))
+            logger.error("EMERGENCY transaction failed", function=fn_name, error=str(e))
             return None
 
     async def _execute_fee_adjustment(self, decision: Decision) -> Optional[str]:
@@ -297,19 +614,12 @@ class TransactionExecutor:
         logger.info("Executing FEE ADJUSTMENT", new_fee_bps=new_fee)
 
         try:
-            nonce = self.w3_base.eth.get_transaction_count(self.account.address)
-            gas_price = self.w3_base.eth.gas_price
+            fees = await self.base_fees.quote(ACTION_URGENCY[Action.ADJUST_FEE])
+            nonce = await self.base_nonces.reserve()
 
-            tx = self.hook.functions.updateDynamicFee(new_fee, reason).build_transaction({
-                'from': self.account.address,
-                'nonce': nonce,
-                'gas': 150000,
-                'gasPrice': gas_price,
-                'chainId': BASE_SEPOLIA.chain_id,
-            })
-
-            signed = self.account.sign_transaction(tx)
-            tx_hash = self.w3_base.eth.send_raw_transaction(signed.raw_transaction)
+            call, gas = self._single_call(decision)
+            tx = await self._build(self.base_nonces, self.base_gas, call, nonce, gas, fees)
+            tx_hash = await self._sign_and_send(self.base_nonces, tx, "adjust_fee")
 
             logger.info(
                 "FEE ADJUSTMENT transaction sent",
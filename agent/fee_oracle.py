@@ -0,0 +1,223 @@
+"""
+Velvet Arc Fee Oracle
+Rolling eth_feeHistory window per chain, serving EIP-1559 fees by urgency tier
+"""
+import asyncio
+import math
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional
+
+from structlog import get_logger
+
+from config import FEE_HISTORY_BLOCKS, FEE_HISTORY_INCREMENT, FEE_REFRESH_SECONDS, REPLACEMENT_FEE_BUMP
+from rpc import ChainClient
+
+logger = get_logger()
+
+
+class Urgency(Enum):
+    """How quickly a transaction needs to be included"""
+    LOW = "LOW"  # Routine maintenance, happy to wait a few blocks
+    NORMAL = "NORMAL"
+    HIGH = "HIGH"
+    EMERGENCY = "EMERGENCY"  # Next block, whatever it costs
+
+
+# Tip percentile of recent blocks and base-fee headroom per tier
+URGENCY_PERCENTILE = {
+    Urgency.LOW: 10,
+    Urgency.NORMAL: 50,
+    Urgency.HIGH: 75,
+    Urgency.EMERGENCY: 95,
+}
+BASE_FEE_MULTIPLIER = {
+    Urgency.LOW: 1.25,
+    Urgency.NORMAL: 2.0,
+    Urgency.HIGH: 2.0,
+    Urgency.EMERGENCY: 3.0,
+}
+# Legacy (pre-1559) chains only have one knob
+LEGACY_MULTIPLIER = {
+    Urgency.LOW: 1.0,
+    Urgency.NORMAL: 1.0,
+    Urgency.HIGH: 1.1,
+    Urgency.EMERGENCY: 1.25,
+}
+PERCENTILES = sorted(set(URGENCY_PERCENTILE.values()))
+
+METHOD_NOT_FOUND = -32601
+
+
+class NoBaseFee(Exception):
+    """eth_feeHistory answered, but without base fees: a pre-1559 chain"""
+
+
+def _method_not_found(error: Exception) -> bool:
+    """Whether an RPC error says the node doesn't implement the method, as opposed to a transient failure"""
+    response = getattr(error, "rpc_response", None) or {}
+    details = response.get("error") if isinstance(response, dict) else None
+    if details is None and error.args and isinstance(error.args[0], dict):
+        details = error.args[0]  # web3 v6 raises ValueError(error_dict)
+    if isinstance(details, dict) and details.get("code") == METHOD_NOT_FOUND:
+        return True
+    message = str(error).lower()
+    return "method not found" in message or "does not exist/is not available" in message
+
+
+@dataclass(frozen=True)
+class FeeQuote:
+    """Fee fields for one transaction"""
+    max_fee_per_gas: int
+    max_priority_fee_per_gas: int
+    legacy: bool = False
+
+    def to_tx_params(self) -> dict:
+        if self.legacy:
+            return {'gasPrice': self.max_fee_per_gas}
+        return {
+            'maxFeePerGas': self.max_fee_per_gas,
+            'maxPriorityFeePerGas': self.max_priority_fee_per_gas,
+        }
+
+    def replacing(self, previous_tx: dict, bump: float = REPLACEMENT_FEE_BUMP) -> "FeeQuote":
+        """This quote, raised where needed to outbid previous_tx at the same nonce"""
+        if self.legacy or 'gasPrice' in previous_tx:
+            floor = math.ceil(previous_tx.get('gasPrice', previous_tx.get('maxFeePerGas', 0)) * bump)
+            price = max(self.max_fee_per_gas, floor)
+            return FeeQuote(max_fee_per_gas=price, max_priority_fee_per_gas=price, legacy=True)
+        return FeeQuote(
+            max_fee_per_gas=max(self.max_fee_per_gas, math.ceil(previous_tx['maxFeePerGas'] * bump)),
+            max_priority_fee_per_gas=max(
+                self.max_priority_fee_per_gas, math.ceil(previous_tx['maxPriorityFeePerGas'] * bump)
+            ),
+        )
+
+
+class FeeOracle:
+    """Keeps recent tips and the next base fee for one chain, refreshed in the background"""
+
+    def __init__(self, client: ChainClient, window: int = FEE_HISTORY_BLOCKS):
+        self.client = client
+        self.window = window
+
+        # Per-block tips at each percentile, plus running sums for O(1) means
+        self._rewards: deque[list[int]] = deque(maxlen=window)
+        self._reward_sums = [0] * len(PERCENTILES)
+        self._last_block: Optional[int] = None
+        self.next_base_fee: Optional[int] = None
+        self.legacy = False
+
+        self._quotes: dict[Urgency, FeeQuote] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        # Called whenever the quotes change
+        self.listeners: list[Callable[[], None]] = []
+
+    @property
+    def gas_price_gwei(self) -> Optional[float]:
+        """Expected effective gas price for a normal transaction"""
+        quote = self._quotes.get(Urgency.NORMAL)
+        if quote is None:
+            return None
+        if quote.legacy:
+            return quote.max_fee_per_gas / 1e9
+        return (self.next_base_fee + quote.max_priority_fee_per_gas) / 1e9
+
+    async def start(self):
+        """Load the window and keep it fresh in the background"""
+        await self.refresh()
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def quote(self, urgency: Urgency = Urgency.NORMAL) -> FeeQuote:
+        """Fees for the given tier, from cache unless the oracle has never loaded"""
+        quote = self._quotes.get(urgency)
+        if quote is None:
+            await self.refresh()
+            quote = self._quotes[urgency]
+        return quote
+
+    async def refresh(self):
+        if self.legacy:
+            await self._refresh_legacy()
+            return
+
+        count = self.window if self._last_block is None else FEE_HISTORY_INCREMENT
+        try:
+            history = await self.client.w3.eth.fee_history(count, "latest", PERCENTILES)
+            base_fees = history["baseFeePerGas"]
+            if not base_fees or not base_fees[-1]:
+                raise NoBaseFee("chain reports no base fee")
+        except Exception as e:
+            if isinstance(e, NoBaseFee) or _method_not_found(e):
+                # Pre-1559 chain: switch to legacy pricing for good
+                logger.warning("Fee history unsupported, using legacy gas price", chain=self.client.chain.name, error=str(e))
+                self.legacy = True
+                await self._refresh_legacy()
+            elif not self._quotes:
+                # Transient failure before the first load: serve legacy until history returns
+                logger.warning("Fee history failed, using legacy gas price", chain=self.client.chain.name, error=str(e))
+                await self._refresh_legacy()
+            else:
+                # Transient failure: keep serving the last quotes
+                logger.warning("Fee history refresh failed", chain=self.client.chain.name, error=str(e))
+            return
+
+        oldest = history["oldestBlock"]
+        for offset, block_rewards in enumerate(history.get("reward") or []):
+            block = oldest + offset
+            # Overlapping blocks from the previous refresh are already counted
+            if self._last_block is not None and block <= self._last_block:
+                continue
+            self._push([int(r) for r in block_rewards])
+            self._last_block = block
+
+        self.client.observe_block(oldest + len(history["gasUsedRatio"]) - 1)
+        self.next_base_fee = base_fees[-1]
+        self._recompute()
+
+    def _push(self, block_rewards: list[int]):
+        if len(self._rewards) == self._rewards.maxlen:
+            evicted = self._rewards[0]
+            self._reward_sums = [s - r for s, r in zip(self._reward_sums, evicted)]
+        self._rewards.append(block_rewards)
+        self._reward_sums = [s + r for s, r in zip(self._reward_sums, block_rewards)]
+
+    def _recompute(self):
+        blocks = max(len(self._rewards), 1)
+        quotes = {}
+        for urgency, percentile in URGENCY_PERCENTILE.items():
+            tip = self._reward_sums[PERCENTILES.index(percentile)] // blocks
+            max_fee = int(self.next_base_fee * BASE_FEE_MULTIPLIER[urgency]) + tip
+            quotes[urgency] = FeeQuote(max_fee_per_gas=max_fee, max_priority_fee_per_gas=tip)
+        self._set_quotes(quotes)
+
+    async def _refresh_legacy(self):
+        gas_price = await self.client.w3.eth.gas_price
+        quotes = {}
+        for urgency, multiplier in LEGACY_MULTIPLIER.items():
+            price = int(gas_price * multiplier)
+            quotes[urgency] = FeeQuote(max_fee_per_gas=price, max_priority_fee_per_gas=price, legacy=True)
+        self._set_quotes(quotes)
+
+    def _set_quotes(self, quotes: dict[Urgency, FeeQuote]):
+        if quotes == self._quotes:
+            return
+        self._quotes = quotes
+        for listener in self.listeners:
+            listener()
+
+    async def _refresh_forever(self):
+        while True:
+            await asyncio.sleep(FEE_REFRESH_SECONDS)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("Fee refresh failed", chain=self.client.chain.name, error=str(e))
@@ -0,0 +1,368 @@
+"""
+Velvet Arc Fleet
+Shards strategies across worker processes fed by one market-data producer over a Unix socket
+"""
+import asyncio
+import bisect
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime
+from multiprocessing.process import BaseProcess
+from typing import Iterable, Optional
+
+from eth_account import Account
+from structlog import get_logger
+
+from config import (
+    ARC_TESTNET, SCAN_INTERVAL_SECONDS, StrategyConfig,
+    FLEET_WORKERS, FLEET_SOCKET_PATH, FLEET_RING_REPLICAS, FLEET_MONITOR_SECONDS, FLEET_STOP_TIMEOUT_SECONDS,
+    FLEET_RESPAWN_SECONDS, FLEET_MAX_RESPAWN_SECONDS, FLEET_HEALTHY_SECONDS,
+)
+from connections import get_connections
+from market_data import MarketDataFetcher, MarketConditions
+
+logger = get_logger()
+
+
+class HashRing:
+    """
+    Consistent hashing of keys onto nodes, FLEET_RING_REPLICAS virtual
+    points per node. Removing a node only moves the keys it owned.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = FLEET_RING_REPLICAS):
+        self.replicas = replicas
+        self._points: list[int] = []
+        self._owners: list[str] = []
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+    @property
+    def nodes(self) -> set[str]:
+        return set(self._owners)
+
+    def add(self, node: str):
+        for i in range(self.replicas):
+            point = self._hash(f"{node}#{i}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str):
+        kept = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    def node_for(self, key: str) -> str:
+        if not self._points:
+            raise LookupError("hash ring has no nodes")
+        index = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._owners[index]
+
+    def assign(self, strategies: list[StrategyConfig]) -> dict[str, list[StrategyConfig]]:
+        """Strategies per node, keyed by signer: one key's nonces must stay in one process"""
+        shards: dict[str, list[StrategyConfig]] = {}
+        for strategy in strategies:
+            signer = Account.from_key(strategy.private_key).address
+            shards.setdefault(self.node_for(signer), []).append(strategy)
+        return shards
+
+
+def encode_conditions(conditions: MarketConditions) -> bytes:
+    return (json.dumps({**asdict(conditions), "timestamp": conditions.timestamp.isoformat()}) + "\n").encode()
+
+
+def decode_conditions(line: bytes) -> MarketConditions:
+    data = json.loads(line)
+    return MarketConditions(**{**data, "timestamp": datetime.fromisoformat(data["timestamp"])})
+
+
+class MarketFeed:
+    """
+    Fetches market conditions once per scan, and again whenever streamed
+    ticks raise the volatility level, and writes them, one JSON line each, to
+    every worker connected to the Unix socket. Workers write a report line
+    back after each tick.
+    """
+
+    def __init__(self, path: str, market_data: Optional[MarketDataFetcher] = None, interval: float = SCAN_INTERVAL_SECONDS):
+        self.path = path
+        self.market_data = market_data or MarketDataFetcher()
+        self.interval = interval
+        self.last: Optional[MarketConditions] = None
+        self.reports: dict[str, dict] = {}  # worker -> its latest tick report
+
+        # Counters
+        self.published = 0
+
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._writers)
+
+    async def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        if self._task is None:
+            self._task = asyncio.create_task(self._produce())
+            # A streamed escalation goes out at once instead of waiting for the scan
+            self.market_data.listeners.append(self.publish)
+            await self.market_data.start()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for writer in list(self._writers):
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.market_data.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def publish(self, conditions: MarketConditions):
+        self.last = conditions
+        self.published += 1
+        line = encode_conditions(conditions)
+        for writer in list(self._writers):
+            try:
+                writer.write(line)
+            except Exception:
+                self._writers.discard(writer)
+
+    async def _produce(self):
+        while True:
+            try:
+                self.publish(await self.market_data.get_market_conditions(ARC_TESTNET.rpc_url))
+            except Exception as e:
+                logger.warning("Market feed fetch failed", error=str(e))
+            await asyncio.sleep(self.interval)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._writers.add(writer)
+        # A (re)started worker shouldn't wait a whole scan for its first tick
+        if self.last is not None:
+            writer.write(encode_conditions(self.last))
+        try:
+            async for line in reader:
+                report = json.loads(line)
+                self.reports[report["worker"]] = report
+                for action in report.get("actions", []):
+                    logger.info("Fleet action", worker=report["worker"], **action)
+        except Exception as e:
+            logger.warning("Worker connection failed", error=str(e))
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+def run_worker(worker: str, strategies: list[StrategyConfig], feed_path: str, rate_share: float = 1.0):
+    """Worker process entry point"""
+    asyncio.run(_run_worker(worker, strategies, feed_path, rate_share))
+
+
+async def _run_worker(worker: str, strategies: list[StrategyConfig], feed_path: str, rate_share: float = 1.0):
+    from main import MultiVaultAgent  # main imports this module for supervisor mode
+
+    # Request budgets are per process; this worker gets its part of each
+    get_connections().limiter.set_share(rate_share)
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stopping.set)
+
+    agent = MultiVaultAgent(strategies)
+    await agent.connect()
+    logger.info("Worker started", worker=worker, pid=os.getpid(), strategies=[s.name for s in strategies])
+
+    reader, writer = await asyncio.open_unix_connection(feed_path)
+    latest: list[MarketConditions] = []
+    arrived = asyncio.Event()
+
+    async def receive():
+        # Keep only the newest conditions so a slow tick never works through a backlog
+        async for line in reader:
+            latest[:] = [decode_conditions(line)]
+            arrived.set()
+        logger.warning("Market feed closed", worker=worker)
+        stopping.set()
+
+    async def tick():
+        while True:
+            await arrived.wait()
+            arrived.clear()
+            executions = await agent.run_iteration(latest[0])
+            report = {
+                "worker": worker,
+                "iteration": agent.iteration,
+                "strategies": len(strategies),
+                "actions": [
+                    {"strategy": e["strategy"], "action": e["action"]}
+                    for e in executions if e["action"] != "HOLD"
+                ],
+            }
+            writer.write((json.dumps(report) + "\n").encode())
+
+    tasks = [asyncio.create_task(receive()), asyncio.create_task(tick())]
+    stop = asyncio.create_task(stopping.wait())
+    try:
+        done, _ = await asyncio.wait([*tasks, stop], return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task is not stop and task.exception() is not None:
+                logger.error("Worker failed", worker=worker, error=str(task.exception()))
+    finally:
+        for task in [*tasks, stop]:
+            task.cancel()
+        writer.close()
+        await agent.close()
+        logger.info("Worker stopped", worker=worker)
+
+
+class FleetSupervisor:
+    """
+    Spawns one process per shard of strategies and feeds them all from a
+    single MarketFeed. Signers are placed on a consistent-hash ring, so a
+    worker dying only moves its own strategies: the dead node leaves the
+    ring and just the survivors that picked up its signers are restarted
+    with their new shard. The dead worker is respawned after a backoff
+    (FLEET_RESPAWN_SECONDS, doubling while it keeps dying young) and
+    rejoins the ring, taking its signers back the same way. Each worker
+    runs on 1/workers of every per-host request budget (see RateLimiter),
+    so the fleet together stays within what one process would use.
+    """
+
+    def __init__(self, strategies: list[StrategyConfig], workers: int = FLEET_WORKERS, feed_path: Optional[str] = None):
+        self.strategies = strategies
+        self.feed_path = feed_path or FLEET_SOCKET_PATH or os.path.join(
+            tempfile.gettempdir(), f"velvet-fleet-{os.getpid()}.sock"
+        )
+        self.workers = max(workers, 1)
+        self.ring = HashRing(f"worker-{i}" for i in range(self.workers))
+        self.feed = MarketFeed(self.feed_path)
+        self.processes: dict[str, BaseProcess] = {}
+        self.shards: dict[str, list[str]] = {}  # worker -> strategy names it runs
+        self.respawn_at: dict[str, float] = {}  # dead worker -> monotonic time it rejoins the ring
+
+        # Counters
+        self.deaths = 0
+        self.restarts = 0
+        self.respawns = 0
+
+        self._started_at: dict[str, float] = {}
+        self._backoff: dict[str, float] = {}  # worker -> delay before its next respawn
+
+        self.running = False
+        self._context = multiprocessing.get_context("spawn")
+
+    async def run(self):
+        self.running = True
+        await self.feed.start()
+        logger.info("Fleet starting", workers=len(self.ring.nodes), strategies=len(self.strategies), feed=self.feed_path)
+        try:
+            await self._rebalance()
+            while self.running:
+                await asyncio.sleep(FLEET_MONITOR_SECONDS)
+                await self._check_workers()
+        except asyncio.CancelledError:
+            logger.info("Fleet stopped")
+        finally:
+            await asyncio.gather(*(self._stop_worker(worker) for worker in list(self.processes)))
+            await self.feed.stop()
+            self.running = False
+
+    def stop(self):
+        self.running = False
+
+    def _spawn(self, worker: str, strategies: list[StrategyConfig]):
+        process = self._context.Process(
+            target=run_worker,
+            args=(worker, strategies, self.feed_path, 1 / self.workers),
+            name=f"velvet-{worker}",
+            daemon=True,
+        )
+        process.start()
+        self._started_at[worker] = time.monotonic()
+        self.processes[worker] = process
+        self.shards[worker] = [s.name for s in strategies]
+        logger.info("Worker spawned", worker=worker, pid=process.pid, strategies=self.shards[worker])
+
+    async def _stop_worker(self, worker: str):
+        process = self.processes.pop(worker, None)
+        self.shards.pop(worker, None)
+        if process is None or not process.is_alive():
+            return
+        process.terminate()  # SIGTERM: the worker closes its executors
+        await asyncio.to_thread(process.join, FLEET_STOP_TIMEOUT_SECONDS)
+        if process.is_alive():
+            logger.warning("Worker did not stop, killing", worker=worker, pid=process.pid)
+            process.kill()
+            await asyncio.to_thread(process.join)
+
+    async def _check_workers(self):
+        now = time.monotonic()
+        dead = [worker for worker, process in self.processes.items() if not process.is_alive()]
+        for worker in dead:
+            process = self.processes.pop(worker)
+            self.shards.pop(worker, None)
+            self.ring.remove(worker)
+            self.feed.reports.pop(worker, None)
+            self.deaths += 1
+
+            # Back off while it keeps dying young; a long run starts over
+            if now - self._started_at.get(worker, now) >= FLEET_HEALTHY_SECONDS:
+                self._backoff.pop(worker, None)
+            delay = self._backoff.get(worker, FLEET_RESPAWN_SECONDS)
+            self._backoff[worker] = min(delay * 2, FLEET_MAX_RESPAWN_SECONDS)
+            self.respawn_at[worker] = now + delay
+            logger.error("Worker died", worker=worker, pid=process.pid, exitcode=process.exitcode, respawn_in=delay)
+
+        due = [worker for worker, at in self.respawn_at.items() if at <= now]
+        for worker in due:
+            del self.respawn_at[worker]
+            self.ring.add(worker)
+            self.respawns += 1
+            logger.info("Worker rejoining", worker=worker)
+
+        if (dead or due) and self.running:
+            await self._rebalance()
+
+    async def _rebalance(self):
+        """Bring every worker's process in line with the ring's current assignment"""
+        if not self.ring.nodes:
+            if self.respawn_at:
+                logger.error("No workers alive, waiting to respawn", respawn=sorted(self.respawn_at))
+                return
+            logger.error("No workers left to run strategies")
+            self.running = False
+            return
+
+        shards = self.ring.assign(self.strategies)
+        for worker in sorted(self.ring.nodes):
+            strategies = shards.get(worker, [])
+            names = [s.name for s in strategies]
+            if names == self.shards.get(worker):
+                continue
+            if worker in self.processes:
+                self.restarts += 1
+                logger.info("Rebalancing worker", worker=worker, before=self.shards[worker], after=names)
+                await self._stop_worker(worker)
+            if strategies:
+                self._spawn(worker, strategies)
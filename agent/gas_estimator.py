@@ -0,0 +1,120 @@
+"""
+Velvet Arc Gas Estimator
+Caches eth_estimateGas per (contract, selector, calldata size class) with a safety margin
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+
+from web3 import Web3
+from structlog import get_logger
+
+from config import GAS_ESTIMATE_MARGIN, GAS_ESTIMATE_MAX_AGE_BLOCKS
+from rpc import ChainClient
+
+logger = get_logger()
+
+GasKey = tuple[str, bytes, int]
+
+
+@dataclass
+class GasEstimate:
+    """A cached gas limit and what it was measured against"""
+    gas: int
+    block: Optional[int]
+    code_hash: bytes
+
+
+def size_class(data: bytes) -> int:
+    """Bucket calldata by argument words, doubling per class, so similar calls share an estimate"""
+    words = max(len(data) - 4, 0) // 32
+    return words.bit_length()
+
+
+class GasEstimator:
+    """Gas limits for one chain, estimated once per call shape and reused"""
+
+    def __init__(
+        self,
+        client: ChainClient,
+        margin: float = GAS_ESTIMATE_MARGIN,
+        max_age_blocks: int = GAS_ESTIMATE_MAX_AGE_BLOCKS,
+    ):
+        self.client = client
+        self.margin = margin
+        self.max_age_blocks = max_age_blocks
+        self.cache: dict[GasKey, GasEstimate] = {}
+
+        # Counters
+        self.hits = 0
+        self.estimates = 0
+        self.fallbacks = 0
+
+    @staticmethod
+    def key(tx: dict) -> GasKey:
+        data = Web3.to_bytes(hexstr=tx["data"]) if isinstance(tx["data"], str) else bytes(tx["data"])
+        return (tx["to"].lower(), data[:4], size_class(data))
+
+    async def gas_limit(self, tx: dict, fallback: int) -> int:
+        """Cached limit for this call shape; estimates on miss, never raises"""
+        key = self.key(tx)
+        entry = self.cache.get(key)
+
+        if entry is not None and not self._expired(entry):
+            self.hits += 1
+            return entry.gas
+
+        try:
+            estimate = await self._estimate(tx, key, entry)
+            self.estimates += 1
+            return estimate.gas
+        except Exception as e:
+            # RPC errors and simulated reverts (e.g. a burn whose approve is
+            # still pending) keep the last good estimate
+            self.fallbacks += 1
+            if entry is not None:
+                logger.warning("Gas estimate failed, using stale cache", to=tx["to"], gas=entry.gas, error=str(e))
+                return entry.gas
+            logger.warning("Gas estimate failed, using default limit", to=tx["to"], gas=fallback, error=str(e))
+            return fallback
+
+    def invalidate(self, tx: dict):
+        """Drop the estimate a reverted or out-of-gas transaction was built with"""
+        self.cache.pop(self.key(tx), None)
+
+    def invalidate_contract(self, address: str):
+        address = address.lower()
+        for key in [k for k in self.cache if k[0] == address]:
+            del self.cache[key]
+
+    def _expired(self, entry: GasEstimate) -> bool:
+        latest = self.client.latest_block
+        if latest is None:
+            return False
+        # Estimated before any block was observed: age unknown, refresh once
+        if entry.block is None:
+            return True
+        return latest - entry.block > self.max_age_blocks
+
+    async def _estimate(self, tx: dict, key: GasKey, previous: Optional[GasEstimate]) -> GasEstimate:
+        w3 = self.client.w3
+        call = {k: tx[k] for k in ("from", "to", "data", "value") if k in tx}
+
+        gas, code = await asyncio.gather(
+            w3.eth.estimate_gas(call),
+            w3.eth.get_code(tx["to"]),
+        )
+        code_hash = Web3.keccak(code)
+
+        # A redeployed contract makes every estimate for it suspect
+        if previous is not None and previous.code_hash != code_hash:
+            logger.info("Contract code changed, dropping gas estimates", to=tx["to"])
+            self.invalidate_contract(tx["to"])
+
+        entry = GasEstimate(
+            gas=int(gas * self.margin),
+            block=self.client.latest_block,
+            code_hash=code_hash,
+        )
+        self.cache[key] = entry
+        return entry
@@ -0,0 +1,169 @@
+"""
+Velvet Arc HTTP Cache
+TTL cache with conditional revalidation for the market-data APIs
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+from structlog import get_logger
+
+from config import MARKET_CACHE_POLICIES, MARKET_CACHE_DEFAULT_POLICY, MARKET_CACHE_MAX_ENTRIES
+
+logger = get_logger()
+
+
+@dataclass
+class CacheStats:
+    """What the cache answered and what it sent"""
+    hits: int = 0  # fresh entries served
+    stale_hits: int = 0  # expired entries served while a refresh runs behind them
+    misses: int = 0  # requests that had to wait on the network
+    coalesced: int = 0  # concurrent misses that joined an in-flight request
+    revalidations: int = 0  # 304s: the body we had is still current
+    refreshes: int = 0  # background refreshes started
+    errors: int = 0  # failed requests (answered from a stale entry when there was one)
+    evictions: int = 0
+
+    @property
+    def saved(self) -> int:
+        """Requests never sent"""
+        return self.hits + self.stale_hits + self.coalesced
+
+
+@dataclass
+class _Entry:
+    response: httpx.Response
+    expires_at: float
+    stale_until: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float  # unix time the body was last fetched or revalidated
+
+
+class CachedHTTPClient:
+    """
+    GETs through an httpx client, cached per URL and query. Each endpoint's
+    (ttl, stale) policy comes from the longest matching prefix in
+    MARKET_CACHE_POLICIES. After the TTL an entry is still served for
+    `stale` more seconds while one background request revalidates it with
+    If-None-Match / If-Modified-Since; past that, callers wait, and
+    concurrent callers share the one request. Within the stale window a
+    failed request is answered from the entry too. The least recently used
+    entries are evicted beyond `max_entries`.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        policies: dict[str, tuple[float, float]] = MARKET_CACHE_POLICIES,
+        default_policy: tuple[float, float] = MARKET_CACHE_DEFAULT_POLICY,
+        max_entries: int = MARKET_CACHE_MAX_ENTRIES,
+    ):
+        self.client = client
+        self.policies = sorted(policies.items(), key=lambda item: len(item[0]), reverse=True)
+        self.default_policy = default_policy
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task] = {}
+
+    def policy_for(self, url: str) -> tuple[float, float]:
+        """(ttl, stale) seconds for this URL"""
+        bare = url.split("://", 1)[-1]
+        for prefix, policy in self.policies:
+            if bare.startswith(prefix):
+                return policy
+        return self.default_policy
+
+    def fetched_at(self, url: str, params: Optional[dict] = None) -> Optional[float]:
+        """Unix time the cached response for this URL and query was last fetched or revalidated"""
+        entry = self._entries.get(self._key(url, params))
+        return entry.fetched_at if entry is not None else None
+
+    async def get(self, url: str, params: Optional[dict] = None) -> httpx.Response:
+        key = self._key(url, params)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if now < entry.expires_at:
+                self.stats.hits += 1
+                return entry.response
+            if now < entry.stale_until:
+                self.stats.stale_hits += 1
+                if key not in self._inflight:
+                    self.stats.refreshes += 1
+                    self._start(key, url, params)
+                return entry.response
+
+        if key in self._inflight:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+            self._start(key, url, params)
+        return await asyncio.shield(self._inflight[key])
+
+    async def close(self):
+        for task in list(self._inflight.values()):
+            task.cancel()
+
+    @staticmethod
+    def _key(url: str, params: Optional[dict]) -> tuple:
+        return url, tuple(sorted((params or {}).items()))
+
+    def _start(self, key: tuple, url: str, params: Optional[dict]):
+        task = asyncio.create_task(self._fetch(key, url, params))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._inflight.pop(key, None))
+        # A background refresh may fail with nobody awaiting it
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    def _deadlines(self, url: str) -> tuple[float, float]:
+        ttl, stale = self.policy_for(url)
+        now = time.monotonic()
+        return now + ttl, now + ttl + stale
+
+    async def _fetch(self, key: tuple, url: str, params: Optional[dict]) -> httpx.Response:
+        entry = self._entries.get(key)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            response = await self.client.get(url, params=params, headers=headers)
+            if response.status_code == 304 and entry is not None:
+                self.stats.revalidations += 1
+                entry.expires_at, entry.stale_until = self._deadlines(url)
+                entry.fetched_at = time.time()
+                return entry.response
+            response.raise_for_status()
+        except Exception as e:
+            self.stats.errors += 1
+            if entry is not None and time.monotonic() < entry.stale_until:
+                logger.warning("Market API failed, serving cached response", url=url, error=str(e))
+                return entry.response
+            raise
+
+        expires_at, stale_until = self._deadlines(url)
+        self._entries[key] = _Entry(
+            response=response,
+            expires_at=expires_at,
+            stale_until=stale_until,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fetched_at=time.time(),
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        return response
@@ -0,0 +1,430 @@
+"""
+Velvet Arc Event Indexer
+Follows vault and hook logs with adaptive eth_getLogs ranges into a local SQLite (WAL) index
+"""
+import asyncio
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from eth_abi.decoding import ContextFramesBytesIO
+from eth_abi.registry import registry
+from hexbytes import HexBytes
+from web3 import Web3
+from structlog import get_logger
+
+from config import (
+    INDEXER_DB_PATH, INDEXER_BACKFILL_BLOCKS, INDEXER_CHUNK_BLOCKS, INDEXER_MAX_CHUNK_BLOCKS,
+    INDEXER_TARGET_LOGS, INDEXER_REORG_DEPTH, INDEXER_POLL_SECONDS, INDEXER_BUSY_TIMEOUT_MS,
+)
+from rpc import ChainClient
+
+logger = get_logger()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    chain_id INTEGER NOT NULL,
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    block_hash TEXT NOT NULL,
+    tx_hash TEXT NOT NULL,
+    address TEXT NOT NULL,
+    name TEXT NOT NULL,
+    args TEXT NOT NULL,
+    PRIMARY KEY (chain_id, block_number, log_index)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS events_by_name ON events (name, chain_id, block_number);
+CREATE INDEX IF NOT EXISTS events_by_address ON events (address, block_number);
+
+CREATE TABLE IF NOT EXISTS blocks (
+    chain_id INTEGER NOT NULL,
+    contracts TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (chain_id, contracts, number)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS checkpoints (
+    chain_id INTEGER NOT NULL,
+    contracts TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    block_hash TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (chain_id, contracts)
+);
+"""
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return HexBytes(value).to_0x_hex()
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def _is_dynamic(type_str: str) -> bool:
+    return type_str in ("string", "bytes") or type_str.endswith("]") or type_str.startswith("tuple")
+
+
+class EventDecoder:
+    """topic0 plus prebuilt decoders for one event's indexed topics and data"""
+
+    def __init__(self, abi_item: dict):
+        self.name = abi_item["name"]
+        inputs = abi_item["inputs"]
+        self.signature = f"{self.name}({','.join(p['type'] for p in inputs)})"
+        self.topic = bytes(Web3.keccak(text=self.signature))
+
+        # Indexed dynamic values are only present as their keccak hash
+        self.indexed = [
+            (p["name"], None if _is_dynamic(p["type"]) else registry.get_decoder(p["type"]))
+            for p in inputs if p["indexed"]
+        ]
+        data_params = [p for p in inputs if not p["indexed"]]
+        self.data_names = [p["name"] for p in data_params]
+        self._data_decoder = registry.get_tuple_decoder(*(p["type"] for p in data_params))
+
+    def decode(self, log: dict) -> dict:
+        args = {}
+        for (name, decoder), topic in zip(self.indexed, log["topics"][1:]):
+            topic = bytes(topic)
+            args[name] = _jsonable(decoder(ContextFramesBytesIO(topic))) if decoder else HexBytes(topic).to_0x_hex()
+        values = self._data_decoder(ContextFramesBytesIO(bytes(log["data"])))
+        args.update(zip(self.data_names, (_jsonable(v) for v in values)))
+        return args
+
+
+class EventStore:
+    """
+    Decoded events in SQLite, plus a checkpoint and the last
+    INDEXER_REORG_DEPTH block hashes per (chain, contract set) for reorg
+    rollback, so fleet workers indexing different contracts into one file
+    never prune or roll back each other's hashes.
+    Every chunk lands in one transaction, so a crash never leaves events
+    past the checkpoint. The connection lives on one dedicated thread: every
+    call is awaited from the event loop but runs there, one at a time, so
+    disk I/O never blocks the loop and transactions never interleave.
+    """
+
+    def __init__(self, path: str = INDEXER_DB_PATH):
+        self.path = path
+        self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-store")
+        self.db: sqlite3.Connection = self._thread.submit(self._open).result()
+
+    def _open(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        # Other processes (fleet workers) write the same file; wait for them rather than fail
+        db.execute(f"PRAGMA busy_timeout={INDEXER_BUSY_TIMEOUT_MS}")
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        columns = [row[1] for row in db.execute("PRAGMA table_info(blocks)")]
+        if columns and "contracts" not in columns:
+            # Hashes kept per chain only; they are re-collected as chunks are indexed
+            db.execute("DROP TABLE blocks")
+        db.executescript(SCHEMA)
+        return db
+
+    async def _run(self, fn: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._thread, fn, *args)
+
+    async def close(self):
+        await self._run(self.db.close)
+        self._thread.shutdown()
+
+    async def checkpoint(self, chain_id: int, contracts: str) -> Optional[tuple[int, str]]:
+        return await self._run(self._checkpoint, chain_id, contracts)
+
+    async def recent_blocks(self, chain_id: int, contracts: str, limit: int = INDEXER_REORG_DEPTH) -> list[tuple[int, str]]:
+        """Stored (number, hash) pairs, newest first"""
+        return await self._run(self._recent_blocks, chain_id, contracts, limit)
+
+    async def commit(self, chain_id: int, contracts: str, rows: list[tuple], blocks: dict[int, str], checkpoint: tuple[int, str]):
+        """Store a chunk's events and block hashes and advance the checkpoint, atomically"""
+        await self._run(self._commit, chain_id, contracts, rows, blocks, checkpoint)
+
+    async def rollback(self, chain_id: int, contracts: str, addresses: list[str], checkpoint: tuple[int, str]):
+        """Forget everything these contracts logged after the checkpoint block"""
+        await self._run(self._rollback, chain_id, contracts, addresses, checkpoint)
+
+    async def events(
+        self,
+        name: Optional[str] = None,
+        chain_id: Optional[int] = None,
+        address: Optional[str] = None,
+        from_block: Optional[int] = None,
+        to_block: Optional[int] = None,
+        limit: int = 100,
+    ) -> list[dict]:
+        """Newest-first events matching every given filter, served from the indexes"""
+        return await self._run(self._events, name, chain_id, address, from_block, to_block, limit)
+
+    async def latest(self, name: str, chain_id: Optional[int] = None) -> Optional[dict]:
+        events = await self.events(name=name, chain_id=chain_id, limit=1)
+        return events[0] if events else None
+
+    async def count(self, name: Optional[str] = None, chain_id: Optional[int] = None) -> int:
+        return await self._run(self._count, name, chain_id)
+
+    # -- on the store thread -- #
+
+    def _checkpoint(self, chain_id: int, contracts: str) -> Optional[tuple[int, str]]:
+        row = self.db.execute(
+            "SELECT block_number, block_hash FROM checkpoints WHERE chain_id = ? AND contracts = ?",
+            (chain_id, contracts),
+        ).fetchone()
+        return (row["block_number"], row["block_hash"]) if row else None
+
+    def _recent_blocks(self, chain_id: int, contracts: str, limit: int) -> list[tuple[int, str]]:
+        rows = self.db.execute(
+            "SELECT number, hash FROM blocks WHERE chain_id = ? AND contracts = ? ORDER BY number DESC LIMIT ?",
+            (chain_id, contracts, limit),
+        ).fetchall()
+        return [(row["number"], row["hash"]) for row in rows]
+
+    def _commit(self, chain_id: int, contracts: str, rows: list[tuple], blocks: dict[int, str], checkpoint: tuple[int, str]):
+        number, block_hash = checkpoint
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self.db.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.db.executemany(
+                "INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?)",
+                [(chain_id, contracts, n, h) for n, h in blocks.items()],
+            )
+            self.db.execute(
+                "DELETE FROM blocks WHERE chain_id = ? AND contracts = ? AND number <= ?",
+                (chain_id, contracts, number - INDEXER_REORG_DEPTH),
+            )
+            self._set_checkpoint(chain_id, contracts, number, block_hash)
+
+    def _rollback(self, chain_id: int, contracts: str, addresses: list[str], checkpoint: tuple[int, str]):
+        number, block_hash = checkpoint
+        placeholders = ",".join("?" * len(addresses))
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self.db.execute(
+                f"DELETE FROM events WHERE chain_id = ? AND block_number > ? AND address IN ({placeholders})",
+                (chain_id, number, *addresses),
+            )
+            self.db.execute(
+                "DELETE FROM blocks WHERE chain_id = ? AND contracts = ? AND number > ?",
+                (chain_id, contracts, number),
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?)",
+                (chain_id, contracts, number, block_hash),
+            )
+            self._set_checkpoint(chain_id, contracts, number, block_hash)
+
+    def _set_checkpoint(self, chain_id: int, contracts: str, number: int, block_hash: str):
+        self.db.execute(
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)",
+            (chain_id, contracts, number, block_hash, time.time()),
+        )
+
+    def _events(
+        self,
+        name: Optional[str],
+        chain_id: Optional[int],
+        address: Optional[str],
+        from_block: Optional[int],
+        to_block: Optional[int],
+        limit: int,
+    ) -> list[dict]:
+        clauses, params = [], []
+        for column, op, value in (
+            ("name", "=", name),
+            ("chain_id", "=", chain_id),
+            ("address", "=", Web3.to_checksum_address(address) if address else None),
+            ("block_number", ">=", from_block),
+            ("block_number", "<=", to_block),
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        # Without ANALYZE statistics SQLite prefers the primary key, which
+        # would scan a chain's whole history for a rare event name
+        index = "INDEXED BY events_by_name" if name else "INDEXED BY events_by_address" if address else ""
+        rows = self.db.execute(
+            f"SELECT * FROM events {index} {where} ORDER BY block_number DESC, log_index DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [{**dict(row), "args": json.loads(row["args"])} for row in rows]
+
+    def _count(self, name: Optional[str], chain_id: Optional[int]) -> int:
+        clauses = [c for c, v in (("name = ?", name), ("chain_id = ?", chain_id)) if v is not None]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params = [v for v in (name, chain_id) if v is not None]
+        return self.db.execute(f"SELECT COUNT(*) FROM events {where}", params).fetchone()[0]
+
+
+class EventIndexer:
+    """
+    Brings an EventStore up to the head for a set of contracts on one chain.
+    The eth_getLogs range starts at INDEXER_CHUNK_BLOCKS, halves when the
+    node rejects it or returns more than INDEXER_TARGET_LOGS, and doubles
+    while chunks come back sparse. Each chunk is checkpointed with its last
+    block's hash; when that hash no longer matches the chain, everything
+    after the fork point is rolled back and read again.
+    """
+
+    def __init__(
+        self,
+        client: ChainClient,
+        store: EventStore,
+        contracts: dict[str, list[dict]],
+        backfill: int = INDEXER_BACKFILL_BLOCKS,
+        poll_interval: float = INDEXER_POLL_SECONDS,
+    ):
+        self.client = client
+        self.store = store
+        self.backfill = backfill
+        self.poll_interval = poll_interval
+        self.chain_id = client.chain.chain_id
+        self.addresses = sorted(Web3.to_checksum_address(a) for a in contracts)
+        self.scope = ",".join(a.lower() for a in self.addresses)
+        self.chunk = INDEXER_CHUNK_BLOCKS
+        self.max_chunk = INDEXER_MAX_CHUNK_BLOCKS  # lowered to what the node accepts
+
+        # (contract, topic0) -> decoder, built once
+        self.decoders: dict[tuple[str, bytes], EventDecoder] = {}
+        for address, abi in contracts.items():
+            for item in abi:
+                if item.get("type") == "event":
+                    decoder = EventDecoder(item)
+                    self.decoders[(Web3.to_checksum_address(address), decoder.topic)] = decoder
+
+        # Counters
+        self.indexed = 0
+        self.chunks = 0
+        self.range_errors = 0
+        self.reorgs = 0
+
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._follow())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def sync(self) -> int:
+        """Index up to the current head; returns the number of events stored"""
+        w3 = self.client.w3
+        head = await w3.eth.block_number
+        self.client.observe_block(head)
+
+        start = await self._resume_point(head)
+        stored = 0
+        while start <= head:
+            end = min(start + self.chunk - 1, head)
+            try:
+                logs, last = await asyncio.gather(
+                    w3.eth.get_logs({"address": self.addresses, "fromBlock": start, "toBlock": end}),
+                    w3.eth.get_block(end),
+                )
+            except Exception as e:
+                if self.chunk == 1:
+                    raise
+                # Most nodes cap the range or the result size; either way, ask for less
+                self.range_errors += 1
+                self.chunk = self.max_chunk = max(self.chunk // 2, 1)
+                logger.info("Log range rejected, shrinking", chain=self.client.chain.name, blocks=self.chunk, error=str(e))
+                continue
+
+            rows, blocks = self._decode(logs)
+            blocks[end] = HexBytes(last["hash"]).to_0x_hex()
+            await self.store.commit(self.chain_id, self.scope, rows, blocks, (end, blocks[end]))
+            self.chunks += 1
+            self.indexed += len(rows)
+            stored += len(rows)
+
+            if len(logs) > INDEXER_TARGET_LOGS:
+                self.chunk = max(self.chunk // 2, 1)
+            elif len(logs) < INDEXER_TARGET_LOGS // 4:
+                self.chunk = min(self.chunk * 2, self.max_chunk)
+            start = end + 1
+
+        if stored:
+            logger.info("Events indexed", chain=self.client.chain.name, events=stored, block=head)
+        return stored
+
+    def _decode(self, logs: list) -> tuple[list[tuple], dict[int, str]]:
+        rows, blocks = [], {}
+        for log in logs:
+            if log.get("removed") or not log["topics"]:
+                continue
+            decoder = self.decoders.get((log["address"], bytes(log["topics"][0])))
+            if decoder is None:
+                continue
+            try:
+                args = decoder.decode(log)
+            except Exception as e:
+                logger.warning("Event decode failed", event=decoder.name, error=str(e))
+                continue
+            block_hash = HexBytes(log["blockHash"]).to_0x_hex()
+            blocks[log["blockNumber"]] = block_hash
+            rows.append((
+                self.chain_id,
+                log["blockNumber"],
+                log["logIndex"],
+                block_hash,
+                HexBytes(log["transactionHash"]).to_0x_hex(),
+                log["address"],
+                decoder.name,
+                json.dumps(args),
+            ))
+        return rows, blocks
+
+    async def _resume_point(self, head: int) -> int:
+        checkpoint = await self.store.checkpoint(self.chain_id, self.scope)
+        if checkpoint is None:
+            return max(head - self.backfill, 0)
+
+        number, block_hash = checkpoint
+        if number >= head:
+            return number + 1  # nothing new, or this endpoint is behind us
+        block = await self.client.w3.eth.get_block(number)
+        if HexBytes(block["hash"]).to_0x_hex() == block_hash:
+            return number + 1
+
+        fork = await self._find_fork()
+        self.reorgs += 1
+        logger.warning("Reorg detected, rolling back", chain=self.client.chain.name, checkpoint=number, fork=fork[0])
+        await self.store.rollback(self.chain_id, self.scope, self.addresses, fork)
+        return fork[0] + 1
+
+    async def _find_fork(self) -> tuple[int, str]:
+        """Newest stored block still on the canonical chain"""
+        recent = await self.store.recent_blocks(self.chain_id, self.scope)
+        # Issued together so the provider sends them as one JSON-RPC batch
+        canonical = await asyncio.gather(
+            *(self.client.w3.eth.get_block(number) for number, _ in recent),
+            return_exceptions=True,
+        )
+        for (number, stored), block in zip(recent, canonical):
+            if not isinstance(block, Exception) and HexBytes(block["hash"]).to_0x_hex() == stored:
+                return number, stored
+
+        # Deeper than the hashes we keep: restart from before the oldest one
+        number = max((recent[-1][0] if recent else 0) - 1, 0)
+        logger.error("Reorg deeper than kept block hashes", chain=self.client.chain.name, restart=number)
+        block = await self.client.w3.eth.get_block(number)
+        return number, HexBytes(block["hash"]).to_0x_hex()
+
+    async def _follow(self):
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Event indexing failed", chain=self.client.chain.name, error=str(e))
+            await asyncio.sleep(self.poll_interval)
@@ -0,0 +1,390 @@
+"""
+Velvet Arc Local RPC Stand-in
+Minimal in-process JSON-RPC node, CCTP attestation service and price feed for benchmarks and offline runs
+"""
+import asyncio
+import json
+import random
+from typing import Any, Callable, Optional
+
+from aiohttp import web
+from eth_account import Account
+from web3 import Web3
+
+
+class LocalRPCServer:
+    """
+    Answers the JSON-RPC methods the agent uses from in-memory state.
+    Supports batch arrays, per-request latency, a concurrency cap to model a
+    busy node, random HTTP 503s to model a flaky one and occasional latency
+    spikes (tail_rate/tail_latency) to model a slow tail. WebSocket clients
+    on the same port can eth_subscribe to newHeads and to logs, which
+    emit_log() publishes.
+    """
+
+    def __init__(
+        self,
+        chain_id: int = 84532,
+        latency: float = 0.0,
+        max_concurrency: Optional[int] = None,
+        error_rate: float = 0.0,
+        block_time: Optional[float] = None,
+        port: int = 0,
+        tail_rate: float = 0.0,
+        tail_latency: float = 0.0,
+    ):
+        self.chain_id = chain_id
+        self.latency = latency
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.error_rate = error_rate
+        self.block_time = block_time
+        self.port = port
+
+        self.block_number = 100
+        self.gas_price = 10**9
+        self.nonces: dict[str, int] = {}
+        self.mempool: list[str] = []
+        self.receipts: dict[str, dict] = {}
+        self.reverts: set[str] = set()  # tx hashes mined with status 0
+        self.receipt_logs: dict[str, list[dict]] = {}  # tx hash -> logs its receipt carries
+
+        # Counters for benchmarks
+        self.http_requests = 0
+        self.calls = 0
+
+        # Method overrides: method -> fn(params) -> result
+        self.handlers: dict[str, Callable[[list], Any]] = {}
+
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._runner: Optional[web.AppRunner] = None
+        self._miner: Optional[asyncio.Task] = None
+        self._subscribers: dict[web.WebSocketResponse, tuple[str, list]] = {}  # ws -> (id, params)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/"
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post("/", self._handle)
+        app.router.add_get("/", self._handle_ws)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+        if self.block_time:
+            self._miner = asyncio.create_task(self._mine_forever())
+        return self.url
+
+    async def stop(self):
+        if self._miner:
+            self._miner.cancel()
+        for ws in list(self._subscribers):
+            await ws.close()
+        if self._runner:
+            await self._runner.cleanup()
+
+    def mine(self):
+        """Include every pending transaction in a new block"""
+        self.block_number += 1
+        block_hash = Web3.keccak(text=f"block-{self.block_number}").to_0x_hex()
+        for index, tx_hash in enumerate(self.mempool):
+            self.receipts[tx_hash] = {
+                "transactionHash": tx_hash,
+                "transactionIndex": hex(index),
+                "blockNumber": hex(self.block_number),
+                "blockHash": block_hash,
+                "status": "0x0" if tx_hash in self.reverts else "0x1",
+                "logs": [
+                    {
+                        "address": log["address"],
+                        "topics": log.get("topics", []),
+                        "data": log.get("data", "0x"),
+                        "blockNumber": hex(self.block_number),
+                        "blockHash": block_hash,
+                        "transactionHash": tx_hash,
+                        "transactionIndex": hex(index),
+                        "logIndex": hex(i),
+                        "removed": False,
+                    }
+                    for i, log in enumerate(self.receipt_logs.get(tx_hash, []))
+                ],
+                "gasUsed": hex(21000),
+                "cumulativeGasUsed": hex(21000 * (index + 1)),
+                "effectiveGasPrice": hex(self.gas_price),
+                "from": "0x" + "00" * 20,
+                "to": "0x" + "00" * 20,
+                "contractAddress": None,
+                "logsBloom": "0x" + "00" * 256,
+                "type": "0x2",
+            }
+        self.mempool.clear()
+
+        self._publish("newHeads", self._eth_getBlockByNumber([]))
+
+    def emit_log(self, address: str, topics: Optional[list[str]] = None, data: str = "0x"):
+        """Publish a log from `address` in the current block to logs subscribers"""
+        log = {
+            "address": address.lower(),
+            "topics": topics or [],
+            "data": data,
+            "blockNumber": hex(self.block_number),
+            "logIndex": "0x0",
+            "removed": False,
+        }
+        self._publish("logs", log, address.lower())
+
+    def _publish(self, kind: str, result: dict, address: Optional[str] = None):
+        for ws, (subscription, params) in list(self._subscribers.items()):
+            if params[0] != kind:
+                continue
+            if address is not None and len(params) > 1:
+                wanted = params[1].get("address") or []
+                wanted = [wanted] if isinstance(wanted, str) else wanted
+                if wanted and address not in [a.lower() for a in wanted]:
+                    continue
+            message = {"jsonrpc": "2.0", "method": "eth_subscription", "params": {"subscription": subscription, "result": result}}
+            asyncio.ensure_future(ws.send_str(json.dumps(message)))
+
+    async def _mine_forever(self):
+        while True:
+            await asyncio.sleep(self.block_time)
+            self.mine()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.http_requests += 1
+
+        if self._semaphore:
+            async with self._semaphore:
+                return await self._respond(request)
+        return await self._respond(request)
+
+    async def _respond(self, request: web.Request) -> web.Response:
+        # Read first: a hedged client may hang up during the injected delay
+        body = await request.json()
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.tail_rate and random.random() < self.tail_rate:
+            await asyncio.sleep(self.tail_latency)
+        if self.error_rate and random.random() < self.error_rate:
+            return web.Response(status=503, text="injected failure")
+
+        if isinstance(body, list):
+            return web.json_response([self._call(item) for item in body])
+        return web.json_response(self._call(body))
+
+    async def _handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        try:
+            async for message in ws:
+                item = json.loads(message.data)
+                if item.get("method") == "eth_subscribe":
+                    subscription = hex(random.getrandbits(64))
+                    self._subscribers[ws] = (subscription, item.get("params") or ["newHeads"])
+                    await ws.send_str(json.dumps({"jsonrpc": "2.0", "id": item["id"], "result": subscription}))
+                else:
+                    await ws.send_str(json.dumps(self._call(item)))
+        finally:
+            self._subscribers.pop(ws, None)
+        return ws
+
+    def _call(self, item: dict) -> dict:
+        self.calls += 1
+        method, params = item["method"], item.get("params") or []
+        try:
+            handler = self.handlers.get(method) or getattr(self, "_" + method, None)
+            if handler is None:
+                return {"jsonrpc": "2.0", "id": item["id"], "error": {"code": -32601, "message": f"{method} not found"}}
+            return {"jsonrpc": "2.0", "id": item["id"], "result": handler(params)}
+        except Exception as e:
+            return {"jsonrpc": "2.0", "id": item["id"], "error": {"code": -32000, "message": str(e)}}
+
+    # -- default method handlers -- #
+
+    def _eth_chainId(self, params):
+        return hex(self.chain_id)
+
+    def _eth_blockNumber(self, params):
+        return hex(self.block_number)
+
+    def _eth_gasPrice(self, params):
+        return hex(self.gas_price)
+
+    def _eth_maxPriorityFeePerGas(self, params):
+        return hex(self.gas_price // 10)
+
+    def _eth_getBalance(self, params):
+        return hex(10**18)
+
+    def _eth_getTransactionCount(self, params):
+        return hex(self.nonces.get(params[0].lower(), 0))
+
+    def _eth_estimateGas(self, params):
+        return hex(60000)
+
+    def _eth_call(self, params):
+        return "0x" + "00" * 32
+
+    def _eth_getCode(self, params):
+        return "0x6080"
+
+    def _eth_getLogs(self, params):
+        return []
+
+    def _eth_sendRawTransaction(self, params):
+        raw = params[0]
+        sender = Account.recover_transaction(raw).lower()
+        self.nonces[sender] = self.nonces.get(sender, 0) + 1
+        tx_hash = Web3.keccak(hexstr=raw).to_0x_hex()
+        self.mempool.append(tx_hash)
+        return tx_hash
+
+    def _eth_getTransactionReceipt(self, params):
+        return self.receipts.get(params[0])
+
+    def _eth_getBlockByNumber(self, params):
+        return {
+            "number": hex(self.block_number),
+            "hash": Web3.keccak(text=f"block-{self.block_number}").to_0x_hex(),
+            "parentHash": "0x" + "00" * 32,
+            "timestamp": hex(1_700_000_000 + self.block_number * 2),
+            "baseFeePerGas": hex(self.gas_price),
+            "gasLimit": hex(30_000_000),
+            "gasUsed": hex(15_000_000),
+            "miner": "0x" + "00" * 20,
+            "extraData": "0x",
+            "transactions": [],
+        }
+
+    def _eth_feeHistory(self, params):
+        count = int(params[0], 16) if isinstance(params[0], str) else int(params[0])
+        percentiles = params[2] if len(params) > 2 else []
+        tip = self.gas_price // 10
+        return {
+            "oldestBlock": hex(self.block_number - count + 1),
+            "baseFeePerGas": [hex(self.gas_price)] * (count + 1),
+            "gasUsedRatio": [0.5] * count,
+            "reward": [[hex(int(tip * (1 + p / 100))) for p in percentiles] for _ in range(count)],
+        }
+
+
+class LocalAttestationServer:
+    """
+    Stand-in for the CCTP attestation service. A message hash is unknown
+    (404) until first asked about, then pending for `delay` seconds, then
+    complete with a dummy attestation.
+    """
+
+    def __init__(self, delay: float = 0.0, port: int = 0):
+        self.delay = delay
+        self.port = port
+        self.first_seen: dict[str, float] = {}
+        self.requests = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/attestations/{message_hash}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self.url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        message_hash = request.match_info["message_hash"]
+        now = asyncio.get_running_loop().time()
+        if message_hash not in self.first_seen:
+            self.first_seen[message_hash] = now
+            return web.json_response({"error": "Message hash not found"}, status=404)
+        if now - self.first_seen[message_hash] < self.delay:
+            return web.json_response({"attestation": "PENDING", "status": "pending_confirmations"})
+        return web.json_response({"attestation": "0x" + "ab" * 65, "status": "complete"})
+
+
+class LocalPriceStreamServer:
+    """
+    Stand-in for an exchange ticker WebSocket. Replays `prices` to every
+    connected client, one Binance-style 24hr ticker event per `interval`
+    seconds; push() sends a tick of your own and drop() hangs up on every
+    client to exercise reconnects.
+    """
+
+    def __init__(self, prices: Optional[list[float]] = None, interval: float = 0.1, port: int = 0):
+        self.prices = list(prices or [])
+        self.interval = interval
+        self.port = port
+        self.sent = 0
+        self.connections = 0
+        self._clients: set[web.WebSocketResponse] = set()
+        self._runner: Optional[web.AppRunner] = None
+        self._replay: Optional[asyncio.Task] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/"
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        if self.prices:
+            self._replay = asyncio.create_task(self._replay_prices())
+        return self.url
+
+    async def stop(self):
+        if self._replay:
+            self._replay.cancel()
+        await self.drop()
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def drop(self):
+        for ws in list(self._clients):
+            await ws.close()
+
+    def push(self, price: float, change_24h: float = 0.0):
+        message = json.dumps({"e": "24hrTicker", "s": "ETHUSDT", "c": f"{price:.2f}", "P": f"{change_24h * 100:.3f}"})
+        for ws in list(self._clients):
+            asyncio.ensure_future(ws.send_str(message))
+        self.sent += 1
+
+    async def _replay_prices(self):
+        for price in self.prices:
+            await asyncio.sleep(self.interval)
+            self.push(price)
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        self._clients.add(ws)
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            self._clients.discard(ws)
+        return ws
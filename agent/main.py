@@ -24,10 +24,16 @@ from rich.text import Text
 from structlog import get_logger, configure
 from structlog.dev import ConsoleRenderer
 
-from config import PRIVATE_KEY, ARC_TESTNET, BASE_SEPOLIA, CONTRACTS, SCAN_INTERVAL_SECONDS
+from config import (
+    ARC_TESTNET, BASE_SEPOLIA, SCAN_INTERVAL_SECONDS, STRATEGY_CONCURRENCY, FLEET_WORKERS,
+    StrategyConfig, load_strategies,
+)
 from market_data import MarketDataFetcher, MarketConditions
 from decision_engine import DecisionEngine, Decision, Action, Position, AgentState
 from executor import TransactionExecutor
+from bridge import BridgeStage, BridgeTransfer
+from chain_pool import ChainPool
+from fleet import FleetSupervisor
 
 # Configure logging
 configure(
@@ -44,25 +50,36 @@ console = Console()
 class VelvetAgent:
     """Main Velvet Arc Agent"""
 
-    def __init__(self, private_key: str):
-        self.market_data = MarketDataFetcher()
+    def __init__(
+        self,
+        private_key: str,
+        strategy: Optional[StrategyConfig] = None,
+        pool: Optional[ChainPool] = None,
+        market_data: Optional[MarketDataFetcher] = None,
+    ):
+        self.executor = TransactionExecutor(private_key, strategy, pool)
+        self.market_data = market_data or MarketDataFetcher(
+            fee_oracle=self.executor.arc_fees, pool_client=self.executor.base
+        )
         self.decision_engine = DecisionEngine()
-        self.executor = TransactionExecutor(private_key)
 
         self.running = False
         self.iteration = 0
         self.last_decision: Optional[Decision] = None
         self.last_conditions: Optional[MarketConditions] = None
         self.execution_history: list[dict] = []
+        self.wake = asyncio.Event()  # set when streamed ticks raise the volatility level
 
         # Current position tracking
         self.position = Position.ARC
         self.last_bridge_time: Optional[datetime] = None
+        self.executor.bridges.listeners.append(self._on_bridge_update)
 
     async def get_current_state(self) -> AgentState:
         """Build current agent state from on-chain data"""
-        balances = await self.executor.get_balances()
-        hook_state = await self.executor.get_hook_state()
+        chain_state = await self.executor.get_chain_state()
+        balances = chain_state["balances"]
+        hook_state = chain_state["hook"]
 
         return AgentState(
             position=self.position,
@@ -73,12 +90,13 @@ class VelvetAgent:
             current_fee_bps=hook_state["dynamic_fee"],
         )
 
-    async def run_iteration(self) -> dict:
-        """Run one iteration of the agent loop"""
+    async def run_iteration(self, conditions: Optional[MarketConditions] = None) -> dict:
+        """Run one iteration of the agent loop; `conditions` skips the market fetch"""
         self.iteration += 1
 
         # 1. Fetch market conditions
-        conditions = await self.market_data.get_market_conditions(ARC_TESTNET.rpc_url)
+        if conditions is None:
+            conditions = await self.market_data.get_market_conditions(ARC_TESTNET.rpc_url)
         self.last_conditions = conditions
 
         # 2. Get current state
@@ -89,35 +107,65 @@ class VelvetAgent:
         self.last_decision = decision
         self.decision_engine.record_decision(decision)
 
-        # 4. Execute decision
-        tx_hash = None
-        if decision.action != Action.HOLD:
-            tx_hash = await self.executor.execute(decision)
-
-            # Update position tracking
-            if decision.action == Action.DEPLOY and tx_hash:
-                self.position = Position.BRIDGING_TO_BASE
-                self.last_bridge_time = datetime.utcnow()
-            elif decision.action == Action.WITHDRAW and tx_hash:
-                self.position = Position.BRIDGING_TO_ARC
-                self.last_bridge_time = datetime.utcnow()
-
-        # 5. Record execution
+        # 4. Record execution (tx_hash is filled in once the scheduler sends it)
         execution = {
             "iteration": self.iteration,
             "timestamp": datetime.utcnow().isoformat(),
             "action": decision.action.value,
             "confidence": decision.confidence,
             "reasoning": decision.reasoning,
-            "tx_hash": tx_hash,
+            "tx_hash": None,
             "volatility": conditions.volatility_index,
             "eth_price": conditions.eth_price,
         }
+
+        # 5. Submit decision without waiting on the executor
+        bridging = decision.action in (Action.DEPLOY, Action.WITHDRAW)
+        if bridging and (self.executor.pending_transactions() or self.executor.scheduler.queued(decision.action)):
+            # Position only moves once the earlier transaction is mined; don't bridge twice
+            logger.info("Waiting on pending transactions", action=decision.action.value)
+        elif decision.action != Action.HOLD:
+            submission = self.executor.submit(decision)
+            submission.add_done_callback(lambda f: self._on_submitted(decision, execution, f))
+
         self.execution_history.append(execution)
         self.execution_history = self.execution_history[-50:]  # Keep last 50
 
         return execution
 
+    def _on_submitted(self, decision: Decision, execution: dict, future: asyncio.Future):
+        if future.cancelled() or future.result() is None:
+            return
+        tx_hash = future.result()
+        execution["tx_hash"] = tx_hash
+        console.print(f"[dim]TX: {tx_hash}[/dim]")
+
+        # Position follows the transfer from burn to mint
+        if decision.action in (Action.DEPLOY, Action.WITHDRAW):
+            self.executor.bridges.track(decision.action, tx_hash, decision.parameters.get("amount", 0))
+
+    def _on_level_change(self, conditions: MarketConditions):
+        self.wake.set()
+
+    async def _wait_for_tick(self) -> Optional[MarketConditions]:
+        """Sleep until the next scan; the streamed conditions if a rising level cut it short"""
+        try:
+            await asyncio.wait_for(self.wake.wait(), SCAN_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            return None
+        self.wake.clear()
+        return self.market_data.last_conditions
+
+    def _on_bridge_update(self, transfer: BridgeTransfer):
+        to_base = transfer.action == Action.DEPLOY
+        if transfer.stage in (BridgeStage.ATTESTING, BridgeStage.GATEWAY):
+            # Burn (or Gateway deposit) mined: the capital has left the source chain
+            self.position = Position.BRIDGING_TO_BASE if to_base else Position.BRIDGING_TO_ARC
+            self.last_bridge_time = datetime.utcnow()
+        elif transfer.stage == BridgeStage.CONFIRMING:
+            # Mint mined: usable on the destination while the vault catches up
+            self.position = Position.BASE if to_base else Position.ARC
+
     def create_status_display(self) -> Panel:
         """Create rich status display for terminal"""
         table = Table(show_header=False, box=None, padding=(0, 2))
@@ -140,11 +188,33 @@ class VelvetAgent:
             table.add_row("24h Change", f"{c.eth_24h_change:+.2%}")
             table.add_row("Volatility", Text(f"{c.volatility_index:.2%} [{c.volatility_level}]", style=vol_color))
             table.add_row("Sentiment", c.market_sentiment.upper())
+            watched = [v for asset, v in self.market_data.asset_conditions().items() if asset != "ethereum"]
+            if watched:
+                table.add_row("Watching", ", ".join(f"{v.asset} {v.volatility_index:.0%} [{v.volatility_level}]" for v in watched))
             table.add_row("", "")
 
         # Position
         table.add_row("Position", self.position.value)
         table.add_row("Iteration", str(self.iteration))
+        table.add_row("Pending TXs", str(len(self.executor.pending_transactions())))
+        bridges = self.executor.bridges.in_flight()
+        if bridges:
+            table.add_row("Bridging", ", ".join(f"{t.action.value} {t.stage.value}" for t in bridges))
+        lanes = self.executor.scheduler.stats
+        waits = [f"{action} {w['p50']}/{w['p95']}ms" for action, w in lanes.summary().items() if w["count"]]
+        if waits:
+            table.add_row("Submit Wait", "p50/p95 " + ", ".join(waits))
+        if lanes.replaced or lanes.superseded or lanes.preempted or lanes.escalated:
+            table.add_row(
+                "Replacements",
+                f"{lanes.replaced} replaced · {lanes.superseded} superseded · "
+                f"{lanes.preempted} preempted · {lanes.escalated} escalated",
+            )
+        caches = self.executor.view_cache_stats()
+        hits = sum(stats["hits"] for stats in caches.values())
+        if hits + sum(stats["misses"] for stats in caches.values()):
+            rates = " · ".join(f"{chain} {stats['hit_rate']:.0%}" for chain, stats in caches.items())
+            table.add_row("View Cache", f"{rates} hits ({hits} calls skipped)")
 
         # Last decision
         if self.last_decision:
@@ -159,8 +229,8 @@ class VelvetAgent:
 
         # Contracts
         table.add_row("", "")
-        table.add_row("Vault (Arc)", CONTRACTS.vault_address[:20] + "...")
-        table.add_row("Hook (Base)", CONTRACTS.hook_address[:20] + "...")
+        table.add_row("Vault (Arc)", self.executor.strategy.vault_address[:20] + "...")
+        table.add_row("Hook (Base)", self.executor.strategy.hook_address[:20] + "...")
 
         return Panel(
             table,
@@ -172,6 +242,9 @@ class VelvetAgent:
     async def run(self):
         """Main agent loop"""
         self.running = True
+        await self.executor.connect()
+        self.market_data.listeners.append(self._on_level_change)
+        await self.market_data.start()
 
         console.print("\n[bold cyan]╔═══════════════════════════════════════════════════════════╗[/bold cyan]")
         console.print("[bold cyan]║              VELVET ARC AI AGENT                          ║[/bold cyan]")
@@ -179,15 +252,16 @@ class VelvetAgent:
         console.print("[bold cyan]╚═══════════════════════════════════════════════════════════╝[/bold cyan]\n")
 
         console.print(f"[green]Agent Address:[/green] {self.executor.account.address}")
-        console.print(f"[green]Vault (Arc):[/green] {CONTRACTS.vault_address}")
-        console.print(f"[green]Hook (Base):[/green] {CONTRACTS.hook_address}")
+        console.print(f"[green]Vault (Arc):[/green] {self.executor.strategy.vault_address}")
+        console.print(f"[green]Hook (Base):[/green] {self.executor.strategy.hook_address}")
         console.print(f"[dim]Scanning every {SCAN_INTERVAL_SECONDS} seconds...[/dim]\n")
 
         try:
             with Live(self.create_status_display(), refresh_per_second=1, console=console) as live:
+                conditions = None
                 while self.running:
                     try:
-                        execution = await self.run_iteration()
+                        execution = await self.run_iteration(conditions)
 
                         # Log significant actions
                         if execution["action"] != "HOLD":
@@ -195,20 +269,168 @@ class VelvetAgent:
                                 f"[bold yellow]ACTION:[/bold yellow] {execution['action']} "
                                 f"(confidence: {execution['confidence']:.0%})"
                             )
-                            if execution["tx_hash"]:
-                                console.print(f"[dim]TX: {execution['tx_hash']}[/dim]")
 
                         live.update(self.create_status_display())
 
                     except Exception as e:
                         logger.error("Iteration failed", error=str(e))
 
-                    await asyncio.sleep(SCAN_INTERVAL_SECONDS)
+                    conditions = await self._wait_for_tick()
 
         except asyncio.CancelledError:
             logger.info("Agent stopped")
         finally:
             await self.market_data.close()
+            await self.executor.close()
+            self.running = False
+
+    def stop(self):
+        """Stop the agent"""
+        self.running = False
+
+
+class MultiVaultAgent:
+    """
+    Runs many vault/hook strategies from one process. Each tick fetches
+    market conditions once, then runs every strategy's state read and
+    decision with bounded concurrency. Strategies share one ChainPool, so
+    their Multicall snapshots land in the same coalescing window and cost
+    one batched POST per chain instead of a round trip per strategy.
+    """
+
+    def __init__(self, strategies: list[StrategyConfig], concurrency: int = STRATEGY_CONCURRENCY):
+        self.pool = ChainPool()
+        self.market_data = MarketDataFetcher(fee_oracle=self.pool.arc_fees, pool_client=self.pool.base)
+        self.agents = [
+            VelvetAgent(strategy.private_key, strategy, self.pool, self.market_data)
+            for strategy in strategies
+        ]
+        self.concurrency = concurrency
+
+        self.running = False
+        self.iteration = 0
+        self.last_conditions: Optional[MarketConditions] = None
+        self.wake = asyncio.Event()  # set when streamed ticks raise the volatility level
+        self.market_data.listeners.append(self._on_level_change)
+
+    async def connect(self):
+        """Open the shared pool, then warm up each strategy's signer state and ladders"""
+        await self.pool.connect()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def connect(agent: VelvetAgent):
+            async with semaphore:
+                await agent.executor.connect()
+
+        await asyncio.gather(*(connect(agent) for agent in self.agents))
+
+    def _on_level_change(self, conditions: MarketConditions):
+        self.wake.set()
+
+    async def _wait_for_tick(self) -> Optional[MarketConditions]:
+        """Sleep until the next scan; the streamed conditions if a rising level cut it short"""
+        try:
+            await asyncio.wait_for(self.wake.wait(), SCAN_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            return None
+        self.wake.clear()
+        return self.market_data.last_conditions
+
+    async def close(self):
+        await self.market_data.close()
+        await asyncio.gather(*(agent.executor.close() for agent in self.agents))
+        await self.pool.close()
+
+    async def run_iteration(self, conditions: Optional[MarketConditions] = None) -> list[dict]:
+        """One market fetch (unless `conditions` are given), then every strategy decides on it"""
+        self.iteration += 1
+        if conditions is None:
+            conditions = await self.market_data.get_market_conditions(ARC_TESTNET.rpc_url)
+        self.last_conditions = conditions
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(agent: VelvetAgent) -> dict:
+            async with semaphore:
+                return await agent.run_iteration(conditions)
+
+        results = await asyncio.gather(*(run(agent) for agent in self.agents), return_exceptions=True)
+        executions = []
+        for agent, result in zip(self.agents, results):
+            if isinstance(result, Exception):
+                logger.error("Strategy iteration failed", strategy=agent.executor.strategy.name, error=str(result))
+            else:
+                executions.append({"strategy": agent.executor.strategy.name, **result})
+        return executions
+
+    def create_status_display(self) -> Panel:
+        """One row per strategy under the shared market conditions"""
+        table = Table(box=None, padding=(0, 2))
+        table.add_column("Strategy", style="bold")
+        table.add_column("Position")
+        table.add_column("Last Action")
+        table.add_column("Pending TXs")
+        table.add_column("Bridging", style="dim")
+
+        for agent in self.agents:
+            d = agent.last_decision
+            table.add_row(
+                agent.executor.strategy.name,
+                agent.position.value,
+                f"{d.action.value} ({d.confidence:.0%})" if d else "-",
+                str(len(agent.executor.pending_transactions())),
+                ", ".join(f"{t.action.value} {t.stage.value}" for t in agent.executor.bridges.in_flight()),
+            )
+
+        subtitle = f"Scan every {SCAN_INTERVAL_SECONDS}s · iteration {self.iteration}"
+        if self.last_conditions:
+            c = self.last_conditions
+            subtitle = f"ETH ${c.eth_price:,.2f} · vol {c.volatility_index:.2%} [{c.volatility_level}] · " + subtitle
+
+        return Panel(
+            table,
+            title=f"[bold cyan]VELVET ARC[/bold cyan] · {len(self.agents)} strategies",
+            subtitle=f"[dim]{subtitle}[/dim]",
+            border_style="cyan",
+        )
+
+    async def run(self):
+        """Main loop across all strategies"""
+        self.running = True
+        await self.connect()
+        await self.market_data.start()
+
+        console.print(f"\n[bold cyan]VELVET ARC[/bold cyan] running {len(self.agents)} strategies")
+        for agent in self.agents:
+            strategy = agent.executor.strategy
+            console.print(
+                f"[green]{strategy.name}:[/green] vault {strategy.vault_address} "
+                f"hook {strategy.hook_address} signer {agent.executor.account.address}"
+            )
+        console.print(f"[dim]Scanning every {SCAN_INTERVAL_SECONDS} seconds...[/dim]\n")
+
+        try:
+            with Live(self.create_status_display(), refresh_per_second=1, console=console) as live:
+                conditions = None
+                while self.running:
+                    try:
+                        for execution in await self.run_iteration(conditions):
+                            if execution["action"] != "HOLD":
+                                console.print(
+                                    f"[bold yellow]ACTION:[/bold yellow] {execution['strategy']} "
+                                    f"{execution['action']} (confidence: {execution['confidence']:.0%})"
+                                )
+                        live.update(self.create_status_display())
+
+                    except Exception as e:
+                        logger.error("Iteration failed", error=str(e))
+
+                    conditions = await self._wait_for_tick()
+
+        except asyncio.CancelledError:
+            logger.info("Agent stopped")
+        finally:
+            await self.close()
             self.running = False
 
     def stop(self):
@@ -218,12 +440,20 @@ class VelvetAgent:
 
 async def main():
     """Entry point"""
-    if not PRIVATE_KEY:
-        console.print("[red]ERROR: PRIVATE_KEY not set in environment[/red]")
+    strategies = load_strategies()
+    missing = [strategy.name for strategy in strategies if not strategy.private_key]
+    if missing:
+        console.print(f"[red]ERROR: no private key set for {', '.join(missing)}[/red]")
         console.print("Create a .env file with: PRIVATE_KEY=0x...")
         sys.exit(1)
 
-    agent = VelvetAgent(PRIVATE_KEY)
+    if FLEET_WORKERS > 0:
+        # Signing is pure Python; shard strategies across processes to use every core
+        agent = FleetSupervisor(strategies, FLEET_WORKERS)
+    elif len(strategies) > 1:
+        agent = MultiVaultAgent(strategies)
+    else:
+        agent = VelvetAgent(strategies[0].private_key, strategies[0])
 
     # Handle shutdown signals
     def signal_handler(sig, frame):
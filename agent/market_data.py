@@ -3,15 +3,33 @@ Market Data Fetcher for Velvet Arc Agent
 Fetches volatility, prices, and market conditions
 """
 import asyncio
-import httpx
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 import numpy as np
 from structlog import get_logger
 
+from assets import AssetMatrix, AssetSnapshot
+from config import (
+    PRICE_HISTORY_PATH, PRICE_HISTORY_MAX_AGE_SECONDS, PRICE_HISTORY_MAX_GAP_SECONDS, PRICE_STREAM_URL, MARKET_ASSETS,
+)
+from connections import ConnectionManager, get_connections
+from fee_oracle import FeeOracle
+from http_cache import CachedHTTPClient
+from price_sources import (
+    COINGECKO_PRICE_URL, HttpPriceSource, PriceAggregator, coingecko_params, default_sources
+)
+from price_store import PriceHistoryFile
+from price_stream import PriceStream, PriceTick
+from rpc import ChainClient
+from volatility import RollingVolatility
+
 logger = get_logger()
 
+FEAR_GREED_URL = "https://api.alternative.me/fng/"
+VOLATILITY_LEVELS = ["LOW", "MEDIUM", "HIGH", "EXTREME"]  # MarketConditions.volatility_level, calmest first
+
 @dataclass
 class MarketConditions:
     """Current market state"""
@@ -21,6 +39,7 @@ class MarketConditions:
     volatility_index: float  # 0-1 scale
     gas_price_gwei: float
     market_sentiment: str  # "fear", "neutral", "greed"
+    asset: str = "ethereum"  # per-asset views carry that asset's price and change in the eth_* fields
 
     @property
     def volatility_level(self) -> str:
@@ -49,35 +68,124 @@ class MarketConditions:
 class MarketDataFetcher:
     """Fetches real-time market data from multiple sources"""
 
-    def __init__(self):
-        self.client = httpx.AsyncClient(timeout=10.0)
-        self.price_history: list[float] = []
+    def __init__(
+        self,
+        fee_oracle: Optional[FeeOracle] = None,
+        history_path: Optional[str] = PRICE_HISTORY_PATH,
+        pool_client: Optional[ChainClient] = None,
+        stream_url: Optional[str] = PRICE_STREAM_URL,
+        connections: Optional[ConnectionManager] = None,
+        assets: Optional[list[str]] = None,
+    ):
+        self.connections = (connections or get_connections()).acquire()
+        self.client = self.connections.http
+        self.fee_oracle = fee_oracle  # Shared with the executor when available
+
+        # Every API request goes through the cache; see MARKET_CACHE_POLICIES
+        self.http = CachedHTTPClient(self.client)
+
+        # ETH first; every asset is priced by the CoinGecko request the ETH source already makes
+        self.asset_ids = list(dict.fromkeys(["ethereum", *(MARKET_ASSETS if assets is None else assets)]))
+        self.assets = AssetMatrix(self.asset_ids)
+
+        # Public APIs plus, given a Base client, the hook's pool
+        self.prices = PriceAggregator(default_sources(self.http, pool_client, self.asset_ids))
+        self.volatility = RollingVolatility()
         self.last_conditions: Optional[MarketConditions] = None
 
+        # Opened on the first fetch, so fetchers that never fetch (fleet
+        # workers fed over IPC) don't contend for the file
+        self.history_path = history_path
+        self.history: Optional[PriceHistoryFile] = None
+        self._history_loaded = False
+        self._sampled_at: Optional[float] = None  # unix time of the newest sample in the estimator
+
+        # Ticks between scans re-score volatility; see start()
+        self.stream = PriceStream(stream_url) if stream_url else None
+        if self.stream is not None:
+            self.stream.listeners.append(self._on_tick)
+        self.level_changes = 0
+        self._alert_level: Optional[str] = None  # highest level reported since the last scan
+
+        # Called with the new conditions when a tick raises the volatility level
+        self.listeners: list[Callable[[MarketConditions], None]] = []
+
+    async def start(self):
+        """Open connections to every market API, and start streaming ticks when a stream URL is configured"""
+        if self.stream is not None:
+            await self.stream.start()
+        await self.connections.warm(http_urls=[
+            *(source.url for source in self.prices.sources if isinstance(source, HttpPriceSource)),
+            FEAR_GREED_URL,
+        ])
+
     async def close(self):
-        await self.client.aclose()
+        if self.stream is not None:
+            await self.stream.stop()
+        await self.http.close()
+        await self.connections.release()
+        if self.history is not None:
+            self.history.close()
+            self.history = None
 
-    async def fetch_eth_price(self) -> tuple[float, float]:
-        """Fetch ETH price and 24h change from CoinGecko"""
+    def load_history(self):
+        """Map the persisted samples and replay the newest window into the estimator"""
+        self._history_loaded = True
+        if not self.history_path:
+            return
         try:
-            response = await self.client.get(
-                "https://api.coingecko.com/api/v3/simple/price",
-                params={
-                    "ids": "ethereum",
-                    "vs_currencies": "usd",
-                    "include_24hr_change": "true"
-                }
-            )
-            data = response.json()
-            price = data["ethereum"]["usd"]
-            change = data["ethereum"].get("usd_24h_change", 0) / 100
-            return price, change
+            self.history = PriceHistoryFile(self.history_path)
+        except Exception as e:
+            logger.warning("Price history unavailable", path=self.history_path, error=str(e))
+            return
+        # Samples from before a long downtime would chain a return across it
+        cutoff = time.time() - PRICE_HISTORY_MAX_AGE_SECONDS
+        for timestamp, price in self.history.tail(self.volatility.window + 1):
+            if timestamp >= cutoff:
+                self._add_sample(float(price), float(timestamp))
+        logger.info("Price history loaded", samples=len(self.volatility), stored=len(self.history))
+
+    def _add_sample(self, price: float, timestamp: float) -> float:
+        """Feed the estimator one price, starting a fresh chain after a pause in sampling"""
+        if self._sampled_at is not None and timestamp - self._sampled_at > PRICE_HISTORY_MAX_GAP_SECONDS:
+            self.volatility.break_chain()
+        self._sampled_at = timestamp
+        return self.volatility.update(price)
+
+    async def fetch_eth_price(self) -> tuple[float, float, float]:
+        """ETH price, 24h change and when the newest quote behind them was fetched, across every price source"""
+        try:
+            aggregate = await self.prices.fetch()
         except Exception as e:
             logger.warning("Failed to fetch ETH price", error=str(e))
-            return 0.0, 0.0
+            return 0.0, 0.0, 0.0
+        if aggregate is None:
+            return 0.0, 0.0, 0.0
+        return aggregate.price, aggregate.change_24h, aggregate.fetched_at
+
+    async def fetch_asset_prices(self) -> tuple[np.ndarray, np.ndarray]:
+        """USD prices and 24h changes for every watched asset from one request; NaN where missing"""
+        prices = np.full(len(self.asset_ids), np.nan)
+        changes = np.full(len(self.asset_ids), np.nan)
+        try:
+            response = await self.http.get(COINGECKO_PRICE_URL, params=coingecko_params(self.asset_ids))
+            data = response.json()
+        except Exception as e:
+            logger.warning("Failed to fetch asset prices", error=str(e))
+            return prices, changes
+        for i, asset in enumerate(self.asset_ids):
+            quote = data.get(asset) or {}
+            if quote.get("usd") is not None:
+                prices[i] = quote["usd"]
+            if quote.get("usd_24h_change") is not None:
+                changes[i] = quote["usd_24h_change"] / 100
+        return prices, changes
 
     async def fetch_gas_price(self, rpc_url: str) -> float:
-        """Fetch current gas price from RPC"""
+        """Fetch current gas price, from the fee oracle's cache when available"""
+        if self.fee_oracle is not None and self.fee_oracle.gas_price_gwei is not None:
+            return self.fee_oracle.gas_price_gwei
+
         try:
             response = await self.client.post(
                 rpc_url,
@@ -98,9 +206,7 @@ class MarketDataFetcher:
     async def fetch_fear_greed_index(self) -> tuple[int, str]:
         """Fetch crypto fear & greed index"""
         try:
-            response = await self.client.get(
-                "https://api.alternative.me/fng/"
-            )
+            response = await self.http.get(FEAR_GREED_URL)
             data = response.json()
             value = int(data["data"][0]["value"])
             classification = data["data"][0]["value_classification"]
@@ -109,8 +215,13 @@ class MarketDataFetcher:
             logger.warning("Failed to fetch fear/greed", error=str(e))
             return 50, "neutral"
 
+    @property
+    def price_history(self) -> list[float]:
+        """Prices in the volatility window, oldest first"""
+        return self.volatility.prices().tolist()
+
     def calculate_volatility(self, prices: list[float]) -> float:
-        """Calculate volatility from price history using standard deviation of returns"""
+        """Calculate volatility of a whole price series using standard deviation of returns"""
         if len(prices) < 2:
             return 0.05  # Default medium volatility
 
@@ -123,6 +234,47 @@ class MarketDataFetcher:
         # Normalize to 0-1 scale (cap at 1.0)
         return min(volatility / 2.0, 1.0)
 
+    @staticmethod
+    def adjust_for_daily_move(volatility: float, change_24h: float) -> float:
+        """Raise the volatility index to match a large 24h move"""
+        if abs(change_24h) > 0.1:  # >10% daily move
+            return max(volatility, 0.15)
+        if abs(change_24h) > 0.05:  # >5% daily move
+            return max(volatility, 0.08)
+        return volatility
+
+    def _on_tick(self, tick: PriceTick):
+        """Re-score volatility with the tick standing in for the next sample"""
+        previous = self.last_conditions
+        if previous is None:
+            return  # gas and sentiment come from the first scan
+        change = previous.eth_24h_change if tick.change_24h is None else tick.change_24h
+        conditions = replace(
+            previous,
+            timestamp=datetime.utcnow(),
+            eth_price=tick.price,
+            eth_24h_change=change,
+            volatility_index=self.adjust_for_daily_move(self.volatility.peek(tick.price), change),
+        )
+        self.last_conditions = conditions
+        # Only escalations wake anyone: calming down can wait for the scan,
+        # and a price hovering on a threshold would otherwise wake every tick
+        level = conditions.volatility_level
+        if VOLATILITY_LEVELS.index(level) <= VOLATILITY_LEVELS.index(self._alert_level or level):
+            return
+
+        self.level_changes += 1
+        logger.warning(
+            "Volatility level rose",
+            before=self._alert_level,
+            after=conditions.volatility_level,
+            eth_price=f"${tick.price:,.2f}",
+            volatility=f"{conditions.volatility_index:.2%}",
+        )
+        self._alert_level = level
+        for listener in self.listeners:
+            listener(conditions)
+
     async def get_market_conditions(self, rpc_url: str) -> MarketConditions:
         """Fetch all market data and return conditions"""
 
@@ -130,25 +282,26 @@ class MarketDataFetcher:
         eth_task = self.fetch_eth_price()
         gas_task = self.fetch_gas_price(rpc_url)
         fng_task = self.fetch_fear_greed_index()
+        assets_task = self.fetch_asset_prices()
 
-        (eth_price, eth_change), gas_price, (fng_value, fng_class) = await asyncio.gather(
-            eth_task, gas_task, fng_task
+        (eth_price, eth_change, eth_fetched_at), gas_price, (fng_value, fng_class), (asset_prices, asset_changes) = await asyncio.gather(
+            eth_task, gas_task, fng_task, assets_task
         )
+        self.assets.update(asset_prices, asset_changes)
 
-        # Update price history for volatility calculation
-        if eth_price > 0:
-            self.price_history.append(eth_price)
-            # Keep last 24 hours of hourly data
-            self.price_history = self.price_history[-24:]
-
-        # Calculate volatility
-        volatility = self.calculate_volatility(self.price_history)
+        # Update the rolling window (a failed fetch's 0.0 is skipped, and so is
+        # a quote no newer than the last sample: the cache answered, not the market)
+        if not self._history_loaded:
+            self.load_history()
+        if eth_price > 0 and (self._sampled_at is None or eth_fetched_at > self._sampled_at):
+            volatility = self._add_sample(eth_price, eth_fetched_at)
+            if self.history is not None:
+                self.history.append(eth_price, eth_fetched_at)
+        else:
+            volatility = self.volatility.volatility
 
         # Adjust volatility based on 24h change magnitude
-        if abs(eth_change) > 0.1:  # >10% daily move
-            volatility = max(volatility, 0.15)
-        elif abs(eth_change) > 0.05:  # >5% daily move
-            volatility = max(volatility, 0.08)
+        volatility = self.adjust_for_daily_move(volatility, eth_change)
 
         # Determine sentiment
         if fng_value < 25:
@@ -168,6 +321,7 @@ class MarketDataFetcher:
         )
 
         self.last_conditions = conditions
+        self._alert_level = conditions.volatility_level
 
         logger.info(
             "Market conditions fetched",
@@ -180,6 +334,33 @@ class MarketDataFetcher:
         return conditions
 
 
+    def asset_snapshot(self) -> Optional[AssetSnapshot]:
+        """Volatility and correlation across every watched asset"""
+        return self.assets.snapshot()
+
+    def asset_conditions(self) -> dict[str, MarketConditions]:
+        """A MarketConditions per watched asset, sharing the last scan's gas and sentiment"""
+        snapshot = self.asset_snapshot()
+        if snapshot is None or self.last_conditions is None:
+            return {}
+        base = self.last_conditions
+        views = {}
+        for i, asset in enumerate(snapshot.assets):
+            if asset == "ethereum":
+                views[asset] = base  # the aggregated price beats CoinGecko's alone
+                continue
+            if np.isnan(snapshot.prices[i]):
+                continue
+            change = 0.0 if np.isnan(snapshot.changes_24h[i]) else float(snapshot.changes_24h[i])
+            views[asset] = replace(
+                base,
+                asset=asset,
+                eth_price=float(snapshot.prices[i]),
+                eth_24h_change=change,
+                volatility_index=self.adjust_for_daily_move(float(snapshot.volatility[i]), change),
+            )
+        return views
+
 # Singleton instance
 _fetcher: Optional[MarketDataFetcher] = None
 
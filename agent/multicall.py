@@ -0,0 +1,148 @@
+"""
+Velvet Arc Multicall
+Batches view calls into one Multicall3 eth_call per chain, pinned to a single block and read through the view cache
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from eth_abi import decode, encode
+from web3 import Web3
+from structlog import get_logger
+
+from rpc import ChainClient
+from view_cache import ViewCache
+
+logger = get_logger()
+
+AGGREGATE3_SELECTOR = Web3.keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+GET_BLOCK_NUMBER_SELECTOR = Web3.keccak(text="getBlockNumber()")[:4]
+
+
+@dataclass
+class ViewCall:
+    """A single read to be batched into a multicall"""
+    key: str
+    target: str
+    data: bytes
+    output_types: list[str]
+    default: Any = None
+
+    def decode(self, raw: bytes) -> Any:
+        values = decode(self.output_types, raw)
+        return values[0] if len(values) == 1 else values
+
+
+@dataclass
+class ChainSnapshot:
+    """View results for one chain, all read at the same block"""
+    chain: str
+    block_number: int
+    values: dict[str, Any] = field(default_factory=dict)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.values[key]
+
+
+def view_call(key: str, contract, fn_name: str, *args, default: Any = None) -> ViewCall:
+    """Build a ViewCall from a web3 contract and function name"""
+    abi = next(
+        item for item in contract.abi
+        if item.get("type") == "function" and item["name"] == fn_name
+    )
+    return ViewCall(
+        key=key,
+        target=contract.address,
+        data=Web3.to_bytes(hexstr=contract.encode_abi(fn_name, args=list(args))),
+        output_types=[o["type"] for o in abi["outputs"]],
+        default=default,
+    )
+
+
+class Multicall:
+    """Executes ViewCalls through Multicall3 on one chain, reading through an optional ViewCache"""
+
+    def __init__(self, client: ChainClient, cache: Optional[ViewCache] = None):
+        self.client = client
+        self.cache = cache
+        self.address = Web3.to_checksum_address(client.chain.multicall3)
+
+    def encode(self, calls: list[ViewCall]) -> bytes:
+        # The block number rides along as the first sub-call so every value is
+        # tagged with the block it was read at
+        entries = [(self.address, False, GET_BLOCK_NUMBER_SELECTOR)]
+        entries += [(Web3.to_checksum_address(c.target), True, c.data) for c in calls]
+        return AGGREGATE3_SELECTOR + encode(["(address,bool,bytes)[]"], [entries])
+
+    async def snapshot(self, calls: list[ViewCall]) -> ChainSnapshot:
+        """Read all calls in one round trip, skipping any the cache still holds"""
+        if self.cache is None:
+            block_number, results = await self._fetch(calls)
+            return self._snapshot(block_number, dict(zip((c.key for c in calls), results)), calls)
+
+        cache = self.cache
+        block_number = cache.head
+        raw = {}
+        for call in calls:
+            hit = cache.get(call.target, call.data, block_number)
+            if hit is not None:
+                raw[call.key] = (True, hit)
+
+        misses = [c for c in calls if c.key not in raw]
+        if not misses:
+            cache.stats.reads_saved += 1
+            return self._snapshot(block_number or self.client.latest_block, raw, calls)
+
+        block_number, results = await self._fetch(misses)
+        if not all(cache.holds(c.target, c.data, block_number) for c in calls if c.key in raw):
+            # The head moved past the cached values; read everything at one block
+            misses = calls
+            block_number, results = await self._fetch(calls)
+
+        for call, (success, data) in zip(misses, results):
+            raw[call.key] = (success, data)
+            if success and data:
+                cache.store(call.target, call.data, block_number, data)
+
+        return self._snapshot(block_number, raw, calls)
+
+    async def _fetch(self, calls: list[ViewCall]) -> tuple[int, list[tuple[bool, bytes]]]:
+        """Block number and (success, return data) per call; falls back to per-call reads at one block"""
+        try:
+            raw = await self.client.w3.eth.call({"to": self.address, "data": self.encode(calls)})
+            (results,) = decode(["(bool,bytes)[]"], raw)
+        except Exception as e:
+            logger.warning("Multicall failed, reading individually", chain=self.client.chain.name, error=str(e))
+            return await self._fetch_individually(calls)
+
+        block_number = decode(["uint256"], results[0][1])[0]
+        self.client.observe_block(block_number)
+        return block_number, list(results[1:])
+
+    async def _fetch_individually(self, calls: list[ViewCall]) -> tuple[int, list[tuple[bool, bytes]]]:
+        w3 = self.client.w3
+        block_number = await w3.eth.block_number
+        self.client.observe_block(block_number)
+
+        results = await asyncio.gather(
+            *(w3.eth.call({"to": c.target, "data": c.data}, block_identifier=block_number) for c in calls),
+            return_exceptions=True,
+        )
+        return block_number, [
+            (False, b"") if isinstance(result, Exception) else (True, bytes(result))
+            for result in results
+        ]
+
+    def _snapshot(self, block_number: int, raw: dict[str, tuple[bool, bytes]], calls: list[ViewCall]) -> ChainSnapshot:
+        values = {call.key: self._decode_or_default(call, *raw[call.key]) for call in calls}
+        return ChainSnapshot(chain=self.client.chain.name, block_number=block_number, values=values)
+
+    def _decode_or_default(self, call: ViewCall, success: bool, data: bytes) -> Any:
+        if not success or not data:
+            logger.warning("View call failed", chain=self.client.chain.name, call=call.key)
+            return call.default
+        try:
+            return call.decode(data)
+        except Exception as e:
+            logger.warning("View call decode failed", call=call.key, error=str(e))
+            return call.default
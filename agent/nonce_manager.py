@@ -0,0 +1,104 @@
+"""
+Velvet Arc Nonce Manager
+Tracks pending nonces locally so transactions can be signed and broadcast back-to-back
+"""
+import asyncio
+from typing import Callable, Optional
+
+from structlog import get_logger
+
+from rpc import ChainClient
+
+logger = get_logger()
+
+# Node error messages that mean our local nonce view is wrong
+NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "already known",
+    "replacement transaction underpriced",
+)
+
+
+class NonceManager:
+    """Hands out nonces for one signer on one chain without an RPC per transaction"""
+
+    def __init__(self, client: ChainClient, address: str):
+        self.client = client
+        self.address = address
+        self.pending: set[int] = set()  # reserved, not yet seen mined
+
+        self._next: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+        # Called whenever the next nonce moves
+        self.listeners: list[Callable[[], None]] = []
+
+    @property
+    def next_nonce(self) -> Optional[int]:
+        return self._next
+
+    async def sync(self):
+        """Reload the next nonce from the chain's pending transaction count"""
+        async with self._lock:
+            await self._sync()
+
+    async def reserve(self, count: int = 1) -> int:
+        """Reserve `count` consecutive nonces and return the first"""
+        async with self._lock:
+            if self._next is None:
+                await self._sync()
+            nonce = self._next
+            self._set_next(nonce + count)
+            self.pending.update(range(nonce, nonce + count))
+            return nonce
+
+    async def claim(self, nonce: int) -> bool:
+        """Reserve exactly `nonce` if it is still the next one; for pre-signed transactions"""
+        async with self._lock:
+            if self._next != nonce:
+                return False
+            self._set_next(nonce + 1)
+            self.pending.add(nonce)
+            return True
+
+    def confirm(self, nonce: int):
+        """Mark a nonce as mined"""
+        self.pending.discard(nonce)
+
+    async def fail(self, nonce: int, error: Exception):
+        """Release a nonce whose transaction could not be broadcast"""
+        async with self._lock:
+            self.pending.discard(nonce)
+            message = str(error).lower()
+
+            if self._next == nonce + 1 and not any(e in message for e in NONCE_ERRORS):
+                # Nothing was reserved after it - just hand it out again
+                self._set_next(nonce)
+                return
+
+            # Either the node disagrees with us or later nonces now sit behind a gap
+            logger.warning(
+                "Nonce out of sync, resyncing",
+                chain=self.client.chain.name,
+                nonce=nonce,
+                error=str(error),
+            )
+            try:
+                await self._sync()
+            except Exception as e:
+                logger.error("Nonce resync failed", chain=self.client.chain.name, error=str(e))
+                self._set_next(None)
+
+    async def _sync(self):
+        self._set_next(await self.client.w3.eth.get_transaction_count(self.address, "pending"))
+        self.pending = {n for n in self.pending if n < self._next}
+        logger.info("Nonce synced", chain=self.client.chain.name, next_nonce=self._next)
+
+    def _set_next(self, nonce: Optional[int]):
+        if nonce == self._next:
+            return
+        self._next = nonce
+        for listener in self.listeners:
+            listener()
@@ -0,0 +1,161 @@
+"""
+Velvet Arc Pre-signed Transactions
+Keeps a call signed at the next nonce across a ladder of fee levels, ready to broadcast
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+
+from hexbytes import HexBytes
+from eth_account.signers.local import LocalAccount
+from structlog import get_logger
+
+from config import LADDER_FEE_MULTIPLIERS
+from fee_oracle import FeeOracle, FeeQuote, Urgency
+from gas_estimator import GasEstimator
+from nonce_manager import NonceManager
+
+logger = get_logger()
+
+
+@dataclass(frozen=True)
+class Rung:
+    """One signed copy of the call at a given fee level"""
+    fees: FeeQuote
+    raw_transaction: bytes
+    tx_hash: HexBytes
+
+
+class PresignedLadder:
+    """
+    Re-signs `call` at the signer's next nonce whenever the nonce or the fee
+    oracle moves, one rung per fee multiplier. Firing is then a single
+    eth_sendRawTransaction; higher rungs replace a stuck lower one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        account: LocalAccount,
+        nonces: NonceManager,
+        fees: FeeOracle,
+        estimator: GasEstimator,
+        call: dict,
+        fallback_gas: int,
+        urgency: Urgency = Urgency.EMERGENCY,
+        multipliers: tuple[float, ...] = LADDER_FEE_MULTIPLIERS,
+    ):
+        self.name = name
+        self.account = account
+        self.nonces = nonces
+        self.fees = fees
+        self.estimator = estimator
+        self.call = call
+        self.fallback_gas = fallback_gas
+        self.urgency = urgency
+        self.multipliers = multipliers
+
+        self.nonce: Optional[int] = None
+        self.rungs: list[Rung] = []
+        self.fired_rung: Optional[int] = None
+
+        self._stale = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.rungs) and self.nonce == self.nonces.next_nonce
+
+    async def start(self):
+        self.nonces.listeners.append(self.mark_stale)
+        self.fees.listeners.append(self.mark_stale)
+        await self.regenerate()
+        if self._task is None:
+            self._task = asyncio.create_task(self._regenerate_forever())
+
+    async def stop(self):
+        if self.mark_stale in self.nonces.listeners:
+            self.nonces.listeners.remove(self.mark_stale)
+        if self.mark_stale in self.fees.listeners:
+            self.fees.listeners.remove(self.mark_stale)
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def mark_stale(self):
+        self._stale.set()
+
+    async def regenerate(self):
+        """Sign every rung at the current next nonce and fee quote"""
+        nonce = self.nonces.next_nonce
+        if nonce is None:
+            return
+
+        base = await self.fees.quote(self.urgency)
+        tx = {
+            **self.call,
+            'from': self.account.address,
+            'nonce': nonce,
+            'gas': self.fallback_gas,
+            'chainId': self.nonces.client.chain.chain_id,
+        }
+        tx['gas'] = await self.estimator.gas_limit(tx, fallback=self.fallback_gas)
+
+        rungs = []
+        for multiplier in self.multipliers:
+            fees = FeeQuote(
+                max_fee_per_gas=int(base.max_fee_per_gas * multiplier),
+                max_priority_fee_per_gas=int(base.max_priority_fee_per_gas * multiplier),
+                legacy=base.legacy,
+            )
+            signed = self.account.sign_transaction({**tx, **fees.to_tx_params()})
+            rungs.append(Rung(fees=fees, raw_transaction=signed.raw_transaction, tx_hash=signed.hash))
+
+        # The nonce moved while we were signing; the next stale event redoes it
+        if self.nonces.next_nonce != nonce:
+            return
+        self.nonce, self.rungs, self.fired_rung = nonce, rungs, None
+
+    async def fire(self, rung: int = 0) -> Optional[HexBytes]:
+        """Broadcast a pre-signed rung; None if the ladder is not at the next nonce"""
+        if not self.rungs:
+            return None
+
+        previous = self.fired_rung
+        if previous is None:
+            # Claim the nonce the ladder was signed at; fails if anything else took it
+            if not await self.nonces.claim(self.nonce):
+                return None
+        elif rung <= previous:
+            return self.rungs[previous].tx_hash
+
+        # Marked before the broadcast so the claim above doesn't trigger a re-sign
+        self.fired_rung = rung
+        try:
+            tx_hash = await self.nonces.client.w3.eth.send_raw_transaction(self.rungs[rung].raw_transaction)
+        except Exception as e:
+            self.fired_rung = previous
+            if previous is None:
+                await self.nonces.fail(self.nonce, e)
+            raise
+
+        logger.warning("Pre-signed transaction broadcast", ladder=self.name, nonce=self.nonce, rung=rung)
+        return tx_hash
+
+    async def escalate(self) -> Optional[HexBytes]:
+        """Replace a fired rung with the next fee level at the same nonce"""
+        if self.fired_rung is None or self.fired_rung + 1 >= len(self.rungs):
+            return None
+        return await self.fire(self.fired_rung + 1)
+
+    async def _regenerate_forever(self):
+        while True:
+            await self._stale.wait()
+            self._stale.clear()
+            # Keep a fired ladder intact so it can still be escalated
+            if self.fired_rung is not None and self.nonces.next_nonce == self.nonce + 1:
+                continue
+            try:
+                await self.regenerate()
+            except Exception as e:
+                logger.warning("Ladder regeneration failed", ladder=self.name, error=str(e))
@@ -0,0 +1,327 @@
+"""
+Velvet Arc Price Sources
+ETH/USD from several HTTP APIs and the hook's pool, fetched concurrently and medianized
+"""
+import asyncio
+import statistics
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from eth_abi import decode, encode
+from web3 import Web3
+from structlog import get_logger
+
+from config import (
+    PRICE_SOURCE_DEADLINE_SECONDS, PRICE_QUORUM, PRICE_MAX_DEVIATION, PRICE_TRIM,
+    PRICE_BREAKER_FAILURES, PRICE_BREAKER_COOLDOWN_SECONDS, PRICE_BREAKER_MAX_COOLDOWN_SECONDS,
+    POOL_STATE_VIEW, POOL_ID, POOL_ETH_IS_TOKEN0, POOL_DECIMALS_0, POOL_DECIMALS_1,
+)
+from http_cache import CachedHTTPClient
+from rpc import ChainClient
+
+logger = get_logger()
+
+GET_SLOT0_SELECTOR = Web3.keccak(text="getSlot0(bytes32)")[:4]
+COINGECKO_PRICE_URL = "https://api.coingecko.com/api/v3/simple/price"
+
+
+@dataclass
+class PriceQuote:
+    """One source's answer"""
+    source: str
+    price: float
+    change_24h: Optional[float] = None  # fraction, when the source reports it
+    latency: float = 0.0
+    fetched_at: float = field(default_factory=time.time)  # when the source produced it; earlier for a cached response
+
+
+@dataclass
+class AggregatePrice:
+    """The combined price and which sources it came from"""
+    price: float
+    change_24h: float
+    used: list[str] = field(default_factory=list)
+    rejected: list[str] = field(default_factory=list)  # answered, but too far from the median
+    quorum: bool = True  # False when fewer than the quorum answered before every deadline passed
+    fetched_at: float = 0.0  # newest fetch among the quotes used; unchanged while every answer is cached
+
+
+class SourceBreaker:
+    """
+    Stops asking a source after PRICE_BREAKER_FAILURES consecutive failures
+    (errors, missed deadlines or outlier answers). It is tried again once the
+    cooldown has passed, and the cooldown doubles each time the trial fails.
+    """
+
+    def __init__(
+        self,
+        failures: int = PRICE_BREAKER_FAILURES,
+        cooldown: float = PRICE_BREAKER_COOLDOWN_SECONDS,
+        max_cooldown: float = PRICE_BREAKER_MAX_COOLDOWN_SECONDS,
+    ):
+        self.failures = failures
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.consecutive = 0
+        self.cooldown = cooldown
+        self.opened_at: Optional[float] = None
+
+    @property
+    def open(self) -> bool:
+        return self.opened_at is not None and time.monotonic() - self.opened_at < self.cooldown
+
+    def success(self):
+        self.consecutive = 0
+        self.cooldown = self.base_cooldown
+        self.opened_at = None
+
+    def failure(self) -> bool:
+        """Record a failure; True if this one tripped the breaker"""
+        self.consecutive += 1
+        if self.opened_at is not None:
+            # The trial after a cooldown failed: back off further
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self.opened_at = time.monotonic()
+            return True
+        if self.consecutive >= self.failures:
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+
+class PriceSource(ABC):
+    """A named ETH/USD price with its own deadline and breaker"""
+
+    def __init__(self, name: str, deadline: float = PRICE_SOURCE_DEADLINE_SECONDS):
+        self.name = name
+        self.deadline = deadline
+        self.breaker = SourceBreaker()
+
+    @abstractmethod
+    async def fetch(self) -> PriceQuote:
+        """One quote, or an exception the aggregator counts against the breaker"""
+
+
+class HttpPriceSource(PriceSource):
+    """A JSON API; `parse` maps the response body to (price, 24h change or None)"""
+
+    def __init__(
+        self,
+        name: str,
+        client: CachedHTTPClient,
+        url: str,
+        parse: Callable[[dict], tuple[float, Optional[float]]],
+        params: Optional[dict] = None,
+        deadline: float = PRICE_SOURCE_DEADLINE_SECONDS,
+    ):
+        super().__init__(name, deadline)
+        self.client = client
+        self.url = url
+        self.params = params
+        self.parse = parse
+
+    async def fetch(self) -> PriceQuote:
+        response = await self.client.get(self.url, params=self.params)
+        response.raise_for_status()
+        price, change = self.parse(response.json())
+        fetched_at = self.client.fetched_at(self.url, self.params)
+        return PriceQuote(self.name, float(price), change, fetched_at=fetched_at or time.time())
+
+
+class PoolPriceSource(PriceSource):
+    """Spot price of the hook's Uniswap V4 pool, from StateView.getSlot0"""
+
+    def __init__(
+        self,
+        client: ChainClient,
+        state_view: str = POOL_STATE_VIEW,
+        pool_id: str = POOL_ID,
+        eth_is_token0: bool = POOL_ETH_IS_TOKEN0,
+        decimals0: int = POOL_DECIMALS_0,
+        decimals1: int = POOL_DECIMALS_1,
+        deadline: float = PRICE_SOURCE_DEADLINE_SECONDS,
+    ):
+        super().__init__("uniswap_pool", deadline)
+        self.client = client
+        self.state_view = Web3.to_checksum_address(state_view)
+        self.data = GET_SLOT0_SELECTOR + encode(["bytes32"], [Web3.to_bytes(hexstr=pool_id)])
+        self.eth_is_token0 = eth_is_token0
+        self.scale = 10 ** (decimals0 - decimals1)
+
+    async def fetch(self) -> PriceQuote:
+        raw = await self.client.w3.eth.call({"to": self.state_view, "data": self.data})
+        sqrt_price_x96 = decode(["uint160", "int24", "uint24", "uint24"], raw)[0]
+        if sqrt_price_x96 == 0:
+            raise ValueError("pool not initialized")
+        # token1 per token0, in whole tokens
+        price = (sqrt_price_x96 / 2**96) ** 2 * self.scale
+        return PriceQuote(self.name, price if self.eth_is_token0 else 1 / price)
+
+
+def _coingecko(data: dict) -> tuple[float, Optional[float]]:
+    return data["ethereum"]["usd"], data["ethereum"].get("usd_24h_change", 0) / 100
+
+
+def _coinbase(data: dict) -> tuple[float, Optional[float]]:
+    return float(data["data"]["amount"]), None
+
+
+def _kraken(data: dict) -> tuple[float, Optional[float]]:
+    ticker = next(iter(data["result"].values()))
+    last, opened = float(ticker["c"][0]), float(ticker["o"])
+    return last, (last - opened) / opened if opened else None
+
+
+def _binance(data: dict) -> tuple[float, Optional[float]]:
+    return float(data["lastPrice"]), float(data["priceChangePercent"]) / 100
+
+
+def coingecko_params(ids: list[str]) -> dict:
+    """simple/price query for these ids; equal id lists give equal queries, so the cache shares them"""
+    return {"ids": ",".join(ids), "vs_currencies": "usd", "include_24hr_change": "true"}
+
+
+def default_sources(
+    http: CachedHTTPClient,
+    pool_client: Optional[ChainClient] = None,
+    coingecko_ids: Optional[list[str]] = None,
+) -> list[PriceSource]:
+    """
+    The public APIs, plus the hook's pool when POOL_ID is configured and a
+    Base client is given. `coingecko_ids` (which must include ethereum) lets
+    the CoinGecko source ride on a multi-asset request.
+    """
+    sources: list[PriceSource] = [
+        HttpPriceSource(
+            "coingecko", http, COINGECKO_PRICE_URL, _coingecko,
+            params=coingecko_params(coingecko_ids or ["ethereum"]),
+        ),
+        HttpPriceSource("coinbase", http, "https://api.coinbase.com/v2/prices/ETH-USD/spot", _coinbase),
+        HttpPriceSource("kraken", http, "https://api.kraken.com/0/public/Ticker", _kraken, params={"pair": "ETHUSD"}),
+        HttpPriceSource(
+            "binance", http, "https://api.binance.com/api/v3/ticker/24hr", _binance, params={"symbol": "ETHUSDT"},
+        ),
+    ]
+    if pool_client is not None and POOL_ID:
+        sources.append(PoolPriceSource(pool_client))
+    return sources
+
+
+def trimmed_mean(values: list[float], trim: float = PRICE_TRIM) -> float:
+    """Mean after dropping `trim` of the values from each end"""
+    values = sorted(values)
+    cut = int(len(values) * trim)
+    kept = values[cut:len(values) - cut] or values
+    return sum(kept) / len(kept)
+
+
+class PriceAggregator:
+    """
+    Asks every source whose breaker is closed at once, each under its own
+    deadline, and combines the answers as soon as `quorum` of them are in;
+    stragglers finish in the background and only feed their breakers.
+    Answers more than PRICE_MAX_DEVIATION from the median are rejected and
+    the rest are averaged with a trimmed mean.
+    """
+
+    def __init__(self, sources: list[PriceSource], quorum: int = PRICE_QUORUM):
+        self.sources = sources
+        self.quorum = quorum
+        self.last: Optional[AggregatePrice] = None
+
+        # Counters
+        self.rounds = 0
+        self.degraded = 0  # rounds that ended below quorum
+
+        self._stragglers: dict[asyncio.Task, PriceSource] = {}
+
+    async def fetch(self) -> Optional[AggregatePrice]:
+        """The aggregate price, or None if no source answered"""
+        self.rounds += 1
+        # A source still answering the previous round isn't asked twice
+        busy = set(self._stragglers.values())
+        live = [source for source in self.sources if not source.breaker.open and source not in busy]
+        if not live:
+            # Everything is cooling down; asking anyway beats going blind
+            live = self.sources
+        quorum = min(self.quorum, len(live))
+
+        tasks = {asyncio.create_task(self._ask(source)): source for source in live}
+        quotes: list[PriceQuote] = []
+        pending = set(tasks)
+        while pending and len(quotes) < quorum:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            quotes += [task.result() for task in done if task.result() is not None]
+
+        # Whatever is already in counts too
+        quotes += [task.result() for task in list(pending) if task.done() and task.result() is not None]
+        pending = {task for task in pending if not task.done()}
+
+        if not quotes:
+            logger.error("No price source answered", sources=[s.name for s in live])
+            return None
+        aggregate = self._combine(quotes)
+        for task in pending:
+            self._stragglers[task] = tasks[task]
+            task.add_done_callback(lambda t, price=aggregate.price: self._settle(t, price))
+        aggregate.quorum = len(quotes) >= quorum
+        if not aggregate.quorum:
+            self.degraded += 1
+            logger.warning("Price below quorum", sources=aggregate.used, quorum=quorum)
+        self.last = aggregate
+        return aggregate
+
+    async def _ask(self, source: PriceSource) -> Optional[PriceQuote]:
+        started = time.monotonic()
+        try:
+            quote = await asyncio.wait_for(source.fetch(), source.deadline)
+            if not quote.price > 0:
+                raise ValueError(f"non-positive price {quote.price}")
+        except Exception as e:
+            if source.breaker.failure():
+                logger.warning(
+                    "Price source disabled",
+                    source=source.name,
+                    cooldown=source.breaker.cooldown,
+                    error=str(e) or type(e).__name__,
+                )
+            return None
+        quote.latency = time.monotonic() - started
+        return quote
+
+    def _settle(self, task: asyncio.Task, price: float):
+        """Judge a late answer against the price already published"""
+        source = self._stragglers.pop(task)
+        if task.cancelled() or task.result() is None:
+            return  # failures were recorded by _ask
+        if abs(task.result().price - price) / price <= PRICE_MAX_DEVIATION:
+            source.breaker.success()
+        else:
+            source.breaker.failure()
+
+    def _combine(self, quotes: list[PriceQuote]) -> AggregatePrice:
+        median = statistics.median(q.price for q in quotes)
+        inliers = [q for q in quotes if abs(q.price - median) / median <= PRICE_MAX_DEVIATION]
+        if not inliers:
+            # Two answers far apart: nothing says which one is wrong
+            logger.warning("Price sources disagree", quotes={q.source: q.price for q in quotes})
+            inliers = quotes
+        outliers = [q for q in quotes if q not in inliers]
+
+        sources = {source.name: source for source in self.sources}
+        for quote in inliers:
+            sources[quote.source].breaker.success()
+        for quote in outliers:
+            logger.warning("Price outlier rejected", source=quote.source, price=quote.price, median=median)
+            sources[quote.source].breaker.failure()
+
+        changes = [q.change_24h for q in inliers if q.change_24h is not None]
+        return AggregatePrice(
+            price=trimmed_mean([q.price for q in inliers]),
+            change_24h=statistics.median(changes) if changes else 0.0,
+            used=[q.source for q in inliers],
+            rejected=[q.source for q in outliers],
+            fetched_at=max(q.fetched_at for q in inliers),
+        )
@@ -0,0 +1,135 @@
+"""
+Velvet Arc Price Store
+Price samples in a memory-mapped ring file, so volatility survives restarts
+"""
+import fcntl
+import mmap
+import os
+import struct
+import time
+from typing import Optional
+
+import numpy as np
+from structlog import get_logger
+
+from config import PRICE_HISTORY_CAPACITY, PRICE_HISTORY_FSYNC, PRICE_HISTORY_FSYNC_SECONDS
+
+logger = get_logger()
+
+MAGIC = b"VAPH"
+VERSION = 1
+HEADER = struct.Struct("<4sIQQ")  # magic, version, capacity, samples written
+HEADER_SIZE = 32  # HEADER padded to keep the records 16-byte aligned
+RECORD = 2  # float64 (unix time, price)
+
+
+class PriceHistoryFile:
+    """
+    Fixed-size file: a 32-byte header and `capacity` (timestamp, price)
+    float64 records written round-robin. The file is mapped, so opening it
+    reads nothing until the tail is asked for, whatever its size. A record
+    is written before the header count that exposes it, so a crash leaves
+    at worst the last sample missing. `fsync` is "always", "interval"
+    (every PRICE_HISTORY_FSYNC_SECONDS) or "never". The file is locked to
+    one writer process.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int = PRICE_HISTORY_CAPACITY,
+        fsync: str = PRICE_HISTORY_FSYNC,
+        fsync_interval: float = PRICE_HISTORY_FSYNC_SECONDS,
+    ):
+        if fsync not in ("always", "interval", "never"):
+            raise ValueError(f"unknown fsync policy {fsync!r}")
+        self.path = path
+        self.capacity = capacity
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._synced_at = time.monotonic()
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(self._fd)
+            raise RuntimeError(f"{path} is in use by another process")
+
+        previous = self._read_existing()
+        size = HEADER_SIZE + capacity * RECORD * 8
+        if previous is not None and len(previous) == 0 and os.fstat(self._fd).st_size == size:
+            self._map(size)
+        else:
+            # New, unreadable or resized: lay the file out again, keeping any samples we could read
+            os.ftruncate(self._fd, 0)
+            os.ftruncate(self._fd, size)
+            self._map(size)
+            HEADER.pack_into(self._mmap, 0, MAGIC, VERSION, capacity, 0)
+            for timestamp, price in (previous if previous is not None else [])[-capacity:]:
+                self.append(price, timestamp)
+            self.flush()
+
+    def _read_existing(self) -> Optional[np.ndarray]:
+        """Records of a file in another layout; empty when it already matches, None when unusable"""
+        size = os.fstat(self._fd).st_size
+        if size < HEADER_SIZE:
+            return None
+        with mmap.mmap(self._fd, size, access=mmap.ACCESS_READ) as mm:
+            magic, version, capacity, written = HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or version != VERSION or size != HEADER_SIZE + capacity * RECORD * 8:
+                logger.warning("Price history unreadable, starting over", path=self.path)
+                return None
+            if capacity == self.capacity:
+                return np.empty((0, RECORD))
+            records = np.frombuffer(mm, dtype=np.float64, count=capacity * RECORD, offset=HEADER_SIZE)
+            count = min(written, capacity)
+            order = np.arange(written - count, written) % capacity
+            kept = records.reshape(capacity, RECORD)[order]
+            del records  # the map can't close while a view of it exists
+        logger.info("Resizing price history", path=self.path, before=capacity, after=self.capacity)
+        return kept
+
+    def _map(self, size: int):
+        self._mmap = mmap.mmap(self._fd, size)
+        self._records = np.frombuffer(
+            self._mmap, dtype=np.float64, count=self.capacity * RECORD, offset=HEADER_SIZE
+        ).reshape(self.capacity, RECORD)
+
+    @property
+    def written(self) -> int:
+        """Samples appended over the file's lifetime"""
+        return HEADER.unpack_from(self._mmap, 0)[3]
+
+    def __len__(self) -> int:
+        return min(self.written, self.capacity)
+
+    def append(self, price: float, timestamp: Optional[float] = None):
+        written = self.written
+        self._records[written % self.capacity] = (time.time() if timestamp is None else timestamp, price)
+        HEADER.pack_into(self._mmap, 0, MAGIC, VERSION, self.capacity, written + 1)
+
+        if self.fsync == "always" or (
+            self.fsync == "interval" and time.monotonic() - self._synced_at >= self.fsync_interval
+        ):
+            self.flush()
+
+    def tail(self, n: int) -> np.ndarray:
+        """The last `n` (timestamp, price) records, oldest first"""
+        written = self.written
+        count = min(n, written, self.capacity)
+        order = np.arange(written - count, written) % self.capacity
+        return self._records[order].copy()
+
+    def flush(self):
+        self._mmap.flush()
+        self._synced_at = time.monotonic()
+
+    def close(self):
+        if self._mmap.closed:
+            return
+        if self.fsync != "never":
+            self.flush()
+        del self._records
+        self._mmap.close()
+        os.close(self._fd)
@@ -0,0 +1,109 @@
+"""
+Velvet Arc Price Stream
+ETH/USD ticks pushed over a WebSocket, between the polling scans
+"""
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import websockets
+from structlog import get_logger
+
+from config import PRICE_STREAM_RECONNECT_SECONDS, PRICE_STREAM_MAX_RECONNECT_SECONDS
+
+logger = get_logger()
+
+
+@dataclass
+class PriceTick:
+    """One price pushed by the feed"""
+    price: float
+    change_24h: Optional[float] = None  # fraction, when the feed carries it
+    received_at: float = 0.0  # monotonic
+
+
+def parse_binance_ticker(message: dict) -> Optional[tuple[float, Optional[float]]]:
+    """A Binance <symbol>@ticker event: last price and 24h change in percent"""
+    if "c" not in message:
+        return None  # subscription acks and other control frames
+    return float(message["c"]), float(message["P"]) / 100 if "P" in message else None
+
+
+class PriceStream:
+    """
+    Keeps a WebSocket to a tick feed open and hands every price to the
+    listeners. The connection is re-opened after any failure, backing off
+    from PRICE_STREAM_RECONNECT_SECONDS up to
+    PRICE_STREAM_MAX_RECONNECT_SECONDS; polling covers the gap.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        parse: Callable[[dict], Optional[tuple[float, Optional[float]]]] = parse_binance_ticker,
+    ):
+        self.url = url
+        self.parse = parse
+        self.connected = False
+        self.last: Optional[PriceTick] = None
+
+        # Counters
+        self.ticks = 0
+        self.reconnects = 0
+        self.errors = 0
+
+        # Called with each tick
+        self.listeners: list[Callable[[PriceTick], None]] = []
+
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._stream_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.connected = False
+
+    async def _stream_forever(self):
+        delay = PRICE_STREAM_RECONNECT_SECONDS
+        while True:
+            try:
+                async with websockets.connect(self.url) as ws:
+                    self.connected = True
+                    logger.info("Price stream connected", url=self.url)
+                    async for message in ws:
+                        if self._handle(message):
+                            delay = PRICE_STREAM_RECONNECT_SECONDS
+                logger.warning("Price stream closed", url=self.url)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.warning("Price stream failed", url=self.url, error=str(e), retry_in=delay)
+            self.connected = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, PRICE_STREAM_MAX_RECONNECT_SECONDS)
+            self.reconnects += 1
+
+    def _handle(self, message) -> bool:
+        try:
+            parsed = self.parse(json.loads(message))
+        except Exception as e:
+            logger.warning("Unreadable price tick", error=str(e))
+            return False
+        if parsed is None or not parsed[0] > 0:
+            return False
+
+        self.ticks += 1
+        self.last = PriceTick(parsed[0], parsed[1], time.monotonic())
+        for listener in self.listeners:
+            try:
+                listener(self.last)
+            except Exception as e:
+                logger.warning("Price tick listener failed", error=str(e))
+        return True
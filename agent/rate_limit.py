@@ -0,0 +1,192 @@
+"""
+Velvet Arc Rate Limiting
+Per-host token buckets that learn each API's quota from its throttling and rate-limit headers
+"""
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+from structlog import get_logger
+
+from config import (
+    RATE_LIMITS, RATE_LIMIT_DEFAULT, RATE_LIMIT_MAX_WAIT_SECONDS, RATE_LIMIT_DECREASE,
+    RATE_LIMIT_INCREASE, RATE_LIMIT_MIN_SCALE, RATE_LIMIT_HEADROOM,
+)
+
+logger = get_logger()
+
+
+class RateLimited(Exception):
+    """Sending now would mean waiting longer than the caller is allowed to"""
+
+    def __init__(self, host: str, wait: float):
+        super().__init__(f"{host} rate limited for another {wait:.1f}s")
+        self.host = host
+        self.wait = wait
+
+
+def retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds from a Retry-After header, given as delta-seconds or an HTTP date"""
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def quota(headers: Mapping[str, str]) -> Optional[tuple[float, float]]:
+    """(requests remaining, seconds until the window resets) from RateLimit-* or X-RateLimit-* headers"""
+    for prefix in ("RateLimit-", "X-RateLimit-"):
+        remaining, reset = headers.get(prefix + "Remaining"), headers.get(prefix + "Reset")
+        if remaining is None or reset is None:
+            continue
+        try:
+            remaining, reset = float(remaining), float(reset)
+        except ValueError:
+            return None
+        if reset > 1e9:
+            reset -= time.time()  # an epoch timestamp rather than a delta
+        return remaining, max(reset, 0.0)
+    return None
+
+
+class TokenBucket:
+    """
+    `rate` requests a second with bursts of `burst`, both multiplied by a
+    scale kept AIMD-style: a throttled response halves it (at most once a
+    second, since concurrent requests tend to be throttled together) and
+    each success adds it back at RATE_LIMIT_INCREASE per second of traffic.
+    Retry-After pauses the bucket, and a published quota caps the rate at
+    what is left of it until the window resets. Waiters are served in order.
+    """
+
+    def __init__(self, host: str, rate: float, burst: float):
+        self.host = host
+        self.base_rate = rate
+        self.base_burst = burst
+        self.scale = 1.0
+        self.tokens = float(burst)
+        self.paused_until = 0.0
+        self.quota_rate: Optional[float] = None
+        self.quota_until = 0.0
+
+        # Counters
+        self.requests = 0
+        self.delayed = 0  # requests that had to wait for a token
+        self.throttled = 0  # 429/503 responses
+
+        self._updated = time.monotonic()
+        self._decreased_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def rate(self) -> float:
+        rate = self.base_rate * self.scale
+        if self.quota_rate is not None and time.monotonic() < self.quota_until:
+            rate = min(rate, self.quota_rate)
+        return max(rate, 1e-3)
+
+    @property
+    def capacity(self) -> float:
+        return max(self.base_burst * self.scale, 1.0)
+
+    def wait_time(self) -> float:
+        """Seconds until a request could be sent"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return max(self.paused_until - now, (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0)
+
+    async def acquire(self, max_wait: float = RATE_LIMIT_MAX_WAIT_SECONDS):
+        async with self._lock:
+            waited = False
+            while (wait := self.wait_time()) > 0:
+                if wait > max_wait:
+                    raise RateLimited(self.host, wait)
+                waited = True
+                await asyncio.sleep(wait)
+            self.tokens -= 1
+            self.requests += 1
+            self.delayed += waited
+
+    def success(self):
+        self.scale = min(self.scale + RATE_LIMIT_INCREASE / self.rate, 1.0)
+
+    def throttle(self, pause: Optional[float] = None):
+        now = time.monotonic()
+        self.throttled += 1
+        self.tokens = 0.0
+        self.paused_until = max(self.paused_until, now + (pause if pause is not None else 1 / self.rate))
+        if now - self._decreased_at >= 1.0:
+            self._decreased_at = now
+            self.scale = max(self.scale * RATE_LIMIT_DECREASE, RATE_LIMIT_MIN_SCALE)
+            logger.warning("Rate limited", host=self.host, rate=f"{self.rate:.2f}/s", pause=pause)
+
+    def set_quota(self, remaining: float, reset: float):
+        now = time.monotonic()
+        if remaining <= 0:
+            self.paused_until = max(self.paused_until, now + reset)
+        if reset > 0:
+            self.quota_rate = max(remaining, 0.0) / reset * RATE_LIMIT_HEADROOM
+            self.quota_until = now + reset
+
+
+class RateLimiter:
+    """
+    One TokenBucket per host, configured from RATE_LIMITS (requests/s,
+    burst) or RATE_LIMIT_DEFAULT. Every client in the process shares it
+    through the ConnectionManager, so strategies, price sources and RPC
+    hedges all draw from the same per-host budget. Buckets are per process:
+    a fleet worker runs on `share` (1 / the configured worker count) of
+    each budget rather than coordinating with its siblings, so the fleet
+    as a whole never exceeds it.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, tuple[float, float]] = RATE_LIMITS,
+        default: tuple[float, float] = RATE_LIMIT_DEFAULT,
+        max_wait: float = RATE_LIMIT_MAX_WAIT_SECONDS,
+        share: float = 1.0,
+    ):
+        self.limits = limits
+        self.default = default
+        self.max_wait = max_wait
+        self.share = share
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, host: str) -> TokenBucket:
+        if host not in self.buckets:
+            rate, burst = self.limits.get(host, self.default)
+            self.buckets[host] = TokenBucket(host, rate * self.share, burst * self.share)
+        return self.buckets[host]
+
+    def set_share(self, share: float):
+        """Run on `share` of every configured budget, e.g. one fleet worker's part"""
+        self.share = share
+        for host, bucket in self.buckets.items():
+            rate, burst = self.limits.get(host, self.default)
+            bucket.base_rate, bucket.base_burst = rate * share, burst * share
+            bucket.tokens = min(bucket.tokens, bucket.capacity)
+
+    async def acquire(self, host: str):
+        """Wait for the host's next slot; RateLimited if that is more than `max_wait` away"""
+        await self.bucket(host).acquire(self.max_wait)
+
+    def observe(self, host: str, status: int, headers: Mapping[str, str]):
+        """Adapt the host's bucket to a response"""
+        bucket = self.bucket(host)
+        limits = quota(headers)
+        if limits is not None:
+            bucket.set_quota(*limits)
+        if status == 429 or (status == 503 and "Retry-After" in headers):
+            bucket.throttle(retry_after(headers))
+        elif status < 500:
+            bucket.success()
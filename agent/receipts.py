@@ -0,0 +1,339 @@
+"""
+Velvet Arc Receipt Tracker
+Follows new heads per chain and resolves pending transaction receipts once per block
+"""
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import websockets
+from hexbytes import HexBytes
+from web3.exceptions import TransactionNotFound
+from structlog import get_logger
+
+from config import (
+    RECEIPT_TIMEOUT_SECONDS, RECEIPT_POLL_SECONDS, RECEIPT_WS_RETRY_SECONDS, RPC_TIMEOUT_SECONDS
+)
+from gas_estimator import GasEstimator
+from nonce_manager import NonceManager
+from rpc import ChainClient
+
+logger = get_logger()
+
+
+class TransactionReplaced(Exception):
+    """The transaction was re-sent at the same nonce under a new hash"""
+
+    def __init__(self, tx_hash: HexBytes, replacement: HexBytes):
+        super().__init__(f"{tx_hash.to_0x_hex()} replaced by {replacement.to_0x_hex()}")
+        self.tx_hash = tx_hash
+        self.replacement = replacement
+
+
+@dataclass
+class PendingTx:
+    """A broadcast transaction waiting for its receipt"""
+    tx_hash: HexBytes
+    label: str
+    nonce: Optional[int]
+    tx: Optional[dict]
+    sent_at: float = field(default_factory=time.monotonic)
+    future: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+    replaces: list[HexBytes] = field(default_factory=list)  # earlier hashes at this nonce, any may mine
+    nonces: Optional[NonceManager] = None  # the sender's, when the tracker is shared between signers
+    owner: Optional[str] = None  # strategy that sent it
+    stale: bool = False  # receipt overdue; still followed until it mines or its nonce is used
+
+    @property
+    def hashes(self) -> list[HexBytes]:
+        return [self.tx_hash, *self.replaces]
+
+
+class ReceiptTracker:
+    """
+    Resolves receipts for every pending hash on one chain with a single
+    (coalesced) lookup per new block. Heads come from an eth_subscribe
+    newHeads WebSocket when the chain has ws_url, otherwise from polling.
+    """
+
+    def __init__(
+        self,
+        client: ChainClient,
+        nonces: Optional[NonceManager] = None,
+        estimator: Optional[GasEstimator] = None,
+        timeout: float = RECEIPT_TIMEOUT_SECONDS,
+        poll_interval: float = RECEIPT_POLL_SECONDS,
+    ):
+        self.client = client
+        self.nonces = nonces
+        self.estimator = estimator
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.pending: dict[HexBytes, PendingTx] = {}
+
+        # Called with every head number and every receipt we resolve
+        self.head_listeners: list[Callable[[int], None]] = []
+        self.receipt_listeners: list[Callable[[dict], None]] = []
+        self.subscribed = False  # heads are arriving over the WebSocket
+
+        # Counters
+        self.confirmed = 0
+        self.reverted = 0
+        self.timed_out = 0
+        self.lookups = 0
+
+        self._last_head: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def track(
+        self,
+        tx_hash,
+        label: str,
+        nonce: Optional[int] = None,
+        tx: Optional[dict] = None,
+        nonces: Optional[NonceManager] = None,
+        owner: Optional[str] = None,
+    ) -> asyncio.Future:
+        """Start following a broadcast transaction; the future resolves to its receipt"""
+        tx_hash = HexBytes(tx_hash)
+        entry = self.pending.get(tx_hash)
+        if entry is None:
+            entry = PendingTx(tx_hash=tx_hash, label=label, nonce=nonce, tx=tx, nonces=nonces, owner=owner)
+            # Timeouts are logged here; don't warn when nobody awaits the future
+            entry.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self.pending[tx_hash] = entry
+        return entry.future
+
+    def replace(self, entry: PendingTx, tx_hash, label: str, tx: dict) -> asyncio.Future:
+        """Follow a same-nonce replacement; the old hash's future fails with TransactionReplaced"""
+        tx_hash = HexBytes(tx_hash)
+        self.pending.pop(entry.tx_hash, None)
+        future = self.track(tx_hash, label, nonce=entry.nonce, tx=tx, nonces=entry.nonces, owner=entry.owner)
+        self.pending[tx_hash].replaces = entry.hashes
+        if not entry.future.done():
+            entry.future.set_exception(TransactionReplaced(entry.tx_hash, tx_hash))
+        return future
+
+    def latest(self, label: str, owner: Optional[str] = None) -> Optional[PendingTx]:
+        """Most recent pending transaction with this label (sent by `owner`, if given)"""
+        entries = [e for e in self.pending.values() if e.label == label and (owner is None or e.owner == owner)]
+        return max(entries, key=lambda e: e.sent_at) if entries else None
+
+    def future(self, tx_hash) -> Optional[asyncio.Future]:
+        entry = self.pending.get(HexBytes(tx_hash))
+        return entry.future if entry is not None else None
+
+    async def wait(self, tx_hash, timeout: Optional[float] = None) -> dict:
+        """Await a tracked transaction's receipt without cancelling it for other waiters"""
+        future = self.future(tx_hash)
+        if future is None:
+            raise KeyError(f"transaction {HexBytes(tx_hash).to_0x_hex()} is not tracked")
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    def table(self, owner: Optional[str] = None) -> list[dict]:
+        """Pending transactions (sent by `owner`, if given), oldest first"""
+        now = time.monotonic()
+        return [
+            {
+                "tx_hash": entry.tx_hash.to_0x_hex(),
+                "label": entry.label,
+                "nonce": entry.nonce,
+                "owner": entry.owner,
+                "age_seconds": round(now - entry.sent_at, 1),
+                "stale": entry.stale,
+            }
+            for entry in sorted(self.pending.values(), key=lambda e: e.sent_at)
+            if owner is None or entry.owner == owner
+        ]
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._follow_heads())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for entry in self.pending.values():
+            if not entry.future.done():
+                entry.future.cancel()
+        self.pending.clear()
+
+    async def on_head(self, block_number: int):
+        """Check every pending hash against a new block"""
+        self.client.observe_block(block_number)
+        for listener in self.head_listeners:
+            listener(block_number)
+        if block_number == self._last_head:
+            await self._expire_overdue()
+            return
+        self._last_head = block_number
+        if self.pending:
+            await self._check()
+
+    async def _check(self):
+        lookups = [(entry, tx_hash) for entry in self.pending.values() for tx_hash in entry.hashes]
+        # For stale entries: has the sender's nonce moved past them without our hashes?
+        senders = list(dict.fromkeys(
+            (entry.nonces or self.nonces).address for entry in self.pending.values() if entry.stale
+        ))
+        w3 = self.client.w3
+        self.lookups += 1
+
+        # Issued together so the provider sends them as one JSON-RPC batch
+        results = await asyncio.gather(
+            *(w3.eth.get_transaction_receipt(tx_hash) for _, tx_hash in lookups),
+            *(w3.eth.get_transaction_count(address, "latest") for address in senders),
+            return_exceptions=True,
+        )
+        mined_counts = {
+            address: count for address, count in zip(senders, results[len(lookups):]) if not isinstance(count, Exception)
+        }
+
+        now = time.monotonic()
+        unresolved = {}
+        for (entry, tx_hash), result in zip(lookups, results):
+            if entry.tx_hash not in self.pending:
+                continue  # another hash at this nonce already resolved it
+            if isinstance(result, TransactionNotFound):
+                unresolved[entry.tx_hash] = entry
+            elif isinstance(result, Exception):
+                logger.warning("Receipt lookup failed", chain=self.client.chain.name, tx_hash=tx_hash.to_0x_hex(), error=str(result))
+            else:
+                unresolved.pop(entry.tx_hash, None)
+                self._resolve(entry, result)
+
+        for entry in unresolved.values():
+            if entry.tx_hash not in self.pending:
+                continue
+            if not entry.stale and now - entry.sent_at > self.timeout:
+                await self._expire(entry)
+            elif entry.stale:
+                nonces = entry.nonces or self.nonces
+                mined = mined_counts.get(nonces.address)
+                if mined is not None and mined > entry.nonce:
+                    # Something else was mined at this nonce; ours never will be
+                    self.pending.pop(entry.tx_hash, None)
+                    nonces.confirm(entry.nonce)
+                    logger.warning(
+                        "Stale transaction superseded",
+                        chain=self.client.chain.name,
+                        label=entry.label,
+                        tx_hash=entry.tx_hash.to_0x_hex(),
+                        nonce=entry.nonce,
+                    )
+
+    def _resolve(self, entry: PendingTx, receipt: dict):
+        self.pending.pop(entry.tx_hash, None)
+        nonces = entry.nonces or self.nonces
+        if nonces is not None and entry.nonce is not None:
+            nonces.confirm(entry.nonce)
+
+        if receipt["status"] == 1:
+            self.confirmed += 1
+            logger.info(
+                "Transaction confirmed",
+                chain=self.client.chain.name,
+                label=entry.label,
+                tx_hash=HexBytes(receipt["transactionHash"]).to_0x_hex(),
+                block=receipt["blockNumber"],
+                seconds=round(time.monotonic() - entry.sent_at, 1),
+            )
+        else:
+            self.reverted += 1
+            # The gas limit it was built with may be what broke it
+            if self.estimator is not None and entry.tx is not None:
+                self.estimator.invalidate(entry.tx)
+            logger.error(
+                "Transaction reverted",
+                chain=self.client.chain.name,
+                label=entry.label,
+                tx_hash=entry.tx_hash.to_0x_hex(),
+                block=receipt["blockNumber"],
+            )
+
+        for listener in self.receipt_listeners:
+            listener(receipt)
+        if not entry.future.done():
+            entry.future.set_result(receipt)
+
+    async def _expire_overdue(self):
+        now = time.monotonic()
+        for entry in [e for e in self.pending.values() if not e.stale and now - e.sent_at > self.timeout]:
+            await self._expire(entry)
+
+    async def _expire(self, entry: PendingTx):
+        """
+        Fail the waiters but keep following the transaction: it may still be
+        in the mempool, so it stays pending (and blocks its owner's bridges)
+        until it mines or its nonce is used by another. The nonces are
+        resynced from the chain's pending count, which closes the gap if the
+        node dropped it.
+        """
+        nonces = entry.nonces or self.nonces
+        if entry.nonce is None or nonces is None:
+            self.pending.pop(entry.tx_hash, None)  # nothing to tell when it is gone
+        else:
+            entry.stale = True
+        self.timed_out += 1
+        logger.warning("Transaction receipt timed out", chain=self.client.chain.name, label=entry.label, tx_hash=entry.tx_hash.to_0x_hex())
+        if not entry.future.done():
+            entry.future.set_exception(asyncio.TimeoutError(f"no receipt for {entry.tx_hash.to_0x_hex()} after {self.timeout}s"))
+
+        if entry.stale:
+            try:
+                await nonces.sync()
+            except Exception as e:
+                logger.error("Nonce resync failed", chain=self.client.chain.name, error=str(e))
+
+    async def _follow_heads(self):
+        while True:
+            if self.client.chain.ws_url:
+                try:
+                    await self._subscribe()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning("Head subscription dropped, polling", chain=self.client.chain.name, error=str(e))
+                await self._poll(RECEIPT_WS_RETRY_SECONDS)
+            else:
+                await self._poll(None)
+
+    async def _subscribe(self):
+        async with websockets.connect(self.client.chain.ws_url, open_timeout=RPC_TIMEOUT_SECONDS) as ws:
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": ["newHeads"]}))
+            reply = json.loads(await ws.recv())
+            if "error" in reply:
+                raise RuntimeError(reply["error"].get("message", reply["error"]))
+            logger.info("Subscribed to new heads", chain=self.client.chain.name)
+
+            self.subscribed = True
+            try:
+                async for message in ws:
+                    head = json.loads(message).get("params", {}).get("result") or {}
+                    if "number" in head:
+                        await self._on_head_safely(int(head["number"], 16))
+            finally:
+                self.subscribed = False
+
+    async def _poll(self, duration: Optional[float]):
+        deadline = None if duration is None else time.monotonic() + duration
+        while deadline is None or time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            # Nothing to resolve: don't spend a call on the block number
+            if not self.pending:
+                continue
+            try:
+                block_number = await self.client.w3.eth.block_number
+            except Exception as e:
+                logger.warning("Head poll failed", chain=self.client.chain.name, error=str(e))
+                continue
+            await self._on_head_safely(block_number)
+
+    async def _on_head_safely(self, block_number: int):
+        try:
+            await self.on_head(block_number)
+        except Exception as e:
+            logger.warning("Receipt check failed", chain=self.client.chain.name, block=block_number, error=str(e))
@@ -0,0 +1,57 @@
+"""
+Velvet Arc RPC Layer
+Async Web3 clients on the process-wide pooled keep-alive HTTP session
+"""
+from typing import Optional
+
+import aiohttp
+from web3 import AsyncWeb3
+from web3.middleware import ExtraDataToPOAMiddleware
+from structlog import get_logger
+
+from config import ChainConfig, RPC_TIMEOUT_SECONDS
+from connections import ConnectionManager, get_connections
+from transport import HedgedHTTPProvider
+
+logger = get_logger()
+
+
+class ChainClient:
+    """Async Web3 client bound to a single chain"""
+
+    def __init__(self, chain: ChainConfig, connections: Optional[ConnectionManager] = None):
+        self.chain = chain
+        self.connections = connections or get_connections()
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.latest_block: Optional[int] = None  # Highest block seen by any reader
+
+        # Concurrent calls are coalesced into JSON-RPC batches, each sent to
+        # the healthiest endpoint and hedged to the next one when it is slow
+        self.provider = HedgedHTTPProvider(
+            chain.rpc_urls,
+            timeout=aiohttp.ClientTimeout(total=RPC_TIMEOUT_SECONDS),
+        )
+        self.w3 = AsyncWeb3(self.provider)
+
+        # Add PoA middleware for testnets
+        self.w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+
+    async def connect(self):
+        """Take the shared pooled session and hand it to the provider"""
+        if self.session is not None:
+            return
+
+        self.session = self.connections.acquire().session
+        self.provider.attach_session(self.session)
+
+        logger.info("RPC session opened", chain=self.chain.name, endpoints=len(self.chain.rpc_urls))
+
+    def observe_block(self, block_number: int):
+        """Record a block number seen in a response, without an extra RPC"""
+        if self.latest_block is None or block_number > self.latest_block:
+            self.latest_block = block_number
+
+    async def close(self):
+        if self.session is not None:
+            self.session = None
+            await self.connections.release()
@@ -0,0 +1,204 @@
+"""
+Velvet Arc Submission Scheduler
+Priority lanes per chain in front of the executor, so urgent actions never queue behind routine ones
+"""
+import asyncio
+import itertools
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+from structlog import get_logger
+
+from config import (
+    ARC_TESTNET, BASE_SEPOLIA, SUBMIT_CONCURRENCY_PER_CHAIN, SUBMIT_WAIT_SAMPLES
+)
+from decision_engine import Action, Decision
+
+logger = get_logger()
+
+# Lower runs first
+ACTION_PRIORITY = {
+    Action.EMERGENCY_EXIT: 0,
+    Action.WITHDRAW: 1,
+    Action.DEPLOY: 2,
+    Action.ADJUST_FEE: 3,
+}
+ACTION_CHAIN = {
+    Action.EMERGENCY_EXIT: ARC_TESTNET.chain_id,
+    Action.DEPLOY: ARC_TESTNET.chain_id,
+    Action.WITHDRAW: BASE_SEPOLIA.chain_id,
+    Action.ADJUST_FEE: BASE_SEPOLIA.chain_id,
+}
+# A newer decision for these replaces an older one, queued or already broadcast
+SUPERSEDABLE = {Action.DEPLOY, Action.ADJUST_FEE}
+
+
+@dataclass(order=True)
+class Submission:
+    """A decision waiting for a worker"""
+    priority: int
+    seq: int
+    decision: Decision = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    queued_at: float = field(compare=False, default_factory=time.monotonic)
+    superseded: bool = field(compare=False, default=False)
+
+
+@dataclass
+class SchedulerStats:
+    """Queue-wait samples per action plus outcome counters"""
+    waits: dict[Action, deque] = field(
+        default_factory=lambda: {a: deque(maxlen=SUBMIT_WAIT_SAMPLES) for a in ACTION_PRIORITY}
+    )
+    submitted: int = 0
+    completed: int = 0
+    superseded: int = 0  # dropped from the queue by a newer decision
+    replaced: int = 0  # sent at the nonce of a still-pending transaction
+    preempted: int = 0  # emergency exits that took a pending deploy's nonce
+    escalated: int = 0  # emergency exits re-sent at a higher fee over an unmined one
+
+    def wait_ms(self, action: Action) -> dict:
+        samples = self.waits[action]
+        if not samples:
+            return {"count": 0}
+        p50, p95, worst = np.percentile(np.fromiter(samples, float), [50, 95, 100]) * 1000
+        return {"count": len(samples), "p50": round(float(p50), 2), "p95": round(float(p95), 2), "max": round(float(worst), 2)}
+
+    def summary(self) -> dict:
+        return {action.value: self.wait_ms(action) for action in ACTION_PRIORITY}
+
+
+class SubmissionScheduler:
+    """
+    One priority queue and a small worker pool per chain. Emergency exits
+    skip the queue entirely; a newer DEPLOY or ADJUST_FEE drops a queued one
+    and replaces an unmined one at the same nonce.
+    """
+
+    def __init__(self, executor, concurrency: int = SUBMIT_CONCURRENCY_PER_CHAIN):
+        self.executor = executor
+        self.concurrency = concurrency
+        self.stats = SchedulerStats()
+
+        self.queues: dict[int, asyncio.PriorityQueue] = {
+            chain_id: asyncio.PriorityQueue() for chain_id in set(ACTION_CHAIN.values())
+        }
+        self._queued: dict[Action, Submission] = {}  # latest queued submission per supersedable action
+        self._waiting: Counter[Action] = Counter()
+        self._seq = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    async def start(self):
+        if self._workers:
+            return
+        for chain_id, queue in self.queues.items():
+            for _ in range(self.concurrency):
+                self._workers.append(asyncio.create_task(self._work(queue)))
+
+    async def stop(self):
+        for task in [*self._workers, *self._tasks]:
+            task.cancel()
+        self._workers.clear()
+
+    def submit(self, decision: Decision) -> asyncio.Future:
+        """Queue a decision; the future resolves to its tx hash, or None"""
+        action = decision.action
+        submission = Submission(
+            priority=ACTION_PRIORITY[action],
+            seq=next(self._seq),
+            decision=decision,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self.stats.submitted += 1
+
+        if action == Action.EMERGENCY_EXIT:
+            # Straight to the mempool, never behind a busy worker
+            task = asyncio.create_task(self._run(submission))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return submission.future
+
+        if action in SUPERSEDABLE:
+            older = self._queued.get(action)
+            if older is not None:
+                older.superseded = True
+                self._waiting[action] -= 1
+                older.future.set_result(None)
+                self.stats.superseded += 1
+                logger.info("Queued action superseded", action=action.value)
+            self._queued[action] = submission
+
+        self._waiting[action] += 1
+        self.queues[ACTION_CHAIN[action]].put_nowait(submission)
+        return submission.future
+
+    def queued(self, action: Optional[Action] = None) -> int:
+        """Submissions waiting for a worker, for one action or all"""
+        if action is None:
+            return sum(self._waiting.values())
+        return self._waiting[action]
+
+    async def _work(self, queue: asyncio.PriorityQueue):
+        while True:
+            submission = await queue.get()
+            try:
+                if submission.superseded:
+                    continue
+                self._waiting[submission.decision.action] -= 1
+                if self._queued.get(submission.decision.action) is submission:
+                    del self._queued[submission.decision.action]
+                await self._run(submission)
+            finally:
+                queue.task_done()
+
+    async def _run(self, submission: Submission):
+        decision = submission.decision
+        wait = time.monotonic() - submission.queued_at
+        self.stats.waits[decision.action].append(wait)
+
+        try:
+            tx_hash = await self._replace_pending(decision)
+            if tx_hash is None:
+                tx_hash = await self.executor.execute(decision)
+        except Exception as e:
+            logger.error("Submission failed", action=decision.action.value, error=str(e))
+            tx_hash = None
+
+        self.stats.completed += 1
+        if not submission.future.done():
+            submission.future.set_result(tx_hash)
+
+    async def _replace_pending(self, decision: Decision) -> Optional[str]:
+        """Take over the nonce of an unmined transaction this decision supersedes"""
+        if decision.action in SUPERSEDABLE:
+            pending = self.executor.pending_for(decision.action)
+            if pending is not None:
+                tx_hash = await self.executor.replace(pending, decision)
+                if tx_hash is not None:
+                    self.stats.replaced += 1
+                return tx_hash
+
+        if decision.action == Action.EMERGENCY_EXIT:
+            # An earlier exit still unmined: outbid it rather than queue another behind it
+            pending = self.executor.pending_for(Action.EMERGENCY_EXIT)
+            if pending is not None:
+                tx_hash = await self.executor.escalate_exit(pending)
+                if tx_hash is None:
+                    tx_hash = await self.executor.replace(pending, decision)
+                if tx_hash is not None:
+                    self.stats.escalated += 1
+                return tx_hash
+
+            # A stuck deploy ahead of it would hold the exit back a nonce
+            pending = self.executor.pending_for(Action.DEPLOY)
+            if pending is not None:
+                tx_hash = await self.executor.replace(pending, decision)
+                if tx_hash is not None:
+                    self.stats.preempted += 1
+                return tx_hash
+
+        return None
@@ -0,0 +1,116 @@
+import asyncio
+from types import SimpleNamespace
+
+from eth_abi import encode
+from hexbytes import HexBytes
+from web3 import Web3
+
+from bridge import BridgeStage, BridgeTracker, GATEWAY_DEPOSIT_TOPIC
+from config import ARC_TESTNET, BASE_SEPOLIA
+from decision_engine import Action, Position
+from main import VelvetAgent
+
+VAULT = "0x" + "11" * 20
+USDC = "0x" + "22" * 20
+GATEWAY = "0x" + "33" * 20
+AGENT = "0x" + "44" * 20
+
+
+def vault_deploy_receipt(amount: int) -> dict:
+    """Logs as VelvetVault.bridgeToExecution emits them: approve, Gateway deposit/transfer, StateChanged, GatewayDeposit"""
+    def topic(signature: str) -> HexBytes:
+        return HexBytes(Web3.keccak(text=signature))
+
+    def word(address: str) -> HexBytes:
+        return HexBytes(bytes(12) + HexBytes(address))
+
+    return {
+        "status": 1,
+        "logs": [
+            {"address": USDC, "topics": [topic("Approval(address,address,uint256)"), word(VAULT), word(GATEWAY)],
+             "data": HexBytes(encode(["uint256"], [amount]))},
+            {"address": USDC, "topics": [topic("Transfer(address,address,uint256)"), word(VAULT), word(GATEWAY)],
+             "data": HexBytes(encode(["uint256"], [amount]))},
+            {"address": GATEWAY, "topics": [topic("Deposited(address,address,uint256)")],
+             "data": HexBytes(encode(["address", "address", "uint256"], [USDC, VAULT, amount]))},
+            {"address": VAULT.lower(), "topics": [topic("StateChanged(uint8,uint8)")],
+             "data": HexBytes(encode(["uint8", "uint8"], [0, 1]))},
+            {"address": VAULT.lower(), "topics": [HexBytes(GATEWAY_DEPOSIT_TOPIC)],
+             "data": HexBytes(encode(["uint256", "uint256", "bytes32"], [amount, BASE_SEPOLIA.chain_id, word(AGENT)]))},
+        ],
+    }
+
+
+class BaseEth:
+    """Base Sepolia where Gateway's mint to the agent lands a few blocks after we start watching"""
+
+    def __init__(self, mint_block: int):
+        self.head = 100
+        self.mint_block = mint_block
+        self.queries = []
+
+    @property
+    async def block_number(self):
+        self.head += 1
+        return self.head
+
+    async def get_logs(self, query):
+        self.queries.append(query)
+        if query["fromBlock"] <= self.mint_block <= query["toBlock"]:
+            return [{"transactionHash": HexBytes("0x" + "cd" * 32), "blockNumber": self.mint_block}]
+        return []
+
+
+class Vault:
+    """VelvetVault's state machine, driven by the calls the tracker sends"""
+
+    def __init__(self):
+        self.state = 1  # BRIDGING_OUT once bridgeToExecution mined
+
+    async def send_calls(self, chain_id, calls, urgency):
+        assert chain_id == ARC_TESTNET.chain_id
+        for _, _, label in calls:
+            assert label == "confirm_deployment" and self.state == 1
+            self.state = 2  # DEPLOYED
+        return [HexBytes("0x" + "ef" * 32) for _ in calls]
+
+
+def test_gateway_deploy_reaches_base_and_confirms_vault(monkeypatch):
+    monkeypatch.setattr("bridge.ATTESTATION_POLL_SECONDS", 0)
+    base = BaseEth(mint_block=104)
+    vault = Vault()
+    executor = SimpleNamespace(
+        strategy=SimpleNamespace(vault_address=VAULT),
+        receipts={BASE_SEPOLIA.chain_id: SimpleNamespace(client=SimpleNamespace(w3=SimpleNamespace(eth=base)))},
+        send_calls=vault.send_calls,
+    )
+    tracker = BridgeTracker(executor, attestations=SimpleNamespace())
+    agent = SimpleNamespace(position=Position.ARC, last_bridge_time=None)
+    stages = []
+    tracker.listeners.append(lambda transfer: stages.append(transfer.stage))
+    tracker.listeners.append(lambda transfer: VelvetAgent._on_bridge_update(agent, transfer))
+
+    async def receipt(chain, tx_hash):
+        if chain == ARC_TESTNET and tx_hash == "0x" + "ab" * 32:
+            return vault_deploy_receipt(5_000_000)
+        return {"status": 1, "logs": []}
+
+    tracker._receipt = receipt
+
+    async def run():
+        transfer = tracker.track(Action.DEPLOY, "0x" + "ab" * 32, 5_000_000)
+        await asyncio.sleep(0)
+        assert tracker.in_flight() == [transfer]  # Gateway still has to mint
+        await asyncio.gather(*tracker._tasks)
+        return transfer
+
+    transfer = asyncio.run(run())
+    assert stages == [BridgeStage.GATEWAY, BridgeStage.CONFIRMING, BridgeStage.COMPLETE]
+    assert transfer.error is None and tracker.completed == 1
+    assert transfer.recipient == Web3.to_checksum_address(AGENT)
+    assert transfer.mint_hash == "0x" + "cd" * 32
+    assert base.queries[0]["topics"][2] == HexBytes(bytes(12) + HexBytes(AGENT))
+    assert agent.position == Position.BASE
+    assert agent.last_bridge_time is not None
+    assert vault.state == 2
+    assert tracker.in_flight() == []
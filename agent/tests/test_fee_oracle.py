@@ -0,0 +1,41 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from fee_oracle import FeeOracle
+
+
+class FailingEth:
+    def __init__(self, error: Exception):
+        self.error = error
+
+    async def fee_history(self, *args):
+        raise self.error
+
+    @property
+    async def gas_price(self):
+        return 10**9
+
+
+def oracle(error: Exception) -> FeeOracle:
+    client = SimpleNamespace(chain=SimpleNamespace(name="test"), w3=SimpleNamespace(eth=FailingEth(error)))
+    return FeeOracle(client)
+
+
+@pytest.mark.parametrize("error", [
+    ValueError({"code": -32005, "message": "rate limited"}),
+    ValueError({"code": -32000, "message": "header not found"}),
+    TimeoutError(),
+])
+def test_transient_errors_keep_fee_history(error):
+    fees = oracle(error)
+    asyncio.run(fees.refresh())
+    assert not fees.legacy
+    assert fees.gas_price_gwei is not None  # legacy quotes until history returns
+
+
+def test_method_not_found_switches_to_legacy():
+    fees = oracle(ValueError({"code": -32601, "message": "the method eth_feeHistory does not exist/is not available"}))
+    asyncio.run(fees.refresh())
+    assert fees.legacy
@@ -0,0 +1,70 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import fleet
+from config import StrategyConfig
+from fleet import FleetSupervisor
+
+
+class FakeProcess:
+    """Stands in for a spawned worker; kill() makes it look dead"""
+    count = 0
+
+    def __init__(self, target, args, name, daemon):
+        self.args = args
+        self.alive = False
+        self.exitcode = None
+        FakeProcess.count += 1
+        self.pid = FakeProcess.count
+
+    def start(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+    def kill(self):
+        self.alive, self.exitcode = False, -9
+
+    def terminate(self):
+        self.alive, self.exitcode = False, -15
+
+    def join(self, timeout=None):
+        pass
+
+
+def test_killed_worker_is_respawned(monkeypatch):
+    monkeypatch.setattr(fleet, "FLEET_RESPAWN_SECONDS", 0.05)
+
+    async def run():
+        strategies = [
+            StrategyConfig(f"s{i}", "0x" + "00" * 20, "0x" + "00" * 20, "0x" + f"{i + 1:064x}")
+            for i in range(8)
+        ]
+        supervisor = FleetSupervisor(strategies, workers=2, feed_path="/tmp/unused.sock")
+        supervisor._context = SimpleNamespace(Process=FakeProcess)
+        supervisor.running = True
+
+        await supervisor._rebalance()
+        before = dict(supervisor.shards)
+        victim = next(iter(before))
+        supervisor.processes[victim].kill()
+
+        await supervisor._check_workers()
+        assert victim not in supervisor.ring.nodes
+        assert sorted(sum(supervisor.shards.values(), [])) == sorted(s.name for s in strategies)
+
+        await asyncio.sleep(0.06)
+        await supervisor._check_workers()
+        assert victim in supervisor.ring.nodes
+        assert supervisor.processes[victim].is_alive()
+        assert supervisor.shards == before
+        assert supervisor.respawns == 1
+
+        # Dying again straight away doubles the wait
+        supervisor.processes[victim].kill()
+        await supervisor._check_workers()
+        assert supervisor.respawn_at[victim] - time.monotonic() > 0.05
+
+    asyncio.run(run())
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+
+from indexer import EventStore
+
+VAULT = "0x000000000000000000000000000000000000dEaD"
+
+
+def row(block: int, name: str = "Deposited") -> tuple:
+    return (26, block, 0, f"0x{block:064x}", f"0x{block:064x}", VAULT, name, '{"amount": 1}')
+
+
+def test_store_runs_off_the_event_loop(tmp_path):
+    async def run():
+        store = EventStore(str(tmp_path / "events.db"))
+        threads = set()
+        commit = store._commit
+
+        def tracked(*args):
+            threads.add(threading.get_ident())
+            commit(*args)
+
+        store._commit = tracked
+        await asyncio.gather(*(
+            store.commit(26, "vault", [row(n)], {n: f"0x{n:064x}"}, (n, f"0x{n:064x}"))
+            for n in range(1, 6)
+        ))
+        assert threads and threading.get_ident() not in threads
+        assert await store.count("Deposited", 26) == 5
+        assert await store.checkpoint(26, "vault") == (5, f"0x{5:064x}")
+
+        await store.rollback(26, "vault", [VAULT], (3, f"0x{3:064x}"))
+        assert [e["block_number"] for e in await store.events(name="Deposited")] == [3, 2, 1]
+        assert (await store.latest("Deposited"))["args"] == {"amount": 1}
+        await store.close()
+
+    asyncio.run(run())
+
+
+def test_scopes_keep_their_own_block_hashes(tmp_path):
+    async def run():
+        # Two fleet workers indexing different contracts into one file
+        path = str(tmp_path / "events.db")
+        vaults, hooks = EventStore(path), EventStore(path)
+        await asyncio.gather(*(
+            store.commit(26, scope, [], {n: f"0x{n:064x}" for n in range(1, 11)}, (10, f"0x{10:064x}"))
+            for store, scope in ((vaults, "vaults"), (hooks, "hooks"))
+            for _ in range(5)
+        ))
+
+        await vaults.rollback(26, "vaults", [VAULT], (4, f"0x{4:064x}"))
+        assert [n for n, _ in await vaults.recent_blocks(26, "vaults")] == [4, 3, 2, 1]
+        assert [n for n, _ in await hooks.recent_blocks(26, "hooks")] == list(range(10, 0, -1))
+        assert await hooks.checkpoint(26, "hooks") == (10, f"0x{10:064x}")
+        await asyncio.gather(vaults.close(), hooks.close())
+
+    asyncio.run(run())
@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+from http_cache import CachedHTTPClient
+from market_data import MarketDataFetcher
+from price_sources import HttpPriceSource, PriceAggregator, _coinbase
+from price_store import PriceHistoryFile
+
+COINBASE_URL = "https://api.coinbase.com/v2/prices/ETH-USD/spot"
+
+
+def test_only_fresh_quotes_add_volatility_samples():
+    requests = []
+
+    def coinbase(request):
+        requests.append(request)
+        return httpx.Response(200, json={"data": {"amount": "3000.0"}})
+
+    async def run():
+        fetcher = MarketDataFetcher(history_path=None, stream_url=None, assets=[])
+        http = CachedHTTPClient(httpx.AsyncClient(transport=httpx.MockTransport(coinbase)), {}, (0.05, 0))
+        fetcher.prices = PriceAggregator([HttpPriceSource("coinbase", http, COINBASE_URL, _coinbase)], quorum=1)
+
+        async def gas_price(rpc_url):
+            return 1.0
+
+        async def fear_greed():
+            return 50, "Neutral"
+
+        async def asset_prices():
+            return np.full(1, np.nan), np.full(1, np.nan)
+
+        fetcher.fetch_gas_price = gas_price
+        fetcher.fetch_fear_greed_index = fear_greed
+        fetcher.fetch_asset_prices = asset_prices
+
+        await fetcher.get_market_conditions("")
+        await fetcher.get_market_conditions("")
+        assert len(requests) == 1
+        assert len(fetcher.volatility) == 1  # the second scan was answered by the cache
+
+        await asyncio.sleep(0.06)
+        await fetcher.get_market_conditions("")
+        assert len(requests) == 2
+        assert len(fetcher.volatility) == 2  # same price, but a real observation of it
+        await http.client.aclose()
+        await fetcher.close()
+
+    asyncio.run(run())
+
+
+def restart_with_history(path, samples: list[tuple[float, float]], live_price: float):
+    """Conditions from the first scan of a fetcher that restarts on `samples`"""
+    history = PriceHistoryFile(str(path), capacity=64)
+    for timestamp, price in samples:
+        history.append(price, timestamp)
+    history.close()
+
+    async def run():
+        fetcher = MarketDataFetcher(history_path=str(path), stream_url=None, assets=[])
+
+        async def eth_price():
+            return live_price, 0.0, time.time()
+
+        async def gas_price(rpc_url):
+            return 1.0
+
+        async def fear_greed():
+            return 50, "Neutral"
+
+        async def asset_prices():
+            return np.full(1, np.nan), np.full(1, np.nan)
+
+        fetcher.fetch_eth_price = eth_price
+        fetcher.fetch_gas_price = gas_price
+        fetcher.fetch_fear_greed_index = fear_greed
+        fetcher.fetch_asset_prices = asset_prices
+        conditions = await fetcher.get_market_conditions("")
+        await fetcher.close()
+        return fetcher, conditions
+
+    return asyncio.run(run())
+
+
+def test_stale_history_is_not_replayed(tmp_path):
+    # A quiet hour that ended two hours ago, then the agent comes back 5% higher
+    ended = time.time() - 2 * 3600
+    samples = [(ended - 150 * (24 - i), 3000.0) for i in range(25)]
+    fetcher, conditions = restart_with_history(tmp_path / "prices.bin", samples, 3150.0)
+    assert len(fetcher.volatility) == 1
+    assert conditions.volatility_level == "MEDIUM"  # DEFAULT_VOLATILITY until returns arrive
+
+
+def test_no_return_across_a_pause(tmp_path):
+    # Recent enough to replay, but sampling stopped 20 minutes before the restart
+    ended = time.time() - 20 * 60
+    samples = [(ended - 60 * (24 - i), 3000.0 + 0.3 * (i % 2)) for i in range(25)]
+    fetcher, conditions = restart_with_history(tmp_path / "prices.bin", samples, 3150.0)
+    assert len(fetcher.volatility) == fetcher.volatility.window + 1
+    assert conditions.volatility_level == "LOW"
@@ -0,0 +1,11 @@
+import pytest
+
+from price_sources import PriceSource
+
+
+def test_source_without_fetch_fails_when_built():
+    class Forgetful(PriceSource):
+        pass
+
+    with pytest.raises(TypeError):
+        Forgetful("forgetful")
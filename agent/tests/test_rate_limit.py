@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from connections import ConnectionManager
+from rate_limit import RateLimited, RateLimiter
+from transport import HedgedHTTPProvider
+
+
+def test_own_throttling_is_not_an_endpoint_failure():
+    async def run():
+        limiter = RateLimiter(limits={}, default=(0.01, 1), max_wait=0)
+        limiter.bucket("127.0.0.1").tokens = 0  # budget spent: the next request waits ~100s
+        connections = ConnectionManager(limiter)
+        provider = HedgedHTTPProvider(["http://127.0.0.1:9/"])
+        provider.session = connections.session
+        endpoint = provider.endpoints[0]
+
+        with pytest.raises(RateLimited):
+            await provider._post_to(endpoint, b"{}")
+        assert endpoint.error_ewma == 0
+        assert endpoint.latency_ewma is None
+        await connections.close()
+
+    asyncio.run(run())
+
+
+def test_share_divides_every_budget():
+    limiter = RateLimiter(limits={"api.example.com": (8.0, 16)}, default=(20.0, 40))
+    before = limiter.bucket("api.example.com")
+    limiter.set_share(1 / 4)
+    assert (before.base_rate, before.base_burst) == (2.0, 4.0)
+    assert before.tokens <= before.capacity
+    assert limiter.bucket("rpc.example.com").base_rate == 5.0
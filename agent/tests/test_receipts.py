@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+from hexbytes import HexBytes
+from web3.exceptions import TransactionNotFound
+
+from receipts import ReceiptTracker
+
+SENDER = "0x0000000000000000000000000000000000000001"
+
+
+class MempoolEth:
+    """A chain where our transaction never mines; `mined` is the sender's latest nonce"""
+
+    def __init__(self):
+        self.mined = 5
+
+    async def get_transaction_receipt(self, tx_hash):
+        raise TransactionNotFound(tx_hash)
+
+    async def get_transaction_count(self, address, block):
+        return self.mined
+
+
+class Nonces:
+    address = SENDER
+
+    def __init__(self):
+        self.synced = 0
+        self.confirmed = []
+
+    async def sync(self):
+        self.synced += 1
+
+    def confirm(self, nonce):
+        self.confirmed.append(nonce)
+
+
+def test_timed_out_transaction_blocks_until_its_nonce_is_used():
+    async def run():
+        eth = MempoolEth()
+        client = SimpleNamespace(chain=SimpleNamespace(name="test"), w3=SimpleNamespace(eth=eth))
+        nonces = Nonces()
+        tracker = ReceiptTracker(client, nonces=nonces, timeout=0)
+
+        future = tracker.track(HexBytes("0x" + "ab" * 32), "bridge", nonce=5, owner="velvet")
+        await tracker._check()
+        assert isinstance(future.exception(), asyncio.TimeoutError)
+        assert nonces.synced == 1
+        assert [tx["stale"] for tx in tracker.table("velvet")] == [True]
+
+        await tracker._check()  # still in the mempool
+        assert len(tracker.table("velvet")) == 1
+
+        eth.mined = 6  # another transaction took nonce 5
+        await tracker._check()
+        assert tracker.table("velvet") == []
+        assert nonces.confirmed == [5]
+        assert nonces.synced == 1
+
+    asyncio.run(run())
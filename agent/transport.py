@@ -0,0 +1,368 @@
+"""
+Velvet Arc JSON-RPC Transport
+Coalesces concurrent requests into JSON-RPC batches, routed across health-scored endpoints
+"""
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import aiohttp
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+from structlog import get_logger
+
+from config import (
+    RPC_BATCH_WINDOW_SECONDS, RPC_MAX_BATCH_SIZE, RPC_TIMEOUT_SECONDS,
+    RPC_HEALTH_WINDOW, RPC_ERROR_HALF_LIFE_SECONDS, RPC_ERROR_PENALTY,
+    RPC_HEDGE_DEFAULT_DELAY, RPC_HEDGE_MIN_DELAY,
+)
+from rate_limit import RateLimited
+
+logger = get_logger()
+
+# Answers that never change for the lifetime of a connection
+STATIC_METHODS = {"eth_chainId", "net_version", "web3_clientVersion"}
+
+HEADERS = {"Content-Type": "application/json"}
+
+
+@dataclass
+class TransportStats:
+    """Counters for how many calls reached the wire"""
+    requests: int = 0  # make_request calls from web3
+    deduplicated: int = 0  # served by an identical in-flight request
+    cached: int = 0  # served from the static method cache
+    batches: int = 0  # HTTP posts sent
+    batched_calls: int = 0  # calls carried by those posts
+    hedges: int = 0  # duplicate posts sent because the first endpoint was slow
+    failovers: int = 0  # posts retried on another endpoint after an error
+    broadcasts: int = 0  # raw transactions sent to every endpoint
+
+    @property
+    def avg_batch_size(self) -> float:
+        return self.batched_calls / self.batches if self.batches else 0.0
+
+
+@dataclass
+class _Pending:
+    request_id: int
+    body: bytes
+    future: asyncio.Future
+
+
+class BatchingHTTPProvider(AsyncJSONBaseProvider):
+    """
+    Async web3 provider that queues calls for a short window and sends them
+    as one JSON-RPC batch array. Identical in-flight calls share one request,
+    and batch responses are matched back to their callers by id.
+    """
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        batch_window: float = RPC_BATCH_WINDOW_SECONDS,
+        max_batch_size: int = RPC_MAX_BATCH_SIZE,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.endpoint_uri = endpoint_uri
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout or aiohttp.ClientTimeout(total=RPC_TIMEOUT_SECONDS)
+        self.stats = TransportStats()
+
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._owns_session = False
+
+        self._queue: list[_Pending] = []
+        self._inflight: dict[bytes, asyncio.Future] = {}
+        self._static_cache: dict[str, RPCResponse] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._send_tasks: set[asyncio.Task] = set()
+
+    def __str__(self) -> str:
+        return f"Batching RPC connection {self.endpoint_uri}"
+
+    def attach_session(self, session: aiohttp.ClientSession):
+        """Use a shared pooled session instead of creating one"""
+        self.session = session
+        self._owns_session = False
+
+    async def disconnect(self):
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+        self.session = None
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        self.stats.requests += 1
+
+        if method in self._static_cache:
+            self.stats.cached += 1
+            return dict(self._static_cache[method])
+
+        # Requests with identical method and params share one in-flight call
+        key = self.encode_rpc_dict({"method": method, "params": params})
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats.deduplicated += 1
+        else:
+            future = self._enqueue(method, params, key)
+
+        response = dict(await asyncio.shield(future))
+
+        if method in STATIC_METHODS and "result" in response:
+            self._static_cache[method] = response
+        return response
+
+    async def make_batch_request(
+        self, requests: list[tuple[RPCEndpoint, Any]]
+    ) -> list[RPCResponse] | RPCResponse:
+        # Explicit web3 batches are already batched - send them as-is
+        raw = await self._post(self.encode_batch_rpc_request(requests))
+        response = self.decode_rpc_response(raw)
+        if not isinstance(response, list):
+            return response
+        return sorted(response, key=lambda r: int(r.get("id") or 0))
+
+    def _enqueue(self, method: RPCEndpoint, params: Any, key: bytes) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        rpc_dict = self.form_request(method, params)
+        future = loop.create_future()
+
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        self._queue.append(_Pending(rpc_dict["id"], self.encode_rpc_dict(rpc_dict), future))
+
+        if len(self._queue) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._queue:
+            return
+
+        batch, self._queue = self._queue, []
+        task = asyncio.create_task(self._send(batch))
+        self._send_tasks.add(task)
+        task.add_done_callback(self._send_tasks.discard)
+
+    async def _send(self, batch: list[_Pending]):
+        self.stats.batches += 1
+        self.stats.batched_calls += len(batch)
+
+        # A lone call goes out as a plain request so any endpoint accepts it
+        if len(batch) == 1:
+            body = batch[0].body
+        else:
+            body = b"[" + b",".join(p.body for p in batch) + b"]"
+
+        try:
+            response = self.decode_rpc_response(await self._post(body))
+        except Exception as e:
+            logger.warning("RPC batch failed", endpoint=self.endpoint_uri, calls=len(batch), error=str(e))
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+
+        self._resolve(batch, response)
+
+    def _resolve(self, batch: list[_Pending], response: Any):
+        if isinstance(response, dict) and len(batch) == 1:
+            response = [{**response, "id": batch[0].request_id}]
+        if not isinstance(response, list):
+            # Whole-batch error: every caller gets the same error object
+            response = [{**response, "id": p.request_id} for p in batch]
+
+        by_id = {int(r["id"]): r for r in response if r.get("id") is not None}
+        for pending in batch:
+            if pending.future.done():
+                continue
+            result = by_id.get(pending.request_id)
+            if result is None:
+                result = {
+                    "jsonrpc": "2.0",
+                    "id": pending.request_id,
+                    "error": {"code": -32603, "message": "Missing from batch response"},
+                }
+            pending.future.set_result(result)
+
+    async def _post(self, body: bytes) -> bytes:
+        if self.session is None:
+            self.session = aiohttp.ClientSession(timeout=self.timeout)
+            self._owns_session = True
+
+        async with self.session.post(self.endpoint_uri, data=body, headers=HEADERS) as response:
+            response.raise_for_status()
+            return await response.read()
+
+
+@dataclass
+class EndpointHealth:
+    """Observed latency and error rate for one RPC endpoint"""
+    url: str
+    latencies: deque = field(default_factory=lambda: deque(maxlen=RPC_HEALTH_WINDOW))
+    latency_ewma: Optional[float] = None
+    error_ewma: float = 0.0
+    last_error: float = 0.0
+    requests: int = 0
+    errors: int = 0
+
+    def record(self, latency: float, ok: bool):
+        self.requests += 1
+        if ok:
+            self.latencies.append(latency)
+            self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+            self.error_ewma *= 0.9
+        else:
+            self.errors += 1
+            self.error_ewma = 0.9 * self.error_ewma + 0.1
+            self.last_error = time.monotonic()
+
+    @property
+    def error_rate(self) -> float:
+        """Recent error rate, decaying while the endpoint is not being used"""
+        if not self.error_ewma:
+            return 0.0
+        idle = time.monotonic() - self.last_error
+        return self.error_ewma * 0.5 ** (idle / RPC_ERROR_HALF_LIFE_SECONDS)
+
+    @property
+    def p95(self) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+    @property
+    def score(self) -> float:
+        """Lower is better; unmeasured endpoints score 0 so each gets tried"""
+        return (self.latency_ewma or 0.0) * (1 + RPC_ERROR_PENALTY * self.error_rate) + self.error_rate
+
+    def hedge_delay(self) -> float:
+        p95 = self.p95
+        if p95 is None:
+            return RPC_HEDGE_DEFAULT_DELAY
+        return max(p95, RPC_HEDGE_MIN_DELAY)
+
+
+class HedgedHTTPProvider(BatchingHTTPProvider):
+    """
+    Batching provider spread over several endpoints. Each batch goes to the
+    best-scoring endpoint; if it hasn't answered within that endpoint's p95
+    latency the same batch is also sent to the next one, and the first good
+    response wins. Errors fail over immediately. Raw transactions skip the
+    batch queue and are broadcast to every endpoint at once.
+    """
+
+    def __init__(self, endpoint_uris: list[str], **kwargs):
+        super().__init__(endpoint_uris[0], **kwargs)
+        self.endpoints = [EndpointHealth(url) for url in endpoint_uris]
+
+    def __str__(self) -> str:
+        return f"Hedged RPC connection {', '.join(e.url for e in self.endpoints)}"
+
+    def ranked(self) -> list[EndpointHealth]:
+        return sorted(self.endpoints, key=lambda e: e.score)
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if method == "eth_sendRawTransaction" and len(self.endpoints) > 1:
+            self.stats.requests += 1
+            return await self._broadcast(method, params)
+        return await super().make_request(method, params)
+
+    async def _post(self, body: bytes) -> bytes:
+        tasks: dict[asyncio.Task, EndpointHealth] = {}
+        error: Optional[Exception] = None
+        try:
+            for endpoint in self.ranked():
+                if tasks:
+                    self.stats.hedges += 1
+                elif error is not None:
+                    self.stats.failovers += 1
+                tasks[asyncio.create_task(self._post_to(endpoint, body))] = endpoint
+
+                # Wait for an answer until this endpoint's p95; then hedge to the next
+                deadline = time.monotonic() + endpoint.hedge_delay()
+                while tasks:
+                    done, _ = await asyncio.wait(
+                        tasks, timeout=max(deadline - time.monotonic(), 0), return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not done:
+                        break
+                    for task in done:
+                        del tasks[task]
+                        if task.exception() is None:
+                            return task.result()
+                        error = task.exception()
+
+            # Every endpoint is in flight: take whichever succeeds first
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    del tasks[task]
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _post_to(self, endpoint: EndpointHealth, body: bytes) -> bytes:
+        if self.session is None:
+            self.session = aiohttp.ClientSession(timeout=self.timeout)
+            self._owns_session = True
+
+        start = time.perf_counter()
+        try:
+            async with self.session.post(endpoint.url, data=body, headers=HEADERS) as response:
+                response.raise_for_status()
+                raw = await response.read()
+        except asyncio.CancelledError:
+            # Lost a hedge race; says nothing about the endpoint
+            raise
+        except RateLimited:
+            # Our own token bucket said no; the endpoint never saw the request
+            raise
+        except Exception as e:
+            endpoint.record(time.perf_counter() - start, ok=False)
+            logger.warning("RPC endpoint failed", endpoint=endpoint.url, error=str(e))
+            raise
+        endpoint.record(time.perf_counter() - start, ok=True)
+        return raw
+
+    async def _broadcast(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        """Send to every endpoint; return the first acceptance, else the first rejection"""
+        self.stats.broadcasts += 1
+        body = self.encode_rpc_dict(self.form_request(method, params))
+        tasks = [asyncio.create_task(self._post_to(e, body)) for e in self.endpoints]
+        for task in tasks:
+            # Stragglers keep propagating the transaction after we return
+            self._send_tasks.add(task)
+            task.add_done_callback(self._send_tasks.discard)
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        rejection: Optional[RPCResponse] = None
+        error: Optional[Exception] = None
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                response = self.decode_rpc_response(await next_done)
+            except Exception as e:
+                error = error or e
+                continue
+            if "result" in response:
+                return response
+            rejection = rejection or response
+
+        if rejection is not None:
+            return rejection
+        raise error
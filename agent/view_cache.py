@@ -0,0 +1,187 @@
+"""
+Velvet Arc View Cache
+Read-through cache of eth_call results keyed by chain, block, contract and calldata
+"""
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import websockets
+from structlog import get_logger
+
+from config import RECEIPT_WS_RETRY_SECONDS, RPC_TIMEOUT_SECONDS, VIEW_CACHE_HEAD_MAX_AGE_SECONDS
+from receipts import ReceiptTracker
+from rpc import ChainClient
+
+logger = get_logger()
+
+
+@dataclass
+class ViewCacheStats:
+    """Counters for how many reads never reached the node"""
+    hits: int = 0  # view calls answered from the cache
+    misses: int = 0  # view calls that had to be read
+    reads_saved: int = 0  # snapshots answered without any RPC
+    head_evictions: int = 0  # entries dropped because a new block arrived
+    event_evictions: int = 0  # entries dropped on a log or receipt from their contract
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _Entry:
+    block: int
+    raw: bytes
+
+
+class ViewCache:
+    """
+    eth_call results for one chain, keyed by (block, contract, calldata).
+    An entry answers reads while its block is still the head. Contracts
+    passed to watch_events() emit a log for every state change, so while a
+    log subscription is up their entries outlive new heads and are dropped
+    when one of those logs (or a receipt of ours touching them) shows up.
+    """
+
+    def __init__(
+        self,
+        client: ChainClient,
+        heads: ReceiptTracker,
+        head_max_age: float = VIEW_CACHE_HEAD_MAX_AGE_SECONDS,
+    ):
+        self.client = client
+        self.heads = heads
+        self.head_max_age = head_max_age
+        self.stats = ViewCacheStats()
+
+        self._entries: dict[tuple[str, bytes], _Entry] = {}
+        self._watched: set[str] = set()
+        self._last_event: dict[str, int] = {}  # contract -> block of its latest log
+        self._events_live = False
+        self._head: Optional[int] = None
+        self._head_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+        heads.head_listeners.append(self.on_head)
+        heads.receipt_listeners.append(self.on_receipt)
+
+    def watch_events(self, address: str):
+        """Key this contract's entries on its logs rather than on the block"""
+        self._watched.add(address.lower())
+
+    async def start(self):
+        if self._task is None and self._watched and self.client.chain.ws_url:
+            self._task = asyncio.create_task(self._follow_logs())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._events_live = False
+
+    @property
+    def head(self) -> Optional[int]:
+        """The current block, if a live subscription or a recent read vouches for it"""
+        if self._head is None:
+            return None
+        if self.heads.subscribed or time.monotonic() - self._head_at <= self.head_max_age:
+            return self._head
+        return None
+
+    def get(self, target: str, data: bytes, block: Optional[int] = None) -> Optional[bytes]:
+        """Cached result of calling `target` with `data` at `block` (default: the head)"""
+        entry = self._entries.get((target.lower(), data))
+        if entry is not None and self.holds(target, data, self.head if block is None else block):
+            self.stats.hits += 1
+            return entry.raw
+        self.stats.misses += 1
+        return None
+
+    def holds(self, target: str, data: bytes, block: Optional[int]) -> bool:
+        """Whether the cached result is still the answer at `block`"""
+        target = target.lower()
+        entry = self._entries.get((target, data))
+        if entry is None:
+            return False
+        if self._events_live and target in self._watched:
+            return entry.block >= self._last_event.get(target, -1)
+        return block is not None and entry.block == block
+
+    def store(self, target: str, data: bytes, block: int, raw: bytes):
+        self.observe(block)
+        self._entries[(target.lower(), data)] = _Entry(block, raw)
+
+    def observe(self, block: int):
+        """A read just ran at `block`, so it is (at least) the head right now"""
+        if self._head is None or block > self._head:
+            self.on_head(block)
+        elif block == self._head:
+            self._head_at = time.monotonic()
+
+    def on_head(self, block: int):
+        if block != self._head:
+            stale = [
+                key for key, entry in self._entries.items()
+                if entry.block != block and not (self._events_live and key[0] in self._watched)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.stats.head_evictions += len(stale)
+        self._head = block
+        self._head_at = time.monotonic()
+
+    def on_receipt(self, receipt: dict):
+        """Our own transaction landed; whatever it called or logged from has changed"""
+        block = receipt["blockNumber"]
+        if receipt.get("to"):
+            self.evict(receipt["to"], block)
+        for log in receipt.get("logs") or []:
+            self.evict(log["address"], block)
+
+    def evict(self, address: str, block: int):
+        address = address.lower()
+        self._last_event[address] = max(block, self._last_event.get(address, -1))
+        stale = [key for key in self._entries if key[0] == address]
+        for key in stale:
+            del self._entries[key]
+        self.stats.event_evictions += len(stale)
+
+    def _drop_watched(self):
+        for key in [key for key in self._entries if key[0] in self._watched]:
+            del self._entries[key]
+
+    async def _follow_logs(self):
+        while True:
+            try:
+                await self._subscribe()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Log subscription dropped", chain=self.client.chain.name, error=str(e))
+            await asyncio.sleep(RECEIPT_WS_RETRY_SECONDS)
+
+    async def _subscribe(self):
+        async with websockets.connect(self.client.chain.ws_url, open_timeout=RPC_TIMEOUT_SECONDS) as ws:
+            params = ["logs", {"address": sorted(self._watched)}]
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": params}))
+            reply = json.loads(await ws.recv())
+            if "error" in reply:
+                raise RuntimeError(reply["error"].get("message", reply["error"]))
+            logger.info("Subscribed to contract logs", chain=self.client.chain.name, contracts=len(self._watched))
+
+            # Anything cached before now may have missed a log
+            self._drop_watched()
+            self._events_live = True
+            try:
+                async for message in ws:
+                    log = json.loads(message).get("params", {}).get("result") or {}
+                    if "address" in log:
+                        # Removed (reorged-out) logs invalidate just the same
+                        self.evict(log["address"], int(log.get("blockNumber") or "0x0", 16))
+            finally:
+                self._events_live = False
@@ -0,0 +1,126 @@
+"""
+Velvet Arc Volatility Estimator
+Rolling standard deviation of log returns over a preallocated ring buffer, updated in O(1) per price
+"""
+import math
+from typing import Optional
+
+import numpy as np
+
+from config import VOLATILITY_WINDOW, VOLATILITY_PERIODS_PER_YEAR
+
+DEFAULT_VOLATILITY = 0.05  # until there are two prices to compare
+
+
+class RollingVolatility:
+    """
+    Mean and variance of the last `window` log returns, kept with Welford's
+    update plus its inverse for the return that falls out of the window.
+    Each update touches one slot of the buffer, so the cost does not depend
+    on the window length. Running sums are re-derived from the buffer once
+    per window to stop rounding drift, which is still O(1) amortized.
+    """
+
+    def __init__(self, window: int = VOLATILITY_WINDOW, periods_per_year: int = VOLATILITY_PERIODS_PER_YEAR):
+        if window < 1:
+            raise ValueError("window must hold at least one return")
+        self.window = window
+        self.annualize = math.sqrt(periods_per_year)
+
+        self._returns = np.zeros(window, dtype=np.float64)
+        self._prices = np.zeros(window + 1, dtype=np.float64)
+        self._head = 0  # next return slot to write
+        self._count = 0  # returns in the window
+        self._prices_seen = 0
+        self._last_log: Optional[float] = None
+        self._mean = 0.0
+        self._m2 = 0.0  # sum of squared deviations from the mean
+        self._since_resync = 0
+
+    def __len__(self) -> int:
+        """Prices currently covered by the window"""
+        return min(self._prices_seen, self.window + 1)
+
+    def break_chain(self):
+        """Start the next return from the next price: sampling paused, so don't span the gap"""
+        self._last_log = None
+
+    def update(self, price: float) -> float:
+        """Add a price and return the new volatility index"""
+        if not price > 0:
+            return self.volatility
+
+        self._prices[self._prices_seen % (self.window + 1)] = price
+        self._prices_seen += 1
+        log_price = math.log(price)
+        if self._last_log is None:
+            self._last_log = log_price
+            return self.volatility
+
+        r = log_price - self._last_log
+        self._last_log = log_price
+
+        if self._count < self.window:
+            self._count += 1
+            delta = r - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (r - self._mean)
+        else:
+            # Add r and drop the oldest return in one step
+            old = self._returns[self._head]
+            mean = self._mean + (r - old) / self._count
+            self._m2 += (r - old) * (r - mean + old - self._mean)
+            self._mean = mean
+
+        self._returns[self._head] = r
+        self._head = (self._head + 1) % self.window
+
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._resync()
+        return self.volatility
+
+    def peek(self, price: float) -> float:
+        """The volatility index if `price` were the next sample, without adding it"""
+        if not price > 0 or self._last_log is None:
+            return self.volatility
+        r = math.log(price) - self._last_log
+        if self._count < self.window:
+            count = self._count + 1
+            delta = r - self._mean
+            mean = self._mean + delta / count
+            m2 = self._m2 + delta * (r - mean)
+        else:
+            count = self._count
+            old = self._returns[self._head]
+            mean = self._mean + (r - old) / count
+            m2 = self._m2 + (r - old) * (r - mean + old - self._mean)
+        return min(math.sqrt(max(m2, 0.0) / count) * self.annualize / 2.0, 1.0)
+
+    def _resync(self):
+        returns = self._returns[:self._count]
+        self._mean = float(returns.mean())
+        self._m2 = float(((returns - self._mean) ** 2).sum())
+        self._since_resync = 0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation of the windowed log returns"""
+        if self._count == 0:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / self._count)
+
+    @property
+    def volatility(self) -> float:
+        """Annualized volatility normalized to the 0-1 index the decision engine uses"""
+        if self._count == 0:
+            return DEFAULT_VOLATILITY
+        return min(self.std * self.annualize / 2.0, 1.0)
+
+    def prices(self) -> np.ndarray:
+        """Prices in the window, oldest first"""
+        size = self.window + 1
+        if self._prices_seen <= size:
+            return self._prices[:self._prices_seen].copy()
+        start = self._prices_seen % size
+        return np.concatenate((self._prices[start:], self._prices[:start]))